@@ -0,0 +1,254 @@
+"""Valyxo Auto-Complete Benchmark v0.6.0
+
+Measures ``ValyxoAutoComplete.complete`` latency against synthetic
+workloads and writes JSON that can be compared across commits.
+
+Workloads:
+    - a command history of --history entries (in memory, many repeats)
+    - a directory of --files empty files (created in a temporary dir)
+    - --plugins plugin commands registered with the command provider
+    - --env extra environment variables
+
+Every scenario is timed twice: "cold" resets the completion session
+before each call (first TAB on a fresh line), "typing" replays the query
+one character at a time through one session (what a user sees while
+typing). Latency is reported as p50/p99/max in milliseconds. Memory is
+the tracemalloc peak while building workloads and during one extra,
+untimed pass over the scenarios (tracing is off while timing).
+
+Usage:
+    python bench_autocomplete.py [--quick] [--output results.json]
+    python bench_autocomplete.py --compare baseline.json --output new.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+import shutil
+import subprocess
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+
+from valyxo.core.autocomplete import ValyxoAutoComplete, CommandCompletionProvider  # noqa: E402
+from valyxo.core.history import ValyxoHistory  # noqa: E402
+
+
+# (name, text typed) — the cwd is the generated directory
+SCENARIOS = [
+    ("command_prefix", "gi"),
+    ("command_fuzzy", "plgcmd12"),
+    ("subcommand", "git st"),
+    ("file_prefix", "cat file_0123"),
+    ("file_fuzzy", "cat f9x"),
+    ("file_empty", "cat "),
+    ("env_prefix", "echo $BENCH_VAR_1"),
+    ("history_prefix", "git commit -m fix"),
+]
+
+QUICK_SIZES = {"history": 10_000, "files": 5_000, "plugins": 500, "env": 500, "iterations": 20}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = math.ceil(pct / 100.0 * len(ordered)) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    ms = [s * 1000 for s in samples]
+    return {
+        "samples": len(ms),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+    }
+
+
+def build_history(size: int, rng: random.Random) -> ValyxoHistory:
+    """An in-memory history of ``size`` commands with a long tail of repeats."""
+    history = ValyxoHistory(path=None)
+    verbs = ["git commit -m", "git checkout", "cat", "cd", "grep", "run", "find", "ls -l"]
+    now = time.time()
+    for i in range(size):
+        unique = int(rng.paretovariate(1.2)) % max(size // 3, 1)
+        history.add(f"{rng.choice(verbs)} fix-{unique:06d}", when=now - (size - i))
+    return history
+
+
+def build_directory(root: str, size: int) -> None:
+    """Fill a directory with empty files and a few subdirectories."""
+    for i in range(size):
+        open(os.path.join(root, f"file_{i:05d}_{i % 97:02d}.txt"), "w").close()
+    for i in range(min(size // 1000, 50)):
+        os.makedirs(os.path.join(root, f"dir_{i:03d}"), exist_ok=True)
+
+
+def build_autocomplete(args: argparse.Namespace, rng: random.Random) -> ValyxoAutoComplete:
+    ac = ValyxoAutoComplete(deadline=args.deadline)
+    ac.update_history(build_history(args.history, rng))
+    for provider in ac.providers:
+        if isinstance(provider, CommandCompletionProvider):
+            for i in range(args.plugins):
+                provider.add_command(f"plugin-cmd-{i:05d}", f"Synthetic plugin command {i}")
+    return ac
+
+
+def time_calls(call: Callable[[], Any], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_scenarios(ac: ValyxoAutoComplete, cwd: str, iterations: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name, text in SCENARIOS:
+        def cold() -> None:
+            ac.reset()
+            ac.complete(text, context={"cwd": cwd})
+
+        # Replay the last word one character at a time through one session
+        head = text.rsplit(" ", 1)[0] + " " if " " in text else ""
+        word = text[len(head):]
+
+        def typing() -> None:
+            ac.reset()
+            for i in range(1, len(word) + 1):
+                ac.complete(head + word[:i], context={"cwd": cwd})
+
+        cold()  # warm the listing caches, as a second TAB would find them
+        count = len(ac.session.get_completions(text, context={"cwd": cwd}))
+        results[name] = {
+            "text": text,
+            "results": count,
+            "cold": summarize(time_calls(cold, iterations)),
+            "typing": summarize(time_calls(typing, max(iterations // 4, 1))) if word else None,
+        }
+    return results
+
+
+def trace_queries(ac: ValyxoAutoComplete, cwd: str) -> int:
+    """Peak traced memory (bytes) of one cold call per scenario."""
+    tracemalloc.start()
+    for _, text in SCENARIOS:
+        ac.reset()
+        ac.complete(text, context={"cwd": cwd})
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Human-readable p50/p99 deltas against a previous results file."""
+    lines = [f"Compared with {baseline.get('meta', {}).get('revision', '?')}:"]
+    for name, result in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        for phase in ("cold", "typing"):
+            if not old.get(phase) or not result.get(phase):
+                continue
+            for metric in ("p50_ms", "p99_ms"):
+                before, after = old[phase][metric], result[phase][metric]
+                change = ((after - before) / before * 100) if before else 0.0
+                lines.append(f"  {name:16} {phase:6} {metric}: {before:9.3f} -> {after:9.3f} ({change:+.1f}%)")
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Valyxo auto-complete latency")
+    parser.add_argument("--history", type=int, default=100_000, help="history entries")
+    parser.add_argument("--files", type=int, default=50_000, help="files in the completed directory")
+    parser.add_argument("--plugins", type=int, default=2_000, help="plugin commands")
+    parser.add_argument("--env", type=int, default=2_000, help="extra environment variables")
+    parser.add_argument("--iterations", type=int, default=100, help="timed calls per scenario")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="provider deadline in seconds (default: none, so slow providers are measured)")
+    parser.add_argument("--quick", action="store_true", help="small workloads for a fast sanity run")
+    parser.add_argument("--seed", type=int, default=577)
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    parser.add_argument("--compare", help="previous JSON results to print deltas against")
+    args = parser.parse_args(argv)
+    if args.quick:
+        for key, value in QUICK_SIZES.items():
+            setattr(args, key, min(getattr(args, key), value))
+
+    rng = random.Random(args.seed)
+    root = tempfile.mkdtemp(prefix="valyxo-bench-")
+    extra_env = {f"BENCH_VAR_{i:05d}": "x" * (i % 40) for i in range(args.env)}
+    os.environ.update(extra_env)
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        build_directory(root, args.files)
+        ac = build_autocomplete(args, rng)
+        build_seconds = time.perf_counter() - start
+        retained, build_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        scenarios = run_scenarios(ac, root, args.iterations)
+        query_peak = trace_queries(ac, root)
+    finally:
+        for key in extra_env:
+            os.environ.pop(key, None)
+        shutil.rmtree(root, ignore_errors=True)
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "workload": {key: getattr(args, key) for key in ("history", "files", "plugins", "env", "iterations")},
+            "deadline": args.deadline,
+        },
+        "build_seconds": round(build_seconds, 3),
+        "memory": {
+            "build_peak_kb": build_peak // 1024,
+            "query_peak_kb": query_peak // 1024,
+            "retained_kb": retained // 1024,
+        },
+        "providers": ac.get_stats(),
+        "scenarios": scenarios,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(baseline, results)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
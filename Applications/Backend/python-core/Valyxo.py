@@ -21,6 +21,13 @@ Architecture:
    - keybindings: Customizable shortcuts
    - snippets: Code snippets
    - autocomplete: Smart tab completion
+   - search: Parallel grep engine (ValyxoSearch)
+   - search_index: Trigram index for grep (ValyxoSearchIndex)
+   - fuzzy: fzf-style fuzzy matching
+   - file_index: Workspace path index (ValyxoFileIndex)
+   - dircache: Shared directory listing cache (ValyxoDirCache)
+   - watcher: inotify/polling file watcher for cache invalidation (ValyxoFileWatcher)
+   - history: Persistent command history with frecency ranking (ValyxoHistory)
  - valyxo.shell: Shell interface
  - valyxo.editor: Text editor
 
@@ -39,6 +46,9 @@ Key Features:
 
 import os
 import sys
+import stat
+import time
+import shlex
 from valyxo.core import (
     Colors,
     color,
@@ -77,6 +87,7 @@ from valyxo.core import (
     ValyxoPluginManager,
     ValyxoPackageManager,
     ValyxoGit,
+    format_status_table,
     list_templates,
     create_project,
     ValyxoThemeManager,
@@ -85,6 +96,17 @@ from valyxo.core import (
     ValyxoAutoComplete,
     create_autocomplete,
     integrate_extensions,
+    ValyxoSearch,
+    ValyxoSearchError,
+    ValyxoSearchIndex,
+    ValyxoFileIndex,
+    ValyxoDirCache,
+    ValyxoFileWatcher,
+    ValyxoHistory,
+    entry_is_dir,
+    entry_stat,
+    page_lines,
+    format_size,
 )
 from valyxo.script import ValyxoScriptRuntime
 
@@ -93,6 +115,15 @@ try:
 except ImportError:
     readline = None
 
+# ls output longer than this is paged when attached to a terminal
+LS_PAGE_THRESHOLD = 500
+
+# Seconds cached per-entry stat data may be reused by ls -l / sorting
+LS_STAT_MAX_AGE = 2.0
+
+# Seconds a parent's cached listing may answer "is this a directory" for cd
+CD_LISTING_TTL = 2.0
+
 try:
     import openai
 except ImportError:
@@ -114,15 +145,24 @@ class ValyxoShell:
         self.theme_manager = ValyxoThemeManager()
         self.keybinds = ValyxoKeybindManager()
         self.snippets = ValyxoSnippetManager()
-        self.autocomplete = create_autocomplete()
+        self.dir_cache = ValyxoDirCache()
+        self.file_index = ValyxoFileIndex(ROOT_DIR, dir_cache=self.dir_cache)
+        self.autocomplete = create_autocomplete(self.file_index, self.dir_cache)
+        self.autocomplete.attach_plugins(self.plugins)
+        self.autocomplete.update_snippets(self.snippets)
+        self.search = ValyxoSearch()
+        self.search_index = ValyxoSearchIndex()
+        self.watcher = ValyxoFileWatcher()
         
         # Extend ValyxoScript with new features
         self.script_extensions = integrate_extensions(self.script)
+        self.autocomplete.attach_script(self.script)
         
         self.settings = {}
         self.cwd = MAIN_PROJECT
         self.running = False
-        self.history = []
+        self.history = ValyxoHistory()
+        self.completion_mode = "shell"  # "script" inside the ValyxoScript interpreter
 
     def initialize(self):
         try:
@@ -131,17 +171,73 @@ class ValyxoShell:
             self._load_settings()
             self.filesystem.set_cwd(self.cwd)
             self.plugins.discover()  # Find available plugins
+            self._attach_watcher()
+            self.history.load()
             self.autocomplete.update_history(self.history)
+            self._setup_readline()
         except Exception as e:
             print(get_error_banner(f"Initialization error: {e}", self.settings))
             sys.exit(1)
 
+    def _attach_watcher(self):
+        """Let disk-backed caches invalidate on change instead of re-scanning."""
+        for subsystem in (self.file_index, self.search_index, self.plugins,
+                          self.packages, self.theme_manager, self.man):
+            subsystem.attach_watcher(self.watcher)
+        self.watcher.start()
+
+    def _setup_readline(self):
+        """Bind TAB to the shared completion session when readline is available."""
+        if readline is None or not sys.stdin.isatty():
+            return
+        self._readline_matches = []
+        readline.set_completer_delims(" \t\n")
+        readline.set_completer(self._readline_complete)
+        readline.parse_and_bind("tab: complete")
+
+    def _readline_complete(self, text: str, state: int):
+        """readline completer: one call per match, state counting from 0."""
+        if state == 0:
+            line = readline.get_line_buffer()
+            end = readline.get_endidx()
+            context = {"cwd": self.cwd, "mode": self.completion_mode}
+            completions = self.autocomplete.session.get_completions(line[:end], end, context)
+            head = text.rpartition("/")[0]
+            head = head + "/" if head else ""
+            matches = []
+            for c in completions:
+                if c.kind == "history":
+                    continue  # whole-line suggestions do not fit readline's word model
+                if c.kind in ("file", "directory"):
+                    matches.append((head + c.insert_text, c))
+                elif c.kind == "variable":
+                    matches.append((text[:text.rfind("$") + 1] + c.insert_text, c))
+                else:
+                    matches.append((c.insert_text, c))
+            # readline replaces the word with the matches' common prefix, so
+            # a scattered fuzzy match is only offered when it is the only one
+            prefixed = [m for m in matches if m[0].startswith(text)]
+            chosen = prefixed or (matches if len(matches) == 1 else [])
+            # A lone snippet is what readline inserts: render its body now
+            # (rendering counts as a use, so listed alternatives are not rendered)
+            if len(chosen) == 1 and chosen[0][1].expand:
+                chosen = [(chosen[0][1].expand(), chosen[0][1])]
+            self._readline_matches = [match for match, _ in chosen]
+        if state < len(self._readline_matches):
+            return self._readline_matches[state]
+        return None
+
     def _load_settings(self):
         self.settings = DEFAULT_SETTINGS.copy()
 
     def _get_prompt(self) -> str:
         virtual_path = normalize_virtual_path(self.cwd, ROOT_DIR)
         prompt_text = f"valyxo:{virtual_path}> "
+        if self.settings.get("git_prompt", True):
+            # Cached per repository; git only runs when the index or HEAD moved
+            snapshot = self.git.status_snapshot(self.cwd)
+            if snapshot is not None:
+                prompt_text = f"valyxo:{virtual_path} ({snapshot.prompt_segment()})> "
         if self.settings.get("colors", True):
             prompt_text = color(prompt_text, Colors.BANNER, self.settings)
         return prompt_text
@@ -154,10 +250,11 @@ class ValyxoShell:
         self.running = True
         while self.running:
             try:
+                self._report_finished_jobs()
                 user_input = prompt(self._get_prompt()).strip()
+                self.autocomplete.reset()
                 if user_input:
-                    self.history.append(user_input)
-                    self.autocomplete.update_history(self.history)
+                    self.history.add(user_input)
                     self._handle_command(user_input)
             except KeyboardInterrupt:
                 print("\n" + get_info_banner("Use 'quit' to exit", self.settings))
@@ -174,11 +271,26 @@ class ValyxoShell:
 
         if cmd in ["quit", "exit"]:
             self.running = False
+            self.history.flush()
+            self.search_index.flush()
+            self.watcher.close()
+            self.git.close()
+            self.plugins.close()
+            for job in self.jobs.get_jobs():
+                self.jobs.kill_job(job["pid"])
             print(get_success_banner("Goodbye!", self.settings))
         elif cmd == "-help":
             self._show_help()
         elif cmd == "man":
             self._handle_man(args)
+        elif cmd == "history":
+            self._handle_history(args)
+        elif cmd == "env":
+            self._handle_env(args)
+        elif cmd == "export":
+            self._handle_export(args)
+        elif cmd == "unset":
+            self._handle_unset(args)
         elif cmd == "mkdir":
             self._handle_mkdir(args)
         elif cmd == "ls":
@@ -189,6 +301,10 @@ class ValyxoShell:
             self._handle_cat(args)
         elif cmd == "grep":
             self._handle_grep(args)
+        elif cmd == "find":
+            self._handle_find(args)
+        elif cmd == "open":
+            self._handle_open(args)
         elif cmd == "nano":
             self._handle_nano(args)
         elif cmd == "run":
@@ -219,6 +335,9 @@ class ValyxoShell:
         else:
             # Try plugin commands
             if self.plugins.has_command(cmd):
+                if self.plugins.is_isolated_command(cmd):
+                    self._run_isolated(cmd, args)
+                    return
                 result = self.plugins.execute_command(cmd, args)
                 if result:
                     print(result)
@@ -231,11 +350,13 @@ class ValyxoShell:
 │                                                             │
 │ Navigation & Files:                                         │
 │   cd <path>              Change directory                   │
-│   ls [path]              List files/folders                 │
+│   ls [-l] [-S|-t] [path] List files/folders                 │
 │   mkdir <path>           Create directory                   │
 │   cat <file>             Display file contents              │
 │   nano <file>            Edit file                          │
-│   grep <pattern>         Search files                       │
+│   grep [-i] <pattern>    Search files (regex)               │
+│   find <query>           Fuzzy-find files in workspace      │
+│   open <query>           Edit best fuzzy match              │
 │                                                             │
 │ Execution:                                                  │
 │   run <file>             Execute script                     │
@@ -259,6 +380,10 @@ class ValyxoShell:
 │   enter ValyxoGPT        Chat with AI assistant             │
 │   jobs                   List running processes             │
 │   kill <pid>             Terminate process                  │
+│   history [count]        Show recent commands               │
+│   env [prefix]           List environment variables         │
+│   export NAME=value      Set environment variable           │
+│   unset NAME             Remove environment variable        │
 │   settings [list|set]    Manage settings                    │
 │   man <command>          View documentation                 │
 │   -help                  Show this help                     │
@@ -279,6 +404,53 @@ class ValyxoShell:
             print(get_error_banner("Usage: enter <ValyxoScript|ValyxoGPT>", self.settings))
             print(get_info_banner("  Aliases: vscript, vs, vgpt, gpt", self.settings))
 
+    def _handle_history(self, args: str):
+        """Show recent commands: history [count]."""
+        try:
+            count = int(args.strip()) if args.strip() else 20
+        except ValueError:
+            print(get_error_banner("Usage: history [count]", self.settings))
+            return
+        recent = self.history.recent()
+        start = max(len(recent) - count, 0)
+        for number, command in enumerate(recent[start:], start + 1):
+            print(f"  {number:>5}  {command}")
+
+    def _handle_env(self, args: str):
+        """List environment variables: env [prefix]."""
+        prefix = args.strip()
+        for name in sorted(os.environ):
+            if name.startswith(prefix):
+                print(f"  {name}={os.environ[name]}")
+
+    def _handle_export(self, args: str):
+        """Set environment variables: export NAME=value [NAME=value ...]."""
+        if not args.strip():
+            self._handle_env("")
+            return
+        try:
+            assignments = shlex.split(args)
+        except ValueError as e:
+            print(get_error_banner(f"export: {e}", self.settings))
+            return
+        for assignment in assignments:
+            name, sep, value = assignment.partition("=")
+            if not sep or not name.isidentifier():
+                print(get_error_banner("Usage: export NAME=value", self.settings))
+                return
+            os.environ[name] = value
+        self.autocomplete.refresh_environment()
+
+    def _handle_unset(self, args: str):
+        """Remove environment variables: unset NAME [NAME ...]."""
+        names = args.split()
+        if not names:
+            print(get_error_banner("Usage: unset NAME", self.settings))
+            return
+        for name in names:
+            os.environ.pop(name, None)
+        self.autocomplete.refresh_environment()
+
     def _handle_man(self, cmd: str):
         if not cmd:
             print(get_info_banner("Usage: man <command>", self.settings))
@@ -304,25 +476,82 @@ class ValyxoShell:
         except Exception as e:
             print(get_error_banner(f"Failed to create directory: {e}", self.settings))
 
-    def _handle_ls(self, path: str = ""):
+    def _handle_ls(self, args: str = ""):
+        usage = "Usage: ls [-l] [-r] [-S|-t|--sort=name|size|mtime] [path]"
         try:
+            try:
+                tokens = shlex.split(args)
+            except ValueError:
+                tokens = args.split()
+            
+            long_format = False
+            reverse = False
+            sort_by = "name"
+            path = ""
+            for token in tokens:
+                if token.startswith("--sort="):
+                    sort_by = token.split("=", 1)[1]
+                elif token.startswith("-") and len(token) > 1:
+                    for flag in token[1:]:
+                        if flag == "l":
+                            long_format = True
+                        elif flag == "r":
+                            reverse = True
+                        elif flag == "S":
+                            sort_by = "size"
+                        elif flag == "t":
+                            sort_by = "mtime"
+                        else:
+                            print(get_error_banner(usage, self.settings))
+                            return
+                else:
+                    path = token
+            if sort_by not in ("name", "size", "mtime"):
+                print(get_error_banner(usage, self.settings))
+                return
+            
             target = self.cwd if not path else os.path.join(self.cwd, path)
-            if not os.path.isdir(target):
+            needs_stat = long_format or sort_by != "name"
+            try:
+                listing = self.dir_cache.get(target, max_stat_age=LS_STAT_MAX_AGE if needs_stat else None)
+            except (FileNotFoundError, NotADirectoryError):
                 print(get_error_banner(f"Not a directory: {path}", self.settings))
                 return
             
-            items = os.listdir(target)
-            if not items:
+            if not listing.entries:
                 print(get_info_banner("(empty directory)", self.settings))
                 return
             
-            for item in sorted(items):
-                item_path = os.path.join(target, item)
-                prefix = "📁" if os.path.isdir(item_path) else "📄"
-                print(f"  {prefix} {item}")
+            entries = listing.entries
+            if sort_by == "size":
+                entries = sorted(entries, key=lambda e: getattr(entry_stat(e), "st_size", 0), reverse=True)
+            elif sort_by == "mtime":
+                entries = sorted(entries, key=lambda e: getattr(entry_stat(e), "st_mtime", 0), reverse=True)
+            if reverse:
+                entries = entries[::-1]
+            
+            lines = (self._format_ls_entry(entry, long_format) for entry in entries)
+            if len(entries) > LS_PAGE_THRESHOLD and sys.stdout.isatty():
+                page_lines(lines)
+            else:
+                for line in lines:
+                    print(line)
         except Exception as e:
             print(get_error_banner(f"Error listing directory: {e}", self.settings))
 
+    @staticmethod
+    def _format_ls_entry(entry: os.DirEntry, long_format: bool) -> str:
+        is_dir = entry_is_dir(entry)
+        prefix = "📁" if is_dir else "📄"
+        if not long_format:
+            return f"  {prefix} {entry.name}"
+        st = entry_stat(entry)
+        if st is None:
+            return f"  {prefix} {'?' * 10} {'?':>7}  {'?':<16}  {entry.name}"
+        mtime = time.strftime("%Y-%m-%d %H:%M", time.localtime(st.st_mtime))
+        size = "-" if is_dir else format_size(st.st_size)
+        return f"  {prefix} {stat.filemode(st.st_mode)} {size:>7}  {mtime}  {entry.name}"
+
     def _handle_cd(self, path: str):
         if not path:
             self.cwd = MAIN_PROJECT
@@ -330,8 +559,8 @@ class ValyxoShell:
             return
         
         try:
-            new_cwd = os.path.join(self.cwd, path)
-            if not os.path.isdir(new_cwd):
+            new_cwd = os.path.normpath(os.path.join(self.cwd, os.path.expanduser(path)))
+            if not self._is_dir_cached(new_cwd):
                 print(get_error_banner(f"Directory not found: {path}", self.settings))
                 return
             
@@ -341,6 +570,21 @@ class ValyxoShell:
         except Exception as e:
             print(get_error_banner(f"Error changing directory: {e}", self.settings))
 
+    def _is_dir_cached(self, path: str) -> bool:
+        """isdir() answered from the parent's cached listing when possible.
+        
+        The parent was usually just listed by ls or completion; a listing
+        validated moments ago answers without a syscall. Anything else
+        (no fresh listing, name not in it) falls back to a single isdir().
+        """
+        parent, name = os.path.split(path)
+        if name and name not in (".", ".."):
+            listing = self.dir_cache.peek(parent, ttl=CD_LISTING_TTL)
+            entry = listing.find(name) if listing is not None else None
+            if entry is not None and entry_is_dir(entry):
+                return True
+        return os.path.isdir(path)
+
     def _handle_cat(self, filepath: str):
         if not filepath:
             print(get_error_banner("Usage: cat <file>", self.settings))
@@ -355,46 +599,116 @@ class ValyxoShell:
             print(get_error_banner(f"Error reading file: {e}", self.settings))
 
     def _handle_grep(self, args: str):
+        usage = "Usage: grep [-i] [-F] [--exclude=<glob>] <pattern> [path] | grep --reindex"
         if not args:
-            print(get_error_banner("Usage: grep <pattern> [path]", self.settings))
+            print(get_error_banner(usage, self.settings))
             return
         try:
-            parts = args.split(maxsplit=1)
-            pattern = parts[0]
-            search_path = self.cwd if len(parts) < 2 else os.path.join(self.cwd, parts[1])
+            try:
+                tokens = shlex.split(args)
+            except ValueError:
+                tokens = args.split()
+            
+            ignore_case = False
+            fixed = False
+            excludes = []
+            positional = []
+            for token in tokens:
+                if token == "-i":
+                    ignore_case = True
+                elif token == "-F":
+                    fixed = True
+                elif token.startswith("--exclude="):
+                    excludes.append(token.split("=", 1)[1])
+                else:
+                    positional.append(token)
+            
+            if positional == ["--reindex"]:
+                self._grep_reindex()
+                return
+            if not positional:
+                print(get_error_banner(usage, self.settings))
+                return
+            
+            pattern = positional[0]
+            search_path = self.cwd if len(positional) < 2 else os.path.join(self.cwd, positional[1])
             
             if not os.path.exists(search_path):
                 print(get_error_banner(f"Path not found: {args}", self.settings))
                 return
             
+            single_file = os.path.isfile(search_path)
+            candidates = None
+            if not single_file and not excludes and self.search_index.exists() \
+                    and self.search_index.covers(search_path):
+                self.search_index.update(save=False)  # written at exit
+                candidates = self.search_index.candidates(pattern, search_path, ignore_case, fixed)
+            
             matches = 0
-            if os.path.isfile(search_path):
-                with open(search_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    for i, line in enumerate(f, 1):
-                        if pattern in line:
-                            print(f"  {i}: {line.rstrip()}")
-                            matches += 1
-            else:
-                for root, dirs, files in os.walk(search_path):
-                    for file in files:
-                        filepath = os.path.join(root, file)
-                        try:
-                            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                                for i, line in enumerate(f, 1):
-                                    if pattern in line:
-                                        rel_path = os.path.relpath(filepath, self.cwd)
-                                        print(f"  {rel_path}:{i}: {line.rstrip()}")
-                                        matches += 1
-                        except:
-                            pass
+            for match in self.search.search(pattern, search_path, ignore_case=ignore_case,
+                                            fixed=fixed, excludes=excludes, files=candidates):
+                if single_file:
+                    print(f"  {match.line_number}: {match.line}")
+                else:
+                    rel_path = os.path.relpath(match.path, self.cwd)
+                    print(f"  {rel_path}:{match.line_number}: {match.line}")
+                matches += 1
             
+            if self.search.errors:
+                print(get_info_banner(f"Skipped {len(self.search.errors)} unreadable file(s)", self.settings))
             if matches == 0:
                 print(get_info_banner(f"No matches found for '{pattern}'", self.settings))
             else:
                 print(get_success_banner(f"Found {matches} match(es)", self.settings))
+        except ValyxoSearchError as e:
+            print(get_error_banner(str(e), self.settings))
         except Exception as e:
             print(get_error_banner(f"Error searching: {e}", self.settings))
 
+    def _grep_reindex(self):
+        print(get_info_banner(f"Indexing {normalize_virtual_path(self.search_index.root, ROOT_DIR)} ...", self.settings))
+        result = self.search_index.update()
+        stats = self.search_index.get_stats()
+        print(get_section_header("Search Index", self.settings))
+        print(f"  files:      {stats['files']} ({stats['text_files']} text, "
+              f"{stats['binary_files']} binary, {stats['large_files']} large)")
+        print(f"  indexed:    {stats['indexed_bytes'] / 1024 / 1024:.1f} MB")
+        print(f"  index size: {stats['index_bytes'] / 1024:.1f} KB")
+        print(f"  avg fill:   {stats['avg_fill']:.0%}")
+        print(f"  changes:    +{result['added']} ~{result['updated']} -{result['removed']} "
+              f"({result['unchanged']} unchanged, {result['seconds']:.2f}s)")
+
+    def _handle_find(self, query: str):
+        query = query.strip()
+        if not query:
+            print(get_error_banner("Usage: find <query>", self.settings))
+            return
+        try:
+            results = self.file_index.find(query, limit=20)
+            if not results:
+                print(get_info_banner(f"No files matching '{query}'", self.settings))
+                return
+            for _, path, _ in results:
+                print(f"  {normalize_virtual_path(path, ROOT_DIR)}")
+        except Exception as e:
+            print(get_error_banner(f"Error finding files: {e}", self.settings))
+
+    def _handle_open(self, query: str):
+        query = query.strip()
+        if not query:
+            print(get_error_banner("Usage: open <query>", self.settings))
+            return
+        try:
+            results = self.file_index.find(query, limit=1)
+            if not results:
+                print(get_error_banner(f"No files matching '{query}'", self.settings))
+                return
+            path = results[0][1]
+            print(get_info_banner(f"Opening {normalize_virtual_path(path, ROOT_DIR)}", self.settings))
+            self._handle_nano(path)
+        except Exception as e:
+            print(get_error_banner(f"Error opening file: {e}", self.settings))
+
     def _handle_nano(self, filepath: str):
         if not filepath:
             print(get_error_banner("Usage: nano <file>", self.settings))
@@ -453,7 +767,8 @@ class ValyxoShell:
         
         print(get_section_header("Running Jobs", self.settings))
         for job in jobs:
-            print(f"  [{job['pid']}] {job['cmd']}")
+            progress = f"  {job['progress']}" if job['progress'] else ""
+            print(f"  [{job['pid']}] {job['cmd']} [{job['status']}] ({job['elapsed']}s){progress}")
 
     def _handle_kill(self, pid_str: str):
         if not pid_str:
@@ -461,8 +776,10 @@ class ValyxoShell:
             return
         try:
             pid = int(pid_str)
-            self.jobs.kill_job(pid)
-            print(get_success_banner(f"Process {pid} terminated", self.settings))
+            if self.jobs.kill_job(pid):
+                print(get_success_banner(f"Process {pid} terminated", self.settings))
+            else:
+                print(get_error_banner(f"No running job {pid}", self.settings))
         except ValueError:
             print(get_error_banner("Invalid PID (must be a number)", self.settings))
         except Exception as e:
@@ -527,10 +844,12 @@ class ValyxoShell:
         print(get_section_header("ValyxoScript Interpreter", self.settings))
         print(get_info_banner("Type 'exit' or press CTRL+D to exit", self.settings))
         
+        self.completion_mode = "script"
         try:
             while True:
                 try:
                     line = prompt("vscript> ").strip()
+                    self.autocomplete.reset()
                     if not line:
                         continue
                     if line in ["exit", "quit"]:
@@ -540,6 +859,9 @@ class ValyxoShell:
                     print("\n" + get_info_banner("Type 'exit' to quit", self.settings))
         except Exception as e:
             print(get_error_banner(f"Error: {e}", self.settings))
+        finally:
+            self.completion_mode = "shell"
+            self.autocomplete.reset()
 
     def _execute_valyxoscript(self, code: str):
         try:
@@ -579,41 +901,61 @@ class ValyxoShell:
         """Handle git commands."""
         if not args:
             print(get_info_banner("Usage: git <command> [args]", self.settings))
-            print("  status, add, commit, push, pull, branch, checkout, log, diff, clone")
+            print("  status, add, commit, push, pull, branch, checkout, log, show, blame, diff, clone, stash")
             return
         
         parts = args.split(maxsplit=1)
         subcmd = parts[0].lower()
         subargs = parts[1] if len(parts) > 1 else ""
         
+        self.git.cwd = self.cwd
         try:
-            if subcmd == "status":
-                result = self.git.status(self.cwd)
+            if subcmd == "status" and subargs == "--all":
+                self._git_status_all()
+                return
+            elif subcmd == "status":
+                result = self.git.status(short=subargs == "-s")
             elif subcmd == "add":
-                result = self.git.add(self.cwd, subargs.split() if subargs else ["."])
+                result = self.git.add(subargs.split() if subargs else ["."])
             elif subcmd == "commit":
                 if not subargs:
                     print(get_error_banner("Usage: git commit <message>", self.settings))
                     return
-                result = self.git.commit(self.cwd, subargs)
-            elif subcmd == "push":
-                result = self.git.push(self.cwd)
-            elif subcmd == "pull":
-                result = self.git.pull(self.cwd)
+                result = self.git.commit(subargs)
+            elif subcmd in ("push", "pull"):
+                words = subargs.split()
+                start = self.git.push_async if subcmd == "push" else self.git.pull_async
+                self._started_job(start(self.jobs, *words[:2]))
+                return
             elif subcmd == "branch":
-                if subargs:
-                    result = self.git.create_branch(self.cwd, subargs)
-                else:
-                    result = self.git.list_branches(self.cwd)
+                result = self.git.branch(subargs or None)
             elif subcmd == "checkout":
                 if not subargs:
                     print(get_error_banner("Usage: git checkout <branch>", self.settings))
                     return
-                result = self.git.checkout(self.cwd, subargs)
+                result = self.git.checkout(subargs)
             elif subcmd == "log":
-                result = self.git.log(self.cwd)
+                words = subargs.split()
+                count = next((int(w.lstrip("-")) for w in words if w.lstrip("-").isdigit()), None)
+                self._page_stream(self.git.log_lines(count, oneline="--full" not in words))
+                return
+            elif subcmd == "show":
+                result = self.git.show(subargs or "HEAD")
+            elif subcmd == "blame":
+                words = subargs.split()
+                if not words or (len(words) > 1 and not words[1].isdigit()):
+                    print(get_error_banner("Usage: git blame <file> [line]", self.settings))
+                    return
+                if len(words) > 1:
+                    result = self.git.blame(words[0], int(words[1]))
+                else:
+                    page_lines(self.git.blame(words[0]).split("\n"))
+                    return
             elif subcmd == "diff":
-                result = self.git.diff(self.cwd, subargs if subargs else None)
+                staged = subargs.startswith("--staged")
+                target = subargs[len("--staged"):].strip() if staged else subargs
+                self._page_stream(self.git.diff_lines(staged, target or None))
+                return
             elif subcmd == "clone":
                 if not subargs:
                     print(get_error_banner("Usage: git clone <url> [directory]", self.settings))
@@ -621,9 +963,10 @@ class ValyxoShell:
                 url_parts = subargs.split()
                 url = url_parts[0]
                 dest = url_parts[1] if len(url_parts) > 1 else None
-                result = self.git.clone(url, dest)
+                self._started_job(self.git.clone_async(self.jobs, url, dest))
+                return
             elif subcmd == "stash":
-                result = self.git.stash(self.cwd, "push" if not subargs else subargs)
+                result = self.git.stash(pop=subargs == "pop", list_stashes=subargs == "list")
             else:
                 print(get_error_banner(f"Unknown git command: {subcmd}", self.settings))
                 return
@@ -632,6 +975,51 @@ class ValyxoShell:
         except Exception as e:
             print(get_error_banner(f"Git error: {e}", self.settings))
 
+    def _started_job(self, pid: int):
+        job = self.jobs.get_job(pid)
+        print(get_info_banner(f"[{pid}] {job['path']} running in background ('jobs' to watch, 'kill {pid}' to cancel)", self.settings))
+
+    def _run_isolated(self, cmd: str, args: str):
+        """Run an isolated plugin command in the plugin host as a background job."""
+        name = f"{cmd} {args}".strip()
+        pid = self.jobs.start_job(name, lambda pid: self.plugins.run_isolated(
+            cmd, args, on_start=lambda cancel: self.jobs.set_cancel(pid, cancel),
+            should_stop=lambda: self.jobs.should_stop(pid)))
+        self._started_job(pid)
+
+    def _report_finished_jobs(self):
+        """Print background jobs that finished since the last prompt."""
+        for job in self.jobs.pop_finished():
+            message = f"[{job['pid']}] {job['cmd']} {job['status']}: {job['result']}"
+            if job["status"] == "done":
+                print(get_success_banner(message, self.settings))
+            else:
+                print(get_error_banner(message, self.settings))
+
+    def _page_stream(self, lines):
+        """Page a streamed git output; quitting the pager stops git."""
+        try:
+            page_lines(lines)
+        finally:
+            lines.close()
+
+    def _git_status_all(self):
+        """Status of every repository under Projects, printed as each finishes."""
+        results = []
+        for path, snapshot in self.git.status_all(PROJECTS_DIR):
+            results.append((path, snapshot))
+            name = os.path.relpath(path, PROJECTS_DIR)
+            if snapshot is None:
+                print(f"  ✗ {name}: git status failed")
+            else:
+                state = f"{snapshot.changes} changes" if snapshot.changes else "clean"
+                print(f"  ✓ {name} ({snapshot.prompt_segment()}): {state}")
+        if not results:
+            print(get_info_banner(f"No git repositories under {PROJECTS_DIR}", self.settings))
+            return
+        print()
+        print(format_status_table(results, PROJECTS_DIR))
+
     def _handle_plugin(self, args: str):
         """Handle plugin commands."""
         if not args or args == "list":
@@ -642,7 +1030,8 @@ class ValyxoShell:
             print(get_section_header("Installed Plugins", self.settings))
             for plugin in plugins:
                 status = "✓" if plugin.get("enabled") else "○"
-                print(f"  {status} {plugin['name']} v{plugin.get('version', '?')} - {plugin.get('description', '')}")
+                loaded = "" if plugin.get("loaded") else " (not loaded)"
+                print(f"  {status} {plugin['name']} v{plugin.get('version', '?')} - {plugin.get('description', '')}{loaded}")
             return
         
         parts = args.split(maxsplit=1)
@@ -653,8 +1042,11 @@ class ValyxoShell:
             if not subargs:
                 print(get_error_banner("Usage: plugin install <path>", self.settings))
                 return
-            result = self.plugins.load_plugin(subargs)
-            print(result)
+            error = self.plugins.load_plugin(subargs)
+            if error:
+                print(get_error_banner(error, self.settings))
+            else:
+                print(get_success_banner(f"Loaded plugin: {subargs}", self.settings))
         elif subcmd == "enable":
             if not subargs:
                 print(get_error_banner("Usage: plugin enable <name>", self.settings))
@@ -672,7 +1064,7 @@ class ValyxoShell:
                 print(get_error_banner("Usage: plugin create <name>", self.settings))
                 return
             from valyxo.core import create_plugin_template
-            result = create_plugin_template(subargs, self.cwd)
+            result = create_plugin_template(subargs)
             print(result)
         else:
             print(get_error_banner("Usage: plugin [list|install|enable|disable|create]", self.settings))
@@ -4,7 +4,10 @@ from .constants import (
     CONFIG_DIR, MAN_DIR, MAIN_PROJECT, CONFIG_PATH, THEMES_PATH,
     HISTORY_PATH, API_KEY_PATH, COMMANDS, LANG_MAP, DEFAULT_SETTINGS
 )
-from .utils import prompt, path_within_root, normalize_virtual_path, highlight_valyxoscript
+from .utils import (
+    prompt, path_within_root, normalize_virtual_path, highlight_valyxoscript,
+    page_lines, format_size
+)
 from .filesystem import ValyxoFileSystem
 from .gpt import ValyxoGPTModule
 from .jobs import ValyxoJobsManager
@@ -19,8 +22,13 @@ from .branding import (
 
 # v0.6.0 New Modules
 from .plugins import ValyxoPlugin, ValyxoPluginManager, create_plugin_template
+from .plugin_host import ValyxoPluginHost, PluginHostError
 from .packages import ValyxoPackageManager, BUILTIN_PACKAGES
-from .git import ValyxoGit
+from .git import ValyxoGit, GitStatusSnapshot, discover_repos, format_status_table
+from .git_worker import ValyxoGitWorkerPool, GitCatFile, GitObject, GitCommit, parse_commit
+from .git_objects import GitObjectStore, GitPack, GitReadUnsupported
+from .git_blame import ValyxoBlameCache, BlameLine, BlameCommit
+from .git_index import GitIndex, ValyxoChangeDetector, ChangeReport
 from .templates import list_templates, create_project, get_template_info, TEMPLATES
 from .theme_editor import ValyxoTheme, ValyxoThemeManager, BUILTIN_THEMES
 from .keybindings import ValyxoKeybindManager, Keybinding, DEFAULT_KEYBINDINGS
@@ -30,6 +38,14 @@ from .script_extensions import (
     ValyxoArray, ValyxoObject, ValyxoScriptExtensions, 
     BUILTIN_FUNCTIONS, integrate_extensions
 )
+from .search import ValyxoSearch, ValyxoSearchError, SearchMatch, IgnoreRules
+from .search_index import ValyxoSearchIndex
+from .prefix_index import PrefixIndex
+from .fuzzy import fuzzy_match, fuzzy_score, fuzzy_top_k, fuzzy_filter
+from .dircache import ValyxoDirCache, DirListing, entry_is_dir, entry_stat
+from .file_index import ValyxoFileIndex
+from .history import ValyxoHistory
+from .watcher import ValyxoFileWatcher, WatchEvent, WatchedCache
 
 __all__ = [
     # Existing exports
@@ -38,6 +54,7 @@ __all__ = [
     'CONFIG_DIR', 'MAN_DIR', 'MAIN_PROJECT', 'CONFIG_PATH', 'THEMES_PATH',
     'HISTORY_PATH', 'API_KEY_PATH', 'COMMANDS', 'LANG_MAP', 'DEFAULT_SETTINGS',
     'prompt', 'path_within_root', 'normalize_virtual_path', 'highlight_valyxoscript',
+    'page_lines', 'format_size',
     'ValyxoFileSystem', 'ValyxoGPTModule', 'ValyxoJobsManager', 'ValyxoManSystem',
     'VALYXO_LOGO', 'VALYXOHUB_LOGO', 'VALYXOSCRIPT_LOGO', 'VALYXOGPT_LOGO', 'VALYXOAPP_LOGO',
     'SEPARATOR', 'THIN_SEPARATOR', 'BANNER_SEPARATOR',
@@ -47,8 +64,13 @@ __all__ = [
     
     # v0.6.0 New exports
     'ValyxoPlugin', 'ValyxoPluginManager', 'create_plugin_template',
+    'ValyxoPluginHost', 'PluginHostError',
     'ValyxoPackageManager', 'BUILTIN_PACKAGES',
-    'ValyxoGit',
+    'ValyxoGit', 'GitStatusSnapshot', 'discover_repos', 'format_status_table',
+    'ValyxoGitWorkerPool', 'GitCatFile', 'GitObject', 'GitCommit', 'parse_commit',
+    'GitObjectStore', 'GitPack', 'GitReadUnsupported',
+    'ValyxoBlameCache', 'BlameLine', 'BlameCommit',
+    'GitIndex', 'ValyxoChangeDetector', 'ChangeReport',
     'list_templates', 'create_project', 'get_template_info', 'TEMPLATES',
     'ValyxoTheme', 'ValyxoThemeManager', 'BUILTIN_THEMES',
     'ValyxoKeybindManager', 'Keybinding', 'DEFAULT_KEYBINDINGS',
@@ -56,4 +78,12 @@ __all__ = [
     'ValyxoAutoComplete', 'create_autocomplete',
     'ValyxoArray', 'ValyxoObject', 'ValyxoScriptExtensions',
     'BUILTIN_FUNCTIONS', 'integrate_extensions',
+    'ValyxoSearch', 'ValyxoSearchError', 'SearchMatch', 'IgnoreRules',
+    'ValyxoSearchIndex',
+    'PrefixIndex',
+    'fuzzy_match', 'fuzzy_score', 'fuzzy_top_k', 'fuzzy_filter',
+    'ValyxoDirCache', 'DirListing', 'entry_is_dir', 'entry_stat',
+    'ValyxoFileIndex',
+    'ValyxoFileWatcher', 'WatchEvent', 'WatchedCache',
+    'ValyxoHistory',
 ]
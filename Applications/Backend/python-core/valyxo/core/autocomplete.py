@@ -6,12 +6,99 @@ Usage:
     Press TAB to auto-complete
     Press TAB TAB to show all completions
     Press SHIFT+TAB for previous completion
+
+Incremental completion:
+    Providers that can describe their candidate set (``incremental``) are
+    driven through a CompletionSession. The session loads a provider's
+    candidates once and, as the typed word grows, narrows the previous
+    matches instead of re-listing and re-matching everything. Cached sets
+    are dropped when the command word or the completed directory changes.
+
+Deadlines:
+    Providers run concurrently, each on its own daemon thread, and a TAB
+    waits at most ``deadline`` seconds for them. Whatever arrived in time
+    is shown; late results are discarded. A provider still busy with an
+    earlier request is skipped rather than started twice, so a hung
+    provider (e.g. a stalled network mount) costs one thread, not one per
+    keystroke. Latency, timeouts and errors are recorded per provider
+    (see ``ValyxoAutoComplete.get_stats``).
 """
 
 import os
 import re
-from typing import List, Dict, Any, Optional, Callable, Tuple
-from dataclasses import dataclass
+import time
+import heapq
+import queue
+import threading
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
+from dataclasses import dataclass, field
+from .dircache import ValyxoDirCache
+from .prefix_index import PrefixIndex
+from .history import ValyxoHistory
+from .fuzzy import fuzzy_score, fuzzy_top_k, fuzzy_filter
+from .script_extensions import ValyxoArray, ValyxoObject
+
+
+# Completions returned for one TAB (providers are asked for at most this many)
+MAX_COMPLETIONS = 50
+
+# Seconds one TAB waits for providers; later results are discarded
+COMPLETION_DEADLINE = 0.15
+
+# Seconds a directory listing is trusted between TABs without a stat
+LISTING_TTL = 1.0
+
+# Added to candidates that start with the typed word, so they always rank
+# above scattered fuzzy matches
+PREFIX_BONUS = 1000
+
+# Small per-kind tie-breakers added to the fuzzy score
+KIND_BONUS = {
+    "snippet": 8,
+    "directory": 7,
+    "file": 6,
+    "variable": 6,
+    "function": 6,
+    "member": 6,
+    "command": 5,
+    "argument": 5,
+    "history": 4,
+}
+
+
+def rank_candidates(pattern: str, prefix_hits: Iterable[Any], candidates: Callable[[], Iterable[Any]],
+                    limit: int, key: Callable[[Any], str] = None) -> List[Tuple[int, Any]]:
+    """Rank completion candidates against the typed word.
+    
+    Prefix hits (usually straight from a prefix index) come first. Only when
+    they do not fill ``limit`` is the full candidate set fuzzy-matched, and
+    then a bounded heap keeps just the best of them.
+    
+    Args:
+        pattern: The word being completed
+        prefix_hits: Candidates known to start with the pattern
+        candidates: Returns every candidate (only called if needed)
+        limit: Maximum results
+        key: Maps a candidate to its text
+    
+    Returns:
+        List of (score, candidate), prefix hits first
+    """
+    key = key or (lambda item: item)
+    folded = pattern.lower()
+    results: List[Tuple[int, Any]] = []
+    seen = set()
+    for item in prefix_hits:
+        if len(results) >= limit:
+            return results
+        text = key(item)
+        score = fuzzy_score(folded, text.lower()) or 0
+        results.append((score + PREFIX_BONUS, item))
+        seen.add(text)
+    if pattern and len(results) < limit:
+        rest = (item for item in candidates() if key(item) not in seen)
+        results.extend(fuzzy_top_k(pattern, rest, limit - len(results), key=key))
+    return results
 
 
 @dataclass
@@ -23,22 +110,85 @@ class Completion:
     kind: str = "text"  # "command", "file", "directory", "argument", "snippet", "history"
     insert_text: str = None  # Text to actually insert (if different from text)
     score: int = 0  # Relevance score
+    expand: Optional[Callable[[], str]] = field(default=None, repr=False, compare=False)  # Renders the inserted text on apply
     
     def __post_init__(self):
         if self.insert_text is None:
             self.insert_text = self.text
 
 
+@dataclass
+class ProviderStats:
+    """Latency and failure counters for one completion provider."""
+    name: str
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0  # answered after the deadline
+    skipped: int = 0  # not started because the previous call was still running
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_error: str = ""
+    busy: bool = field(default=False, repr=False)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "last_error": self.last_error,
+        }
+
+
 class CompletionProvider:
-    """Base class for completion providers."""
+    """Base class for completion providers.
+    
+    Providers that set ``incremental`` also implement ``query``,
+    ``candidates`` and ``make_completion`` so a CompletionSession can reuse
+    their candidate set between keystrokes.
+    """
+    
+    incremental = False
+    
+    # Prompt modes the provider answers in (context["mode"], default "shell")
+    modes: Tuple[str, ...] = ("shell",)
     
     def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
         """Get completions for the given text and cursor position."""
         raise NotImplementedError
+    
+    def query(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
+        """Describe what is being completed.
+        
+        Returns:
+            Tuple of (candidate set key, word being completed), or None if
+            the provider has nothing to offer here. Equal keys must mean
+            equal candidate sets.
+        """
+        raise NotImplementedError
+    
+    def candidates(self, key: Any, context: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """Every candidate for a key, as (text, payload) pairs."""
+        raise NotImplementedError
+    
+    def make_completion(self, key: Any, item: Tuple[str, Any], score: int) -> Completion:
+        """Build the Completion for a ranked candidate."""
+        raise NotImplementedError
 
 
 class CommandCompletionProvider(CompletionProvider):
-    """Provides completions for built-in commands."""
+    """Provides completions for built-in and plugin commands.
+    
+    Commands and subcommands live in prefix indexes built once, so a
+    keystroke costs a binary search plus the results returned. Plugin
+    commands are added and removed as plugins register them (see
+    ``attach_plugins``).
+    """
+    
+    # Maximum completions returned for one query
+    MAX_RESULTS = 100
     
     COMMANDS = {
         # Core commands
@@ -62,7 +212,8 @@ class CommandCompletionProvider(CompletionProvider):
         "mv": "Move/rename files",
         "cat": "Display file contents",
         "touch": "Create empty file",
-        "find": "Find files",
+        "find": "Fuzzy-find files",
+        "open": "Open best fuzzy match in editor",
         "grep": "Search in files",
         
         # Editor
@@ -126,6 +277,7 @@ class CommandCompletionProvider(CompletionProvider):
         "hostname": "Show hostname",
         "env": "Show environment variables",
         "export": "Set environment variable",
+        "unset": "Remove environment variable",
         
         # Valyxo specific
         "valyxo": "Valyxo information",
@@ -147,59 +299,123 @@ class CommandCompletionProvider(CompletionProvider):
         "new": ["python", "node", "react", "flask", "express", "valyxoscript", "html", "cli"],
     }
     
-    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
-        completions = []
-        
-        # Get the word being typed
+    def __init__(self):
+        self.commands = PrefixIndex(((cmd, desc) for cmd, desc in self.COMMANDS.items()), fold=str.lower)
+        self.subcommands: Dict[str, PrefixIndex] = {
+            cmd: PrefixIndex(((sub, f"{cmd} {sub}") for sub in subs), fold=str.lower)
+            for cmd, subs in self.SUBCOMMANDS.items()
+        }
+        self.plugin_commands: Dict[str, str] = {}  # command -> description
+        self.version = 0  # bumped whenever the command set changes
+    
+    def add_command(self, name: str, description: str = "") -> None:
+        """Add a plugin command (built-in commands are never replaced)."""
+        if name.lower() in self.COMMANDS:
+            return
+        self.plugin_commands[name] = description
+        self.commands.add(name, description or "Plugin command")
+        self.version += 1
+    
+    def remove_command(self, name: str) -> None:
+        """Remove a plugin command."""
+        if self.plugin_commands.pop(name, None) is not None:
+            self.commands.remove(name)
+            self.version += 1
+    
+    def attach_plugins(self, plugin_manager) -> None:
+        """Track commands registered by a ValyxoPluginManager."""
+        for name, plugin_name in plugin_manager.plugin_commands.items():
+            plugin = plugin_manager.get_plugin(plugin_name)
+            info = plugin.commands.get(name) if plugin else None
+            self.add_command(name, info.get("help", "") if isinstance(info, dict) else "")
+        plugin_manager.add_command_listener(self._on_plugin_command)
+    
+    def _on_plugin_command(self, name: str, help_text: Optional[str]) -> None:
+        if help_text is None:
+            self.remove_command(name)
+        else:
+            self.add_command(name, help_text)
+    
+    incremental = True
+    
+    def _index_for(self, key: Tuple) -> Optional[PrefixIndex]:
+        return self.commands if key[0] == "command" else self.subcommands.get(key[1])
+    
+    def query(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
         words = text[:cursor_pos].split()
-        
         if not words or (len(words) == 1 and not text.endswith(' ')):
             # Completing command name
-            prefix = words[0] if words else ""
-            for cmd, desc in self.COMMANDS.items():
-                if cmd.startswith(prefix.lower()):
-                    completions.append(Completion(
-                        text=cmd,
-                        display=cmd,
-                        description=desc,
-                        kind="command",
-                        score=100 if cmd == prefix else 50
-                    ))
-        else:
-            # Completing subcommand or argument
-            cmd = words[0].lower()
-            if cmd in self.SUBCOMMANDS:
-                prefix = words[-1] if not text.endswith(' ') else ""
-                for subcmd in self.SUBCOMMANDS[cmd]:
-                    if subcmd.startswith(prefix.lower()):
-                        completions.append(Completion(
-                            text=subcmd,
-                            display=subcmd,
-                            description=f"{cmd} {subcmd}",
-                            kind="argument",
-                            score=50
-                        ))
-        
-        return completions
+            return ("command", self.version), (words[0] if words else "")
+        # Completing subcommand or argument
+        cmd = words[0].lower()
+        if cmd not in self.subcommands:
+            return None
+        return ("subcommand", cmd), (words[-1] if not text.endswith(' ') else "")
+    
+    def candidates(self, key: Any, context: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        return self._index_for(key).items_with_prefix("")
+    
+    def make_completion(self, key: Any, item: Tuple[str, Any], score: int) -> Completion:
+        name, desc = item
+        kind = "command" if key[0] == "command" else "argument"
+        return Completion(
+            text=name,
+            display=name,
+            description=desc,
+            kind=kind,
+            score=score + KIND_BONUS[kind]
+        )
+    
+    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
+        query = self.query(text, cursor_pos, context)
+        if query is None:
+            return []
+        key, prefix = query
+        index = self._index_for(key)
+        limit = context.get("limit", self.MAX_RESULTS)
+        ranked = rank_candidates(prefix, index.items_with_prefix(prefix, limit),
+                                 lambda: index.items_with_prefix(""), limit,
+                                 key=lambda item: item[0])
+        return [self.make_completion(key, item, score) for score, item in ranked]
 
 
 class FileCompletionProvider(CompletionProvider):
-    """Provides completions for file and directory paths."""
+    """Provides completions for file and directory paths.
+    
+    Directory listings come from the workspace file index when one is
+    attached, otherwise from the directory cache shared with ``ls`` and
+    ``cd`` (or a private one). Listings are revalidated by directory mtime
+    at most once per LISTING_TTL, so repeated keystrokes neither re-list
+    nor re-stat the disk.
+    """
     
     FILE_COMMANDS = {"cd", "cat", "nano", "edit", "rm", "cp", "mv", "run", "ls", "mkdir", "touch", "find", "grep", "source"}
     
-    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
-        completions = []
-        
+    def __init__(self, file_index=None, dir_cache=None):
+        self.file_index = file_index
+        self.dir_cache = dir_cache if dir_cache is not None else ValyxoDirCache(capacity=16)
+    
+    def _list_dir(self, base_dir: str) -> List[Tuple[str, bool]]:
+        """List (name, is_dir) entries, preferring the file index."""
+        if self.file_index is not None:
+            entries = self.file_index.list_dir(base_dir)
+            if entries is not None:
+                return entries
+        return self.dir_cache.get(base_dir, ttl=LISTING_TTL).pairs()
+    
+    incremental = True
+    
+    def query(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
+        """Key file candidates by the directory being completed."""
         words = text[:cursor_pos].split()
         if not words:
-            return completions
+            return None
         
         cmd = words[0].lower()
         
         # Check if this command expects file/path arguments
         if cmd not in self.FILE_COMMANDS and len(words) < 2:
-            return completions
+            return None
         
         # Get the path being typed
         if text.endswith(' '):
@@ -224,188 +440,638 @@ class FileCompletionProvider(CompletionProvider):
             else:
                 base_dir = cwd
         
+        return ("file", base_dir), path_prefix
+    
+    def candidates(self, key: Any, context: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        return self._list_dir(key[1])
+    
+    def make_completion(self, key: Any, item: Tuple[str, Any], score: int) -> Completion:
+        entry, is_dir = item
+        display_name = entry + ("/" if is_dir else "")
+        kind = "directory" if is_dir else "file"
+        return Completion(
+            text=entry + ("/" if is_dir else ""),
+            display=display_name,
+            description="Directory" if is_dir else "File",
+            kind=kind,
+            score=score + KIND_BONUS[kind]
+        )
+    
+    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
+        query = self.query(text, cursor_pos, context)
+        if query is None:
+            return []
+        key, path_prefix = query
+        
         # List directory contents
         try:
-            if os.path.isdir(base_dir):
-                for entry in os.listdir(base_dir):
-                    if entry.startswith(path_prefix) or not path_prefix:
-                        full_path = os.path.join(base_dir, entry)
-                        is_dir = os.path.isdir(full_path)
-                        
-                        display_name = entry + ("/" if is_dir else "")
-                        
-                        completions.append(Completion(
-                            text=entry + ("/" if is_dir else ""),
-                            display=display_name,
-                            description="Directory" if is_dir else "File",
-                            kind="directory" if is_dir else "file",
-                            score=70 if is_dir else 60
-                        ))
+            entries = self.candidates(key, context)
         except PermissionError:
-            pass
+            return []
         except Exception:
-            pass
+            return []
         
-        return completions
+        limit = context.get("limit", MAX_COMPLETIONS)
+        prefix_hits = (item for item in entries if item[0].startswith(path_prefix))
+        ranked = rank_candidates(path_prefix, prefix_hits, lambda: entries, limit, key=lambda item: item[0])
+        return [self.make_completion(key, item, score) for score, item in ranked]
 
 
 class HistoryCompletionProvider(CompletionProvider):
-    """Provides completions from command history."""
+    """Provides completions from command history, ranked by frecency."""
+    
+    MAX_RESULTS = 10
     
     def __init__(self, history: List[str] = None):
-        self.history = history or []
+        self.history = ValyxoHistory(path=None)
+        if history:
+            self.update_history(history)
     
-    def update_history(self, history: List[str]):
-        self.history = history
+    def update_history(self, history):
+        """Use a ValyxoHistory, or index a plain list of commands."""
+        if isinstance(history, ValyxoHistory):
+            self.history = history
+            return
+        self.history = ValyxoHistory(path=None)
+        for cmd in history:
+            self.history.add(cmd)
     
     def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
         completions = []
-        prefix = text[:cursor_pos].lower()
+        prefix = text[:cursor_pos]
+        limit = min(context.get("limit", self.MAX_RESULTS), self.MAX_RESULTS)
         
-        seen = set()
-        for cmd in reversed(self.history):
-            if cmd.lower().startswith(prefix) and cmd not in seen:
-                seen.add(cmd)
-                completions.append(Completion(
-                    text=cmd,
-                    display=cmd[:50] + "..." if len(cmd) > 50 else cmd,
-                    description="From history",
-                    kind="history",
-                    score=40
-                ))
-                if len(completions) >= 10:
-                    break
+        # Prefix hits come ranked by frecency; scattered matches are only
+        # looked for among recent commands
+        hits = [cmd for cmd, _ in self.history.complete(prefix, limit)]
+        for score, cmd in rank_candidates(prefix, hits, self.history.recent_unique, limit):
+            completions.append(Completion(
+                text=cmd,
+                display=cmd[:50] + "..." if len(cmd) > 50 else cmd,
+                description="From history",
+                kind="history",
+                score=score + KIND_BONUS["history"]
+            ))
         
         return completions
 
 
 class SnippetCompletionProvider(CompletionProvider):
-    """Provides completions for snippets."""
+    """Provides completions for snippet triggers.
     
-    def __init__(self, snippets: Dict[str, Any] = None):
-        self.snippets = snippets or {}
+    Triggers come from the prefix index owned by ValyxoSnippetManager, so
+    a keystroke costs a binary search however large the library is. A
+    snippet body is only rendered when its completion is applied (see
+    ``Completion.expand``).
+    """
     
-    def update_snippets(self, snippets: Dict[str, Any]):
-        self.snippets = snippets
+    incremental = True
+    modes = ("script",)
     
-    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
-        completions = []
+    def __init__(self, snippets=None):
+        self.manager = None
+        self.snippets: Dict[str, Any] = {}
+        self.triggers = PrefixIndex()
+        self.version = 0
+        if snippets is not None:
+            self.update_snippets(snippets)
+    
+    def update_snippets(self, snippets):
+        """Use a ValyxoSnippetManager, or index a {name: snippet} dict."""
+        self.version += 1
+        if hasattr(snippets, "triggers"):
+            self.manager = snippets
+            return
+        self.manager = None
+        self.snippets = dict(snippets)
+        by_trigger: Dict[str, List[str]] = {}
+        for name, snippet in self.snippets.items():
+            by_trigger.setdefault(_snippet_field(snippet, "prefix", name), []).append(name)
+        self.triggers = PrefixIndex(by_trigger.items())
+    
+    def _index(self) -> PrefixIndex:
+        return self.manager.triggers if self.manager is not None else self.triggers
+    
+    def _snippet(self, name: str) -> Any:
+        return (self.manager.snippets if self.manager is not None else self.snippets).get(name)
+    
+    def _render(self, name: str) -> str:
+        if self.manager is not None:
+            return self.manager.use_snippet(name) or ""
+        snippet = self.snippets.get(name)
+        if hasattr(snippet, "expand"):
+            return snippet.expand()
+        return _snippet_field(snippet, "body", name)
+    
+    def query(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
         words = text[:cursor_pos].split()
-        
         if not words:
-            return completions
+            return None
+        version = self.manager.version if self.manager is not None else self.version
+        return ("snippet", id(self._index()), version), (words[-1] if not text.endswith(' ') else "")
+    
+    def candidates(self, key: Any, context: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        return self._index().items_with_prefix("")
+    
+    def make_completion(self, key: Any, item: Tuple[str, Any], score: int) -> Completion:
+        trigger, names = item
+        name = names[0]
+        return Completion(
+            text=trigger,
+            display=f"⟨{trigger}⟩",
+            description=_snippet_field(self._snippet(name), "description", "") or "Snippet",
+            kind="snippet",
+            score=score + KIND_BONUS["snippet"],
+            expand=lambda: self._render(name)
+        )
+    
+    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
+        query = self.query(text, cursor_pos, context)
+        if query is None:
+            return []
+        key, prefix = query
+        limit = context.get("limit", MAX_COMPLETIONS)
         
-        prefix = words[-1] if not text.endswith(' ') else ""
+        index = self._index()
+        ranked = rank_candidates(prefix, index.items_with_prefix(prefix, limit),
+                                 lambda: index.items_with_prefix(""), limit, key=lambda item: item[0])
+        return [self.make_completion(key, item, score) for score, item in ranked]
+
+
+def _snippet_field(snippet: Any, field_name: str, default: Any) -> Any:
+    """Read a field from a Snippet object or a snippet dict."""
+    if isinstance(snippet, dict):
+        return snippet.get(field_name, default)
+    return getattr(snippet, field_name, default)
+
+
+class EnvironmentCompletionProvider(CompletionProvider):
+    """Provides completions for environment variables.
+    
+    Variable names are snapshotted into a sorted prefix index, re-read
+    only by ``refresh`` (called when the shell changes its environment).
+    Values are looked up and truncated only for the completions returned.
+    """
+    
+    incremental = True
+    
+    def __init__(self):
+        self.names = PrefixIndex()
+        self.version = 0
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """Re-snapshot os.environ."""
+        self.names = PrefixIndex((name, None) for name in os.environ)
+        self.version += 1
+    
+    def query(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
+        # Check if we're completing an env var ($VAR pattern)
+        match = re.search(r'\$(\w*)$', text[:cursor_pos])
+        if not match:
+            return None
+        return ("env", self.version), match.group(1)
+    
+    def candidates(self, key: Any, context: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        return self.names.items_with_prefix("")
+    
+    def make_completion(self, key: Any, item: Tuple[str, Any], score: int) -> Completion:
+        name = item[0]
+        value = os.environ.get(name, "")
+        display_value = value[:30] + "..." if len(value) > 30 else value
+        return Completion(
+            text=name,
+            display=f"${name}",
+            description=display_value,
+            kind="variable",
+            insert_text=name,
+            score=score + KIND_BONUS["variable"]
+        )
+    
+    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
+        query = self.query(text, cursor_pos, context)
+        if query is None:
+            return []
+        key, prefix = query
+        limit = context.get("limit", MAX_COMPLETIONS)
         
-        for name, snippet in self.snippets.items():
-            trigger = snippet.get("prefix", name)
-            if trigger.startswith(prefix):
+        # Names are case-sensitive; "$pa" also offers PATH
+        prefix_hits = self.names.items_with_prefix(prefix, limit)
+        if prefix.upper() != prefix:
+            prefix_hits += self.names.items_with_prefix(prefix.upper(), limit)
+        names = self.names
+        ranked = rank_candidates(prefix, prefix_hits, lambda: names.items_with_prefix(""), limit,
+                                 key=lambda item: item[0])
+        return [self.make_completion(key, item, score) for score, item in ranked]
+
+
+class ScriptCompletionProvider(CompletionProvider):
+    """Completes ValyxoScript variables, functions and members.
+    
+    Names come from prefix indexes fed by the runtime's symbol tables
+    (see ValyxoSymbolTable): ``set``, function definitions, imports and
+    builtins are indexed as they appear, so a keystroke never rescans
+    ``runtime.vars`` or ``runtime.functions``. After ``name.`` the methods
+    of a ValyxoArray/ValyxoObject value (and an object's keys) are offered;
+    dotted package functions such as ``math.sqrt`` complete as one word.
+    """
+    
+    modes = ("script",)
+    
+    WORD_PATTERN = re.compile(r'[A-Za-z_][\w.]*$')
+    
+    # Public methods per value type, computed once
+    _MEMBERS: Dict[type, List[str]] = {}
+    
+    def __init__(self, runtime=None):
+        self.runtime = None
+        self.variables = PrefixIndex()
+        self.functions = PrefixIndex()
+        if runtime is not None:
+            self.attach_runtime(runtime)
+    
+    def attach_runtime(self, runtime) -> None:
+        """Index a ValyxoScriptRuntime's symbols and follow their changes."""
+        if self.runtime is not None:
+            self.runtime.vars.remove_listener(self._on_variable)
+            self.runtime.functions.remove_listener(self._on_function)
+        self.runtime = runtime
+        self.variables = PrefixIndex((name, None) for name in runtime.vars)
+        self.functions = PrefixIndex((name, None) for name in runtime.functions)
+        runtime.vars.add_listener(self._on_variable)
+        runtime.functions.add_listener(self._on_function)
+    
+    def _on_variable(self, name: str, present: bool) -> None:
+        if present:
+            self.variables.add(name)
+        else:
+            self.variables.remove(name)
+    
+    def _on_function(self, name: str, present: bool) -> None:
+        if present:
+            self.functions.add(name)
+        else:
+            self.functions.remove(name)
+    
+    @classmethod
+    def _members_of(cls, value: Any) -> List[str]:
+        if not isinstance(value, (ValyxoArray, ValyxoObject)):
+            return []
+        members = cls._MEMBERS.get(type(value))
+        if members is None:
+            members = cls._MEMBERS[type(value)] = sorted(
+                name for name in dir(type(value)) if not name.startswith('_'))
+        if isinstance(value, ValyxoObject):
+            return sorted(set(members) | set(value.keys()))
+        return members
+    
+    def _function_description(self, name: str) -> str:
+        info = self.runtime.functions.get(name) if self.runtime else None
+        if not isinstance(info, dict) or info.get('builtin'):
+            return "Built-in function"
+        return f"{name}({', '.join(info.get('params', []))})"
+    
+    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
+        if self.runtime is None:
+            return []
+        match = self.WORD_PATTERN.search(text[:cursor_pos])
+        word = match.group(0) if match else ""
+        limit = context.get("limit", MAX_COMPLETIONS)
+        completions = []
+        
+        head, dot, attr = word.rpartition('.')
+        if dot and head in self.runtime.vars:
+            members = self._members_of(self.runtime.vars[head])
+            for score, member in rank_candidates(attr, (m for m in members if m.startswith(attr)),
+                                                 lambda: members, limit):
                 completions.append(Completion(
-                    text=trigger,
-                    display=f"⟨{trigger}⟩",
-                    description=snippet.get("description", "Snippet"),
-                    kind="snippet",
-                    insert_text=snippet.get("body", trigger),
-                    score=80
+                    text=f"{head}.{member}",
+                    display=member,
+                    description=type(self.runtime.vars[head]).__name__.replace("Valyxo", ""),
+                    kind="member",
+                    score=score + KIND_BONUS["member"]
                 ))
+            return completions
         
+        for index, kind in ((self.variables, "variable"), (self.functions, "function")):
+            ranked = rank_candidates(word, index.items_with_prefix(word, limit),
+                                     lambda: index.items_with_prefix(""), limit,
+                                     key=_item_text)
+            for score, (name, _) in ranked:
+                if kind == "variable":
+                    value = repr(self.runtime.vars.get(name))
+                    description = value[:30] + "..." if len(value) > 30 else value
+                else:
+                    description = self._function_description(name)
+                completions.append(Completion(
+                    text=name,
+                    display=name + ("()" if kind == "function" else ""),
+                    description=description,
+                    kind=kind,
+                    score=score + KIND_BONUS[kind]
+                ))
         return completions
 
 
-class EnvironmentCompletionProvider(CompletionProvider):
-    """Provides completions for environment variables."""
+def _item_text(item: Tuple[str, Any]) -> str:
+    return item[0]
+
+
+class _CandidateSet:
+    """One provider's cached candidates and the matches for the last word."""
     
-    def get_completions(self, text: str, cursor_pos: int, context: Dict[str, Any]) -> List[Completion]:
-        completions = []
+    __slots__ = ("key", "items", "word", "matches")
+    
+    def __init__(self, key: Any, items: List[Tuple[str, Any]]):
+        self.key = key
+        self.items = items
+        self.word: Optional[str] = None
+        self.matches = items
+    
+    def narrow(self, word: str) -> List[Tuple[str, Any]]:
+        """Candidates matching a word, filtering the last matches when it grew."""
+        if word == self.word:
+            return self.matches
+        base = self.matches if self.word is not None and word.startswith(self.word) else self.items
+        self.matches = fuzzy_filter(word, base, key=_item_text)
+        self.word = word
+        return self.matches
+
+
+class CompletionSession:
+    """Completion state for the line being edited.
+    
+    Each keystroke usually extends the word being completed, and the
+    candidates matching the longer word are a subset of those matching the
+    shorter one. The session therefore loads an incremental provider's
+    candidates (e.g. a directory listing) once, keeps the matches for the
+    last word, and only filters those on the next keystroke. Deleting
+    characters falls back to the full cached set, still without reloading.
+    
+    A provider's set is reloaded when its key changes (a different
+    directory, subcommand table or command list); all sets are dropped
+    when the command word or prompt mode changes or ``reset`` is called.
+    """
+    
+    def __init__(self, autocomplete: "ValyxoAutoComplete"):
+        self.autocomplete = autocomplete
+        self._command: Optional[Tuple[str, str]] = None  # (mode, command word)
+        self._sets: Dict[int, _CandidateSet] = {}
+        self.loads = 0
+        self.reuses = 0
+    
+    def reset(self) -> None:
+        """Forget cached candidates (e.g. once a line has been submitted)."""
+        self._command = None
+        self._sets.clear()
+    
+    @staticmethod
+    def _command_word(text: str, cursor_pos: int) -> str:
+        """The command whose arguments are being completed ("" while typing it)."""
+        before = text[:cursor_pos]
+        words = before.split()
+        if len(words) > 1 or (words and before.endswith(' ')):
+            return words[0].lower()
+        return ""
+    
+    def get_completions(self, text: str, cursor_pos: int = None, context: Dict[str, Any] = None) -> List[Completion]:
+        """Like ValyxoAutoComplete.get_completions, reusing work from the last call."""
+        ac = self.autocomplete
+        cursor_pos, context = ac._prepare(text, cursor_pos, context)
         
-        # Check if we're completing an env var
-        text_before = text[:cursor_pos]
+        command = (context.get("mode", "shell"), self._command_word(text, cursor_pos))
+        if command != self._command:
+            self._sets.clear()
+            self._command = command
         
-        # Find $VAR pattern
-        match = re.search(r'\$(\w*)$', text_before)
-        if not match:
-            return completions
+        def call(provider: CompletionProvider) -> List[Completion]:
+            if provider.incremental:
+                return self._complete_incremental(provider, text, cursor_pos, context)
+            return provider.get_completions(text, cursor_pos, context)
         
-        prefix = match.group(1)
+        return ac._merge(ac._run_providers(call, context.get("mode", "shell")))
+    
+    def _complete_incremental(self, provider: CompletionProvider, text: str, cursor_pos: int,
+                              context: Dict[str, Any]) -> List[Completion]:
+        query = provider.query(text, cursor_pos, context)
+        if query is None:
+            return []
+        key, word = query
         
-        for key, value in os.environ.items():
-            if key.startswith(prefix.upper()):
-                display_value = value[:30] + "..." if len(value) > 30 else value
-                completions.append(Completion(
-                    text=key,
-                    display=f"${key}",
-                    description=display_value,
-                    kind="variable",
-                    insert_text=key,
-                    score=60
-                ))
+        cached = self._sets.get(id(provider))
+        if cached is None or cached.key != key:
+            cached = _CandidateSet(key, provider.candidates(key, context))
+            self._sets[id(provider)] = cached
+            self.loads += 1
+        else:
+            self.reuses += 1
+        matches = cached.narrow(word)
         
-        return completions
+        # Prefix hits follow the matcher's smart-case rule
+        case_sensitive = word != word.lower()
+        folded = word if case_sensitive else word.lower()
+        prefix_hits = (item for item in matches
+                       if (item[0] if case_sensitive else item[0].lower()).startswith(folded))
+        ranked = rank_candidates(word, prefix_hits, lambda: matches, context["limit"], key=_item_text)
+        return [provider.make_completion(key, item, score) for score, item in ranked]
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get session statistics."""
+        return {
+            "cached_sets": len(self._sets),
+            "loads": self.loads,
+            "reuses": self.reuses,
+        }
 
 
 class ValyxoAutoComplete:
     """Main auto-complete system for Valyxo."""
     
-    def __init__(self):
+    def __init__(self, file_index=None, dir_cache=None, deadline: Optional[float] = COMPLETION_DEADLINE):
+        """Create the completion system.
+        
+        Args:
+            file_index: Workspace file index for path completion
+            dir_cache: Shared directory listing cache
+            deadline: Seconds to wait for providers per request (None runs
+                them one after another with no deadline)
+        """
         self.providers: List[CompletionProvider] = [
             CommandCompletionProvider(),
-            FileCompletionProvider(),
+            FileCompletionProvider(file_index, dir_cache),
             HistoryCompletionProvider(),
             EnvironmentCompletionProvider(),
+            SnippetCompletionProvider(),
         ]
         
+        self.max_results = MAX_COMPLETIONS
         self.current_completions: List[Completion] = []
         self.completion_index: int = -1
         self.original_text: str = ""
+        self.session = CompletionSession(self)
+        self.deadline = deadline
+        self._stats: Dict[int, ProviderStats] = {}
+        self._stats_lock = threading.Lock()
     
     def add_provider(self, provider: CompletionProvider):
         """Add a completion provider."""
         self.providers.append(provider)
     
-    def update_history(self, history: List[str]):
-        """Update command history for history provider."""
+    def attach_plugins(self, plugin_manager) -> None:
+        """Complete plugin commands as plugins register and unregister them."""
+        for provider in self.providers:
+            if isinstance(provider, CommandCompletionProvider):
+                provider.attach_plugins(plugin_manager)
+    
+    def update_history(self, history):
+        """Update command history (a ValyxoHistory or list) for history provider."""
         for provider in self.providers:
             if isinstance(provider, HistoryCompletionProvider):
                 provider.update_history(history)
     
-    def update_snippets(self, snippets: Dict[str, Any]):
-        """Update snippets for snippet provider."""
+    def refresh_environment(self) -> None:
+        """Re-snapshot environment variables after the shell changed them."""
+        for provider in self.providers:
+            if isinstance(provider, EnvironmentCompletionProvider):
+                provider.refresh()
+    
+    def attach_script(self, runtime) -> None:
+        """Complete ValyxoScript symbols from a runtime (in "script" mode)."""
+        for provider in self.providers:
+            if isinstance(provider, ScriptCompletionProvider):
+                provider.attach_runtime(runtime)
+                return
+        self.add_provider(ScriptCompletionProvider(runtime))
+    
+    def update_snippets(self, snippets):
+        """Complete snippets from a ValyxoSnippetManager (or a dict of snippets)."""
         for provider in self.providers:
             if isinstance(provider, SnippetCompletionProvider):
                 provider.update_snippets(snippets)
     
     def get_completions(self, text: str, cursor_pos: int = None, context: Dict[str, Any] = None) -> List[Completion]:
-        """Get all completions from all providers."""
-        if cursor_pos is None:
-            cursor_pos = len(text)
-        if context is None:
-            context = {"cwd": os.getcwd()}
+        """Get the best completions from all providers, highest score first.
         
-        all_completions = []
+        Every provider fuzzy-matches the word being typed and returns at
+        most ``max_results`` candidates, which are merged by text and cut
+        down to ``max_results`` with a bounded heap.
+        """
+        cursor_pos, context = self._prepare(text, cursor_pos, context)
+        return self._merge(self._run_providers(lambda p: p.get_completions(text, cursor_pos, context),
+                                               context.get("mode", "shell")))
+    
+    def _stats_for(self, provider: CompletionProvider) -> ProviderStats:
+        stats = self._stats.get(id(provider))
+        if stats is None:
+            stats = self._stats[id(provider)] = ProviderStats(type(provider).__name__)
+        return stats
+    
+    def _call_provider(self, provider: CompletionProvider,
+                       call: Callable[[CompletionProvider], List[Completion]]) -> Optional[List[Completion]]:
+        """Run one provider, recording its latency and any error."""
+        start = time.perf_counter()
+        error = None
+        try:
+            result = call(provider)
+        except Exception as e:
+            result = None
+            error = f"{type(e).__name__}: {e}"
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            stats = self._stats_for(provider)
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.busy = False
+            if error:
+                stats.errors += 1
+                stats.last_error = error
+        return result
+    
+    def _run_providers(self, call: Callable[[CompletionProvider], List[Completion]],
+                       mode: str = "shell") -> List[List[Completion]]:
+        """Ask every provider for a mode, returning the results that beat the deadline."""
+        providers = [provider for provider in self.providers if mode in provider.modes]
+        if self.deadline is None:
+            results = (self._call_provider(provider, call) for provider in providers)
+            return [result for result in results if result]
         
-        for provider in self.providers:
+        runnable = []
+        with self._stats_lock:
+            for provider in providers:
+                stats = self._stats_for(provider)
+                if stats.busy:
+                    stats.skipped += 1
+                    continue
+                stats.busy = True
+                runnable.append(provider)
+        
+        # Each request gets its own queue, so late answers land nowhere
+        answers: "queue.Queue[Tuple[CompletionProvider, Optional[List[Completion]]]]" = queue.Queue()
+        for provider in runnable:
+            threading.Thread(
+                target=lambda p=provider: answers.put((p, self._call_provider(p, call))),
+                name="valyxo-complete",
+                daemon=True,
+            ).start()
+        
+        results = []
+        pending = {id(provider): provider for provider in runnable}
+        end = time.monotonic() + self.deadline
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                completions = provider.get_completions(text, cursor_pos, context)
-                all_completions.extend(completions)
-            except Exception:
-                pass
+                provider, result = answers.get(timeout=remaining)
+            except queue.Empty:
+                break
+            del pending[id(provider)]
+            if result:
+                results.append(result)
         
-        # Sort by score and deduplicate
-        seen = set()
-        unique = []
-        for c in sorted(all_completions, key=lambda x: -x.score):
-            if c.text not in seen:
-                seen.add(c.text)
-                unique.append(c)
+        if pending:
+            with self._stats_lock:
+                for provider in pending.values():
+                    self._stats_for(provider).timeouts += 1
+        return results
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider latency and failure statistics."""
+        with self._stats_lock:
+            return {stats.name: stats.as_dict() for stats in self._stats.values()}
+    
+    def _prepare(self, text: str, cursor_pos: Optional[int],
+                 context: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+        if cursor_pos is None:
+            cursor_pos = len(text)
+        if context is None:
+            context = {"cwd": os.getcwd()}
+        context.setdefault("limit", self.max_results)
+        return cursor_pos, context
+    
+    def _merge(self, results: Iterable[List[Completion]]) -> List[Completion]:
+        """Merge provider results by text, keeping the best score for each."""
+        best: Dict[str, Completion] = {}
+        for completions in results:
+            for c in completions:
+                current = best.get(c.text)
+                if current is None or c.score > current.score:
+                    best[c.text] = c
         
-        return unique
+        # Keep only the top N; ties go to shorter candidates
+        return heapq.nsmallest(self.max_results, best.values(), key=lambda c: (-c.score, len(c.text), c.text))
     
     def complete(self, text: str, cursor_pos: int = None, context: Dict[str, Any] = None) -> Tuple[str, List[Completion]]:
-        """Complete the current text. Returns (completed_text, all_completions)."""
+        """Complete the current text. Returns (completed_text, all_completions).
+        
+        Repeated calls while a line is edited share one CompletionSession;
+        call ``reset`` once the line is submitted.
+        """
         if cursor_pos is None:
             cursor_pos = len(text)
         
-        completions = self.get_completions(text, cursor_pos, context)
+        completions = self.session.get_completions(text, cursor_pos, context)
         
         if not completions:
             return text, []
@@ -442,6 +1108,7 @@ class ValyxoAutoComplete:
         self.current_completions = []
         self.completion_index = -1
         self.original_text = ""
+        self.session.reset()
     
     def _get_word_at_cursor(self, text: str, cursor_pos: int) -> str:
         """Get the word being typed at cursor."""
@@ -457,6 +1124,7 @@ class ValyxoAutoComplete:
         """Apply a completion to the text."""
         before = text[:cursor_pos]
         after = text[cursor_pos:]
+        insert_text = completion.expand() if completion.expand else completion.insert_text
         
         # Find the word we're replacing
         words = before.split()
@@ -465,10 +1133,10 @@ class ValyxoAutoComplete:
             prefix = ' '.join(words[:-1])
             if prefix:
                 prefix += ' '
-            return prefix + completion.insert_text + after
+            return prefix + insert_text + after
         else:
             # Append new word
-            return before + completion.insert_text + after
+            return before + insert_text + after
     
     def _common_prefix(self, strings: List[str]) -> str:
         """Find common prefix of a list of strings."""
@@ -510,8 +1178,6 @@ class ValyxoAutoComplete:
 
 
 # Helper function to create autocomplete instance
-def create_autocomplete() -> ValyxoAutoComplete:
+def create_autocomplete(file_index=None, dir_cache=None, deadline: Optional[float] = COMPLETION_DEADLINE) -> ValyxoAutoComplete:
     """Create a configured ValyxoAutoComplete instance."""
-    ac = ValyxoAutoComplete()
-    ac.add_provider(SnippetCompletionProvider())
-    return ac
+    return ValyxoAutoComplete(file_index, dir_cache, deadline)
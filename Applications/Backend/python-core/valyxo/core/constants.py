@@ -28,10 +28,16 @@ COMMANDS: List[str] = [
     "cd",
     "cat",
     "grep",
+    "find",
+    "open",
     "nano",
     "run",
     "jobs",
     "kill",
+    "history",
+    "env",
+    "export",
+    "unset",
     "man",
     "theme",
     "python",
@@ -63,5 +69,6 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     "start_cwd": MAIN_PROJECT,
     "remember_language": False,
     "theme": "neon",
+    "git_prompt": True,
     "debug": False
 }
@@ -0,0 +1,188 @@
+"""Valyxo Directory Cache v0.6.0
+
+Small LRU cache of ``os.scandir`` listings shared by ``ls``, ``cd`` and
+auto-complete.
+
+Listings keep the original ``os.DirEntry`` objects, so type information
+from the directory read (and any stat result already fetched) is reused
+instead of issuing one ``isdir``/``stat`` call per entry. A cached listing
+is revalidated by the directory's mtime before it is served; callers that
+can tolerate a short delay (completion) may pass a ``ttl`` to skip even
+that stat for a listing validated moments ago.
+"""
+
+import os
+import time
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+# Number of directory listings kept
+DEFAULT_CAPACITY = 64
+
+# Total entries kept across all listings (bounds memory for huge directories)
+DEFAULT_MAX_ENTRIES = 250_000
+
+
+class DirListing:
+    """A cached directory listing."""
+
+    def __init__(self, path: str, mtime_ns: int, entries: List[os.DirEntry]):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.entries = entries  # sorted by name
+        self.created = time.monotonic()
+        self.validated = self.created
+        self._names: Optional[List[str]] = None
+        self._pairs: Optional[List[Tuple[str, bool]]] = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def names(self) -> List[str]:
+        """Entry names in sorted order."""
+        if self._names is None:
+            self._names = [entry.name for entry in self.entries]
+        return self._names
+
+    def pairs(self) -> List[Tuple[str, bool]]:
+        """(name, is_dir) pairs in sorted order, typed from the directory read."""
+        if self._pairs is None:
+            self._pairs = [(entry.name, entry_is_dir(entry)) for entry in self.entries]
+        return self._pairs
+
+    def find(self, name: str) -> Optional[os.DirEntry]:
+        """Look up an entry by name (binary search)."""
+        names = self.names()
+        i = bisect.bisect_left(names, name)
+        if i < len(names) and names[i] == name:
+            return self.entries[i]
+        return None
+
+
+def entry_is_dir(entry: os.DirEntry) -> bool:
+    """DirEntry.is_dir() that treats unreadable entries as files."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def entry_stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    """Cached DirEntry stat, falling back to lstat for broken symlinks."""
+    try:
+        return entry.stat()
+    except OSError:
+        try:
+            return entry.stat(follow_symlinks=False)
+        except OSError:
+            return None
+
+
+class ValyxoDirCache:
+    """LRU cache of directory listings keyed by absolute path."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.capacity = capacity
+        self.max_entries = max_entries
+        self._listings: "OrderedDict[str, DirListing]" = OrderedDict()
+        self._total_entries = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, max_stat_age: float = None, ttl: float = 0.0) -> DirListing:
+        """Get the listing of a directory.
+
+        Args:
+            path: Directory path
+            max_stat_age: If given, listings older than this many seconds are
+                re-read so per-entry stat data (size, mtime) is fresh
+            ttl: Serve a listing whose mtime was checked less than this many
+                seconds ago without checking it again
+
+        Returns:
+            DirListing with entries sorted by name
+
+        Raises:
+            OSError: If the directory cannot be read (as os.scandir would)
+        """
+        path = os.path.abspath(path)
+        now = time.monotonic()
+
+        if ttl > 0:
+            with self._lock:
+                listing = self._listings.get(path)
+                if listing is not None and now - listing.validated < ttl and (
+                        max_stat_age is None or now - listing.created <= max_stat_age):
+                    self._listings.move_to_end(path)
+                    self.hits += 1
+                    return listing
+
+        mtime_ns = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            listing = self._listings.get(path)
+            if listing is not None and listing.mtime_ns == mtime_ns and (
+                    max_stat_age is None or now - listing.created <= max_stat_age):
+                self._listings.move_to_end(path)
+                listing.validated = now
+                self.hits += 1
+                return listing
+
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        listing = DirListing(path, mtime_ns, entries)
+
+        with self._lock:
+            self.misses += 1
+            old = self._listings.pop(path, None)
+            if old is not None:
+                self._total_entries -= len(old)
+            if len(listing) <= self.max_entries:
+                self._listings[path] = listing
+                self._total_entries += len(listing)
+                self._evict()
+        return listing
+
+    def peek(self, path: str, ttl: float) -> Optional[DirListing]:
+        """A cached listing validated less than ``ttl`` seconds ago, or None.
+
+        Never touches the disk: no stat, no scan.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            listing = self._listings.get(path)
+            if listing is None or time.monotonic() - listing.validated >= ttl:
+                return None
+            self._listings.move_to_end(path)
+            self.hits += 1
+            return listing
+
+    def _evict(self) -> None:
+        while self._listings and (len(self._listings) > self.capacity or self._total_entries > self.max_entries):
+            _, listing = self._listings.popitem(last=False)
+            self._total_entries -= len(listing)
+
+    def invalidate(self, path: str = None) -> None:
+        """Drop one cached listing, or all of them."""
+        with self._lock:
+            if path is None:
+                self._listings.clear()
+                self._total_entries = 0
+                return
+            listing = self._listings.pop(os.path.abspath(path), None)
+            if listing is not None:
+                self._total_entries -= len(listing)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "listings": len(self._listings),
+                "entries": self._total_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
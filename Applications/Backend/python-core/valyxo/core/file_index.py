@@ -0,0 +1,349 @@
+"""Valyxo File Index v0.6.0
+
+Cached index of every path under the workspace root.
+
+The index is built with ``os.scandir`` on a thread pool, one directory
+level at a time, and refreshed incrementally: a directory is only re-listed
+when its mtime changes. It backs the ``find``/``open`` fuzzy finder and
+feeds directory listings to file completion.
+
+With a native file watcher attached (``attach_watcher``), refreshes only
+re-list the directories the watcher reported as changed instead of
+stat-ing every known directory.
+
+Commands:
+    find <query>        Fuzzy-find files in the workspace
+    open <query>        Open the best match in the editor
+"""
+
+import os
+import time
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+from .constants import ROOT_DIR
+from .fuzzy import fuzzy_top_k
+from .dircache import ValyxoDirCache, entry_is_dir
+from .watcher import ValyxoFileWatcher, WatchEvent, MODIFIED, OVERFLOW
+
+
+# Directories that are listed but never descended into
+IGNORED_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv"}
+
+# Seconds a cached directory listing is trusted before its mtime is rechecked
+REVALIDATE_INTERVAL = 1.0
+
+
+@dataclass
+class _DirRecord:
+    """Cached listing of one directory."""
+    mtime_ns: int
+    entries: List[Tuple[str, bool]]  # (name, is_dir), sorted by name
+    links: Set[str] = field(default_factory=set)  # symlinked directories (not descended)
+    checked: float = 0.0
+
+
+def _scan_dir(path: str) -> Optional[_DirRecord]:
+    """List a directory with scandir, reusing DirEntry type information."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        entries = []
+        links = set()
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    if is_dir and entry.is_symlink():
+                        links.add(entry.name)
+                except OSError:
+                    is_dir = False
+                entries.append((entry.name, is_dir))
+        entries.sort()
+        return _DirRecord(mtime_ns, entries, links, time.monotonic())
+    except OSError:
+        return None
+
+
+def _record_from_cache(dir_cache: ValyxoDirCache, path: str) -> Optional[_DirRecord]:
+    """Build a record from a shared directory-cache listing."""
+    try:
+        listing = dir_cache.get(path)
+    except OSError:
+        return None
+    entries = []
+    links = set()
+    for entry in listing.entries:
+        is_dir = entry_is_dir(entry)
+        if is_dir and entry.is_symlink():
+            links.add(entry.name)
+        entries.append((entry.name, is_dir))
+    return _DirRecord(listing.mtime_ns, entries, links, time.monotonic())
+
+
+class ValyxoFileIndex:
+    """Incrementally maintained index of all paths under a root."""
+
+    def __init__(self, root: str = None, max_workers: int = None, dir_cache: ValyxoDirCache = None):
+        self.root = os.path.abspath(root or ROOT_DIR)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.dir_cache = dir_cache
+        self._dirs: Dict[str, _DirRecord] = {}
+        self._lock = threading.RLock()
+        self._built = False
+        self._paths: Optional[List[Tuple[str, bool]]] = None
+        self._pending: Set[str] = set()  # new subdirectories seen by list_dir
+        self._watcher: Optional[ValyxoFileWatcher] = None
+        self._watch_token: Optional[int] = None
+        self._dirty: Optional[Set[str]] = None  # None: changes unknown, stat everything
+        self._dirty_lock = threading.Lock()
+
+    # ─── file watcher ────────────────────────────────────────────────
+
+    def attach_watcher(self, watcher: ValyxoFileWatcher) -> None:
+        """Use a file watcher instead of mtime sweeps to find changes.
+
+        Only native (OS-pushed) watchers are used; polling one would cost
+        as much as the mtime sweep it replaces. The subscription is made
+        on the first build so startup does not walk the tree.
+        """
+        if watcher.native:
+            self._watcher = watcher
+
+    def _subscribe(self) -> None:
+        if self._watcher is None:
+            return
+        if self._watch_token is not None:
+            self._watcher.unsubscribe(self._watch_token)
+        with self._dirty_lock:
+            self._dirty = set()
+        self._watch_token = self._watcher.subscribe(self.root, self._on_events,
+                                                    recursive=True, ignore=IGNORED_DIRS)
+
+    def _on_events(self, events: List[WatchEvent]) -> None:
+        with self._dirty_lock:
+            if self._dirty is None:
+                return
+            for event in events:
+                if event.kind == OVERFLOW:
+                    self._dirty = None
+                    return
+                if event.kind == MODIFIED:
+                    continue  # listings only change on create/delete
+                self._dirty.add(os.path.dirname(event.path))
+                if event.is_dir:
+                    self._dirty.add(event.path)
+
+    def _take_dirty(self) -> Optional[Set[str]]:
+        """Changed directories reported by the watcher (None if unknown)."""
+        if self._watch_token is None:
+            return None
+        self._watcher.sync(self._watch_token)
+        with self._dirty_lock:
+            dirty = self._dirty
+            self._dirty = set()
+        return dirty
+
+    # ─── building and refreshing ─────────────────────────────────────
+
+    def build(self) -> int:
+        """Scan the whole tree from scratch.
+
+        Returns:
+            Number of indexed paths
+        """
+        with self._lock:
+            if self._watcher is not None:
+                self._subscribe()
+            self._dirs = {}
+            self._pending = set()
+            self._scan_tree([self.root])
+            self._built = True
+            self._paths = None
+            return len(self.paths())
+
+    def refresh(self) -> int:
+        """Re-list only directories whose mtime changed.
+
+        Returns:
+            Number of directories that changed
+        """
+        with self._lock:
+            if not self._built:
+                self.build()
+                return len(self._dirs)
+
+            dirty = self._take_dirty()
+            if dirty is not None:
+                changed = [path for path in dirty if path in self._dirs]
+            else:
+                known = list(self._dirs.keys())
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    mtimes = list(executor.map(self._stat_mtime, known))
+                changed = [path for path, mtime in zip(known, mtimes)
+                           if mtime is None or mtime != self._dirs[path].mtime_ns]
+            pending = [path for path in self._pending if path not in self._dirs]
+            self._pending = set()
+            if not changed and not pending:
+                return 0
+
+            for path in changed:
+                self._dirs.pop(path, None)
+            self._scan_tree([path for path in changed + pending if os.path.isdir(path)])
+            self._prune()
+            self._paths = None
+            return len(changed) + len(pending)
+
+    def ensure_fresh(self) -> None:
+        """Build on first use, otherwise refresh incrementally."""
+        if self._built:
+            self.refresh()
+        else:
+            self.build()
+
+    def _scan_tree(self, roots: List[str]) -> None:
+        level = roots
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level:
+                records = list(executor.map(_scan_dir, level))
+                next_level = []
+                for path, record in zip(level, records):
+                    if record is None:
+                        continue
+                    self._dirs[path] = record
+                    for name, is_dir in record.entries:
+                        if is_dir and name not in IGNORED_DIRS and name not in record.links:
+                            child = os.path.join(path, name)
+                            if child not in self._dirs:
+                                next_level.append(child)
+                level = next_level
+
+    def _prune(self) -> None:
+        """Drop records of directories no longer reachable from the root."""
+        reachable = set()
+        stack = [self.root]
+        while stack:
+            path = stack.pop()
+            record = self._dirs.get(path)
+            if record is None:
+                continue
+            reachable.add(path)
+            for name, is_dir in record.entries:
+                if is_dir and name not in IGNORED_DIRS and name not in record.links:
+                    stack.append(os.path.join(path, name))
+        for path in [p for p in self._dirs if p not in reachable]:
+            del self._dirs[path]
+
+    def _is_watched(self, path: str) -> bool:
+        """Check whether the watcher covers a directory (not ignored, not a link)."""
+        if self._watch_token is None or path == self.root:
+            return self._watch_token is not None
+        parts = os.path.relpath(path, self.root).split(os.sep)
+        if any(part in IGNORED_DIRS for part in parts):
+            return False
+        parent = self._dirs.get(os.path.dirname(path))
+        return parent is not None and parts[-1] not in parent.links
+
+    @staticmethod
+    def _stat_mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    # ─── queries ─────────────────────────────────────────────────────
+
+    def covers(self, path: str) -> bool:
+        """Check whether a path lies inside the indexed root."""
+        abs_path = os.path.abspath(path)
+        return abs_path == self.root or abs_path.startswith(self.root + os.sep)
+
+    def list_dir(self, path: str) -> Optional[List[Tuple[str, bool]]]:
+        """Get a directory listing from the index.
+
+        The cached listing is revalidated against the directory mtime at
+        most once per REVALIDATE_INTERVAL, so repeated calls (one per
+        keystroke) do not touch the disk. With a watcher attached, a listing
+        is trusted until the watcher reports a change to it. Re-reads go
+        through the shared directory cache when one is attached, so ``ls``
+        and completion list each directory once.
+
+        Returns:
+            Sorted (name, is_dir) pairs, or None if the path is outside the
+            root or is not a directory
+        """
+        path = os.path.abspath(path)
+        if not self.covers(path):
+            return None
+        with self._lock:
+            record = self._dirs.get(path)
+            now = time.monotonic()
+            watched = self._is_watched(path)
+            if watched:
+                self._watcher.sync(self._watch_token)
+                with self._dirty_lock:
+                    if self._dirty is None:
+                        watched = False
+                    elif path in self._dirty:
+                        self._dirty.discard(path)
+                    elif record is not None:
+                        return record.entries
+                if record is not None:
+                    record.checked = 0.0
+            if record is not None and now - record.checked < REVALIDATE_INTERVAL:
+                return record.entries
+            if record is not None and not watched and self._stat_mtime(path) == record.mtime_ns:
+                record.checked = now
+                return record.entries
+
+            if self.dir_cache is not None:
+                record = _record_from_cache(self.dir_cache, path)
+            else:
+                record = _scan_dir(path)
+            if record is None:
+                self._dirs.pop(path, None)
+                return None
+            self._dirs[path] = record
+            self._paths = None
+            if self._built:
+                for name, is_dir in record.entries:
+                    child = os.path.join(path, name)
+                    if is_dir and name not in IGNORED_DIRS and name not in record.links and child not in self._dirs:
+                        self._pending.add(child)
+            return record.entries
+
+    def paths(self) -> List[Tuple[str, bool]]:
+        """All indexed paths as (relative path, is_dir), in sorted order."""
+        with self._lock:
+            if self._paths is None:
+                paths = []
+                for directory in sorted(self._dirs):
+                    rel_dir = os.path.relpath(directory, self.root).replace("\\", "/")
+                    prefix = "" if rel_dir == "." else rel_dir + "/"
+                    for name, is_dir in self._dirs[directory].entries:
+                        paths.append((prefix + name, is_dir))
+                self._paths = paths
+            return self._paths
+
+    def find(self, query: str, limit: int = 20, include_dirs: bool = False) -> List[Tuple[int, str, bool]]:
+        """Fuzzy-find paths.
+
+        Args:
+            query: Fuzzy pattern matched against the relative path
+            limit: Maximum number of results
+            include_dirs: Also return directories
+
+        Returns:
+            List of (score, absolute path, is_dir), best first
+        """
+        self.ensure_fresh()
+        candidates = self.paths() if include_dirs else [p for p in self.paths() if not p[1]]
+        results = fuzzy_top_k(query, candidates, limit, key=lambda p: p[0])
+        return [(score, os.path.join(self.root, rel), is_dir) for score, (rel, is_dir) in results]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get index statistics."""
+        with self._lock:
+            paths = self.paths()
+            dirs = sum(1 for _, is_dir in paths if is_dir)
+            return {"directories": len(self._dirs), "files": len(paths) - dirs, "entries": len(paths)}
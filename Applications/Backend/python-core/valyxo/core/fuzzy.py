@@ -0,0 +1,198 @@
+"""Valyxo Fuzzy Matcher v0.6.0
+
+fzf-style fuzzy matching shared by the file finder and auto-complete.
+
+A pattern matches when its characters appear in order in the candidate.
+Scores reward matches on word boundaries (after '/', '_', '-', '.', spaces
+or at camelCase humps) and consecutive runs, and penalize gaps. Matching
+is smart-case: case-insensitive unless the pattern contains uppercase.
+"""
+
+import heapq
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+
+BONUS_BOUNDARY = SCORE_MATCH // 2
+BONUS_NON_WORD = SCORE_MATCH // 2
+BONUS_BOUNDARY_WHITE = BONUS_BOUNDARY + 2
+BONUS_BOUNDARY_DELIMITER = BONUS_BOUNDARY + 1
+BONUS_CAMEL123 = BONUS_BOUNDARY + SCORE_GAP_EXTENSION
+BONUS_CONSECUTIVE = -(SCORE_GAP_START + SCORE_GAP_EXTENSION)
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+
+# Character classes
+_WHITE, _NON_WORD, _DELIMITER, _LOWER, _UPPER, _NUMBER = range(6)
+
+_DELIMITERS = set("/\\,:;|")
+
+
+def _char_class(ch: str) -> int:
+    if ch.islower():
+        return _LOWER
+    if ch.isupper():
+        return _UPPER
+    if ch.isdigit():
+        return _NUMBER
+    if ch.isspace():
+        return _WHITE
+    if ch in _DELIMITERS:
+        return _DELIMITER
+    if ch.isalpha():
+        return _LOWER
+    return _NON_WORD
+
+
+def _bonus_for(prev_class: int, cur_class: int) -> int:
+    if cur_class > _DELIMITER:
+        if prev_class == _WHITE:
+            return BONUS_BOUNDARY_WHITE
+        if prev_class == _DELIMITER:
+            return BONUS_BOUNDARY_DELIMITER
+        if prev_class == _NON_WORD:
+            return BONUS_BOUNDARY
+    if (prev_class == _LOWER and cur_class == _UPPER) or (prev_class != _NUMBER and cur_class == _NUMBER):
+        return BONUS_CAMEL123
+    if cur_class in (_NON_WORD, _DELIMITER):
+        return BONUS_NON_WORD
+    if cur_class == _WHITE:
+        return BONUS_BOUNDARY_WHITE
+    return 0
+
+
+def fuzzy_match(pattern: str, text: str) -> Optional[Tuple[int, List[int]]]:
+    """Fuzzy-match a pattern against text.
+
+    Args:
+        pattern: Characters to find, in order
+        text: Candidate string
+
+    Returns:
+        Tuple of (score, matched positions), or None if there is no match
+    """
+    if not pattern:
+        return 0, []
+    case_sensitive = any(c.isupper() for c in pattern)
+    return _match(pattern if case_sensitive else pattern.lower(), case_sensitive, text)
+
+
+def _match(p: str, case_sensitive: bool, text: str) -> Optional[Tuple[int, List[int]]]:
+    """fuzzy_match with the pattern already case-normalized."""
+    t = text if case_sensitive else text.lower()
+    plen = len(p)
+
+    # Forward pass: find the end of the first complete occurrence
+    # (str.find keeps the per-character work in C)
+    ti = -1
+    for ch in p:
+        ti = t.find(ch, ti + 1)
+        if ti < 0:
+            return None
+    end = ti + 1
+
+    # Backward pass: shrink the window from the left
+    ti = end
+    for ch in reversed(p):
+        ti = t.rfind(ch, 0, ti)
+    start = ti
+
+    # Score the window
+    score = 0
+    positions: List[int] = []
+    pi = 0
+    consecutive = 0
+    first_bonus = 0
+    in_gap = False
+    prev_class = _char_class(text[start - 1]) if start > 0 else _WHITE
+    for ti in range(start, end):
+        cur_class = _char_class(text[ti])
+        if t[ti] == p[pi]:
+            bonus = _bonus_for(prev_class, cur_class)
+            if consecutive == 0:
+                first_bonus = bonus
+            else:
+                if bonus >= BONUS_BOUNDARY and bonus > first_bonus:
+                    first_bonus = bonus
+                bonus = max(bonus, first_bonus, BONUS_CONSECUTIVE)
+            if pi == 0:
+                score += SCORE_MATCH + bonus * BONUS_FIRST_CHAR_MULTIPLIER
+            else:
+                score += SCORE_MATCH + bonus
+            positions.append(ti)
+            consecutive += 1
+            in_gap = False
+            pi += 1
+        else:
+            score += SCORE_GAP_EXTENSION if in_gap else SCORE_GAP_START
+            in_gap = True
+            consecutive = 0
+            first_bonus = 0
+        prev_class = cur_class
+    return score, positions
+
+
+def fuzzy_score(pattern: str, text: str) -> Optional[int]:
+    """Fuzzy-match score only; None if the pattern does not match."""
+    result = fuzzy_match(pattern, text)
+    return result[0] if result else None
+
+
+def fuzzy_filter(pattern: str, items: Iterable[Any], key: Callable[[Any], str] = None) -> List[Any]:
+    """Keep the items a pattern matches, in input order, without scoring them.
+
+    Extending the pattern can only remove matches, so the result for a
+    longer pattern may be computed from the result for a shorter one.
+    """
+    if not pattern:
+        return list(items)
+    case_sensitive = any(c.isupper() for c in pattern)
+    p = pattern if case_sensitive else pattern.lower()
+    kept = []
+    for item in items:
+        text = key(item) if key else item
+        t = text if case_sensitive else text.lower()
+        ti = -1
+        for ch in p:
+            ti = t.find(ch, ti + 1)
+            if ti < 0:
+                break
+        else:
+            kept.append(item)
+    return kept
+
+
+def fuzzy_top_k(pattern: str, items: Iterable[Any], k: int,
+                key: Callable[[Any], str] = None) -> List[Tuple[int, Any]]:
+    """Select the k best fuzzy matches with a bounded heap.
+
+    Ties are broken by shorter text, then by input order.
+
+    Args:
+        pattern: Fuzzy pattern
+        items: Candidates
+        k: Number of results
+        key: Maps an item to the text to match (defaults to the item itself)
+
+    Returns:
+        List of (score, item), best first
+    """
+    if k <= 0:
+        return []
+    case_sensitive = any(c.isupper() for c in pattern)
+    p = pattern if case_sensitive else pattern.lower()
+    heap: List[Tuple[int, int, int, Any]] = []
+    for index, item in enumerate(items):
+        text = key(item) if key else item
+        result = _match(p, case_sensitive, text) if p else (0, [])
+        if result is None:
+            continue
+        score = result[0]
+        entry = (score, -len(text), -index, item)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    return [(score, item) for score, _, _, item in sorted(heap, reverse=True)]
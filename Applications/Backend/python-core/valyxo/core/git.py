@@ -12,11 +12,277 @@ Commands:
     git checkout    Switch branches
     git log         Show commit history
     git diff        Show changes
+    git show        Show a file at a revision, or a commit
+
+Reads (log, show, branch listing, revision lookups) come straight from
+the repository files (see git_objects). Layouts that reader does not
+handle fall back to long-lived ``git cat-file`` workers shared by every
+ValyxoGit (see git_worker). Everything else runs one git subprocess per
+command.
+
+Status snapshots:
+    ``status_snapshot`` runs one ``git status --porcelain=v2 --branch``
+    and keeps the parsed result per repository, keyed on the mtimes of
+    ``.git/index``, ``.git/HEAD`` and the current branch ref. Staging,
+    committing and switching branches change the key; edits to tracked or
+    untracked files do not. Once a snapshot is older than STATUS_TTL the
+    working tree is compared with the index stat data (see git_index), and
+    git only runs again if a tracked file or directory changed.
+
+    ``status_all`` finds every repository under a directory (PROJECTS_DIR
+    by default) and takes their snapshots on a bounded thread pool,
+    yielding each one as soon as its git call finishes.
 """
 
 import os
+import re
+import atexit
+import struct
+import shutil
+import tempfile
 import subprocess
-from typing import List, Optional, Tuple, Dict, Any
+from datetime import datetime, timedelta, timezone
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Callable, List, Optional, Tuple, Dict, Any, Iterator, TypeVar
+from .git_worker import ValyxoGitWorkerPool, GitCommit, GitRepoWorker, find_repo_root
+from .git_objects import GitObjectStore, GitReadUnsupported
+from .git_blame import ValyxoBlameCache, format_blame_line
+from .git_index import ValyxoChangeDetector
+from .constants import PROJECTS_DIR
+from .jobs import ValyxoJobsManager
+
+T = TypeVar("T")
+
+
+# Abbreviated object id length used by log and repo info
+ABBREV = 7
+
+# cat-file workers shared by all ValyxoGit instances
+_WORKERS = ValyxoGitWorkerPool()
+atexit.register(_WORKERS.close)
+
+# Seconds a status snapshot is trusted without checking the working tree
+STATUS_TTL = 1.0
+
+# Concurrent git calls for status_all (they wait on git, not the GIL)
+STATUS_WORKERS = 8
+
+# Directory levels searched for repositories by status_all
+DISCOVER_DEPTH = 3
+
+
+@dataclass
+class GitStatusSnapshot:
+    """Parsed ``git status --porcelain=v2 --branch`` output."""
+    branch: Optional[str] = None  # None when HEAD is detached
+    commit: Optional[str] = None  # None before the first commit
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    staged: int = 0
+    unstaged: int = 0
+    untracked: int = 0
+    conflicted: int = 0
+    modified: int = 0  # tracked entries with staged and/or unstaged changes
+
+    @property
+    def changes(self) -> int:
+        """Entries ``git status -s`` would list."""
+        return self.modified + self.untracked + self.conflicted
+
+    def prompt_segment(self) -> str:
+        """Short summary for a shell prompt, e.g. "main*↑1"."""
+        text = self.branch or (self.commit[:ABBREV] if self.commit else "HEAD")
+        if self.changes:
+            text += "*"
+        if self.ahead:
+            text += f"↑{self.ahead}"
+        if self.behind:
+            text += f"↓{self.behind}"
+        return text
+
+
+def parse_porcelain_v2(output: str) -> GitStatusSnapshot:
+    """Parse ``git status --porcelain=v2 --branch`` output."""
+    snapshot = GitStatusSnapshot()
+    for line in output.splitlines():
+        if line.startswith("# "):
+            key, _, value = line[2:].partition(" ")
+            if key == "branch.oid":
+                snapshot.commit = None if value == "(initial)" else value
+            elif key == "branch.head":
+                snapshot.branch = None if value == "(detached)" else value
+            elif key == "branch.upstream":
+                snapshot.upstream = value
+            elif key == "branch.ab":
+                ahead, _, behind = value.partition(" ")
+                snapshot.ahead, snapshot.behind = int(ahead), abs(int(behind))
+        elif line.startswith(("1 ", "2 ")):
+            xy = line[2:4]
+            snapshot.modified += 1
+            if xy[0] != ".":
+                snapshot.staged += 1
+            if xy[1] != ".":
+                snapshot.unstaged += 1
+        elif line.startswith("u "):
+            snapshot.conflicted += 1
+        elif line.startswith("? "):
+            snapshot.untracked += 1
+    return snapshot
+
+
+def find_git_dir(root: str) -> Optional[str]:
+    """The git directory of a work tree (follows ``gitdir:`` files)."""
+    dot_git = os.path.join(root, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        with open(dot_git, "r", encoding="utf-8") as f:
+            line = f.readline().strip()
+    except OSError:
+        return None
+    if line.startswith("gitdir:"):
+        return os.path.normpath(os.path.join(root, line[len("gitdir:"):].strip()))
+    return None
+
+
+def discover_repos(root: str, max_depth: int = DISCOVER_DEPTH) -> List[str]:
+    """Work trees at or below ``root`` (repositories are not searched inside).
+
+    Args:
+        root: Directory to search
+        max_depth: Directory levels below root to descend
+
+    Returns:
+        Sorted list of repository roots
+    """
+    repos = []
+    pending = [(os.path.abspath(root), 0)]
+    while pending:
+        path, depth = pending.pop()
+        if os.path.exists(os.path.join(path, ".git")):
+            repos.append(path)
+            continue
+        if depth >= max_depth:
+            continue
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not entry.name.startswith(".") and entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, depth + 1))
+        except OSError:
+            continue
+    return sorted(repos)
+
+
+def format_status_table(results: List[Tuple[str, Optional[GitStatusSnapshot]]], root: str = None) -> str:
+    """Summary table for status_all results, in path order."""
+    rows = []
+    for path, snapshot in sorted(results, key=lambda item: item[0]):
+        name = os.path.relpath(path, root) if root else path
+        if snapshot is None:
+            rows.append((name, "✗ error", "", "", "", ""))
+            continue
+        sync = f"↑{snapshot.ahead} ↓{snapshot.behind}" if snapshot.upstream else "-"
+        rows.append((name, snapshot.branch or "(detached)", sync,
+                     str(snapshot.staged), str(snapshot.unstaged), str(snapshot.untracked)))
+    header = ("Repository", "Branch", "Sync", "Staged", "Unstaged", "Untracked")
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(header, widths)).rstrip()]
+    lines.append("  ".join("─" * width for width in widths))
+    lines.extend("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
+    dirty = sum(1 for _, snapshot in results if snapshot is not None and snapshot.changes)
+    failed = sum(1 for _, snapshot in results if snapshot is None)
+    lines.append(f"{len(results)} repositories, {dirty} with changes" + (f", {failed} failed" if failed else ""))
+    return "\n".join(lines)
+
+
+_PROGRESS = re.compile(r"^(?:remote: )?([A-Za-z][A-Za-z ]+?):\s+(\d+)% \((\d+)/(\d+)\)(?:, (?!done)([^|,]+?))?(?:\s*\|\s*(.+?))?(?:, done\.)?\s*$")
+
+
+def parse_git_progress(line: str) -> Optional[str]:
+    """Summarize a ``--progress`` line, e.g. "Receiving objects 45% (450/1000) 1.2 MiB".
+
+    Returns:
+        Progress text, or None for lines that are not progress
+    """
+    match = _PROGRESS.match(line.strip())
+    if not match:
+        return None
+    phase, percent, done, total, size, rate = match.groups()
+    text = f"{phase} {percent}% ({done}/{total})"
+    if size:
+        text += f" {size.strip()}"
+    if rate:
+        text += f" {rate.strip()}"
+    return text
+
+
+def _progress_lines(stream) -> Iterator[str]:
+    """Lines of a binary stream split on both \\n and \\r (git redraws progress with \\r)."""
+    buffer = b""
+    while True:
+        chunk = stream.read1(4096) if hasattr(stream, "read1") else stream.read(4096)
+        if not chunk:
+            break
+        buffer += chunk
+        parts = re.split(rb"[\r\n]", buffer)
+        buffer = parts.pop()
+        for part in parts:
+            yield part.decode("utf-8", errors="replace").strip()
+    if buffer:
+        yield buffer.decode("utf-8", errors="replace").strip()
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_remote_url(git_dir: str, name: str = "origin") -> Optional[str]:
+    """A remote's url from the repository config, without running git."""
+    section = f'[remote "{name}"]'
+    current = None
+    try:
+        with open(os.path.join(git_dir, "config"), "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    current = line
+                elif current == section and line.replace(" ", "").startswith("url="):
+                    return line.split("=", 1)[1].strip()
+    except OSError:
+        pass
+    return None
+
+
+def _format_date(timestamp: int, tz: str) -> str:
+    """Format a commit time like git's default date format."""
+    try:
+        sign = -1 if tz[0] == "-" else 1
+        offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5])) * sign
+    except (ValueError, IndexError):
+        offset, tz = timedelta(0), "+0000"
+    when = datetime.fromtimestamp(timestamp, timezone(offset))
+    return f"{when:%a %b} {when.day} {when:%H:%M:%S %Y} {tz}"
+
+
+def _format_commit(commit: GitCommit, oneline: bool) -> str:
+    """Render a commit as ``git log`` (or ``--oneline``) would."""
+    if oneline:
+        return f"{commit.sha[:ABBREV]} {commit.subject}"
+    lines = [f"commit {commit.sha}"]
+    if len(commit.parents) > 1:
+        lines.append("Merge: " + " ".join(p[:ABBREV] for p in commit.parents))
+    lines.append(f"Author: {commit.author}")
+    lines.append(f"Date:   {_format_date(commit.author_time, commit.author_tz)}")
+    lines.append("")
+    lines.extend(f"    {line}" for line in commit.message.split("\n"))
+    return "\n".join(lines)
 
 
 class ValyxoGitError(Exception):
@@ -27,24 +293,73 @@ class ValyxoGitError(Exception):
 class ValyxoGit:
     """Git integration for Valyxo."""
     
-    def __init__(self, cwd: str = None):
+    def __init__(self, cwd: str = None, workers: ValyxoGitWorkerPool = None):
         self.cwd = cwd or os.getcwd()
+        self.workers = workers if workers is not None else _WORKERS
         self._git_available = self._check_git()
+        # repo root -> (key, checked at, snapshot)
+        self._status_cache: Dict[str, Tuple[tuple, float, GitStatusSnapshot]] = {}
+        self.status_runs = 0
+        # git dir -> object store (None if the layout needs git)
+        self._stores: Dict[str, Optional[GitObjectStore]] = {}
+        self.blame_cache = ValyxoBlameCache(self)
+        # repo root -> working-tree change detector (None if its index is unreadable)
+        self._detectors: Dict[str, Optional[ValyxoChangeDetector]] = {}
     
     def _check_git(self) -> bool:
-        """Check if git is available on the system."""
-        try:
-            result = subprocess.run(
-                ["git", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+        """Check if git is available on the system (a PATH lookup, no subprocess)."""
+        return shutil.which("git") is not None
+
+    def _worker(self) -> Optional[GitRepoWorker]:
+        """cat-file worker for the repository containing cwd."""
+        if not self._git_available:
+            return None
+        return self.workers.get(self.cwd)
+
+    def _store(self) -> Optional[GitObjectStore]:
+        """Direct reader for the repository containing cwd."""
+        root = find_repo_root(self.cwd)
+        git_dir = find_git_dir(root) if root else None
+        if git_dir is None:
+            return None
+        if git_dir not in self._stores:
+            try:
+                self._stores[git_dir] = GitObjectStore(git_dir)
+            except (GitReadUnsupported, OSError):
+                self._stores[git_dir] = None
+        return self._stores[git_dir]
+
+    def _readers(self) -> Iterator[Any]:
+        """Object readers to try in order: the direct reader, then cat-file."""
+        store = self._store()
+        if store is not None:
+            yield store
+        worker = self._worker()
+        if worker is not None:
+            yield worker
+
+    def _read(self, query: Callable[[Any], T]) -> Tuple[bool, Optional[T]]:
+        """Run a query against the first reader that supports it.
+
+        Returns:
+            Tuple of (answered, result); not answered means fall back to git
+        """
+        for reader in self._readers():
+            try:
+                return True, query(reader)
+            except (GitReadUnsupported, OSError, ValueError):
+                continue
+        return False, None
+
+    def close(self) -> None:
+        """Stop the cat-file workers and unmap packfiles (both reopen on demand)."""
+        self.workers.close()
+        for store in self._stores.values():
+            if store is not None:
+                store.close()
+        self._stores.clear()
     
-    def _run_git(self, args: List[str], check: bool = True) -> Tuple[bool, str]:
+    def _run_git(self, args: List[str], check: bool = True, cwd: str = None) -> Tuple[bool, str]:
         """Run a git command.
         
         Returns:
@@ -56,7 +371,7 @@ class ValyxoGit:
         try:
             result = subprocess.run(
                 ["git"] + args,
-                cwd=self.cwd,
+                cwd=cwd or self.cwd,
                 capture_output=True,
                 text=True,
                 timeout=30
@@ -119,35 +434,119 @@ class ValyxoGit:
             return f"✓ {lines[0]}" if lines else "✓ Changes committed"
         return f"✗ {output}"
     
+    @staticmethod
+    def _push_args(remote: str, branch: str = None) -> List[str]:
+        if branch:
+            return ["push", remote, branch]
+        return ["push", "-u", remote, "HEAD"]  # push the current branch
+
+    @staticmethod
+    def _pull_args(remote: str, branch: str = None) -> List[str]:
+        return ["pull", remote] + ([branch] if branch else [])
+
+    @staticmethod
+    def _clone_args(url: str, directory: str = None) -> List[str]:
+        return ["clone", url] + ([directory] if directory else [])
+
     def push(self, remote: str = "origin", branch: str = None) -> str:
         """Push commits to remote."""
-        args = ["push", remote]
-        if branch:
-            args.append(branch)
-        else:
-            # Push current branch
-            args.extend(["-u", remote, "HEAD"])
-        
-        success, output = self._run_git(args)
+        success, output = self._run_git(self._push_args(remote, branch))
         if success:
             return f"✓ Pushed to {remote}"
         return f"✗ {output}"
     
     def pull(self, remote: str = "origin", branch: str = None) -> str:
         """Pull changes from remote."""
-        args = ["pull", remote]
-        if branch:
-            args.append(branch)
-        
-        success, output = self._run_git(args)
+        success, output = self._run_git(self._pull_args(remote, branch))
         if success:
             return output if output else "✓ Already up to date"
         return f"✗ {output}"
+
+    def run_job(self, jobs: ValyxoJobsManager, args: List[str], success_message: str) -> int:
+        """Run a network git command as a background job.
+
+        git is started with ``--progress`` and no terminal prompts; its
+        progress lines update the job (shown by ``jobs``), and killing the
+        job terminates git.
+
+        Args:
+            jobs: Job manager that owns the job
+            args: git arguments (subcommand first)
+            success_message: Job result when git succeeds
+
+        Returns:
+            Job PID
+        """
+        command = ["git", args[0], "--progress"] + args[1:]
+        cwd = self.cwd
+
+        def target(pid: int) -> str:
+            if not self._git_available:
+                return "✗ Git is not installed or not in PATH"
+            proc = subprocess.Popen(
+                command, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE, env=dict(os.environ, GIT_TERMINAL_PROMPT="0"),
+            )
+            jobs.set_cancel(pid, proc.terminate)
+            if jobs.should_stop(pid):
+                proc.terminate()
+            messages = []
+            for line in _progress_lines(proc.stderr):
+                progress = parse_git_progress(line)
+                if progress:
+                    jobs.update_progress(pid, progress)
+                elif line:
+                    messages.append(line)
+            proc.stderr.close()
+            if proc.wait() == 0:
+                return success_message
+            if jobs.should_stop(pid):
+                return "✗ Cancelled"
+            return "✗ " + ("\n".join(messages[-3:]) or f"git exited with status {proc.returncode}")
+
+        return jobs.start_job(" ".join(["git"] + args), target)
+
+    def push_async(self, jobs: ValyxoJobsManager, remote: str = "origin", branch: str = None) -> int:
+        """Push in the background (see run_job)."""
+        return self.run_job(jobs, self._push_args(remote, branch), f"✓ Pushed to {remote}")
+
+    def pull_async(self, jobs: ValyxoJobsManager, remote: str = "origin", branch: str = None) -> int:
+        """Pull in the background (see run_job)."""
+        return self.run_job(jobs, self._pull_args(remote, branch), f"✓ Pulled from {remote}")
+
+    def clone_async(self, jobs: ValyxoJobsManager, url: str, directory: str = None) -> int:
+        """Clone in the background (see run_job)."""
+        return self.run_job(jobs, self._clone_args(url, directory), f"✓ Cloned {url}")
     
+    def _list_branches(self) -> Optional[str]:
+        """``git branch -a`` output read from the refs, or None if git is needed."""
+        store = self._store()
+        if store is None:
+            return None
+        try:
+            current, head = store.head()
+            if current is None and head is not None:
+                return None  # git names the detached commit itself
+            lines = []
+            for ref, value in sorted(store.list_refs("refs/").items()):
+                if ref.startswith("refs/heads/"):
+                    name = ref[len("refs/heads/"):]
+                    lines.append(("* " if name == current else "  ") + name)
+                elif ref.startswith("refs/remotes/"):
+                    name = "remotes/" + ref[len("refs/remotes/"):]
+                    if value.startswith("ref: refs/remotes/"):
+                        name += " -> " + value[len("ref: refs/remotes/"):]
+                    lines.append("  " + name)
+            return "\n".join(lines)
+        except (GitReadUnsupported, OSError):
+            return None
+
     def branch(self, name: str = None, delete: bool = False) -> str:
         """List, create, or delete branches."""
         if name is None:
-            # List branches
+            listing = self._list_branches()
+            if listing is not None:
+                return listing or "No branches"
             success, output = self._run_git(["branch", "-a"])
             if success:
                 return output if output else "No branches"
@@ -177,37 +576,162 @@ class ValyxoGit:
             return f"✓ Switched to {'new ' if create else ''}branch: {target}"
         return f"✗ {output}"
     
-    def log(self, count: int = 10, oneline: bool = True) -> str:
-        """Show commit history."""
-        args = ["log", f"-{count}"]
+    def resolve(self, rev: str = "HEAD") -> Optional[str]:
+        """Full object id of a revision, or None if it does not resolve."""
+        answered, sha = self._read(lambda reader: reader.resolve(rev))
+        if answered:
+            return sha
+        success, output = self._run_git(["rev-parse", "--verify", "--quiet", rev])
+        return output if success and output else None
+
+    def read_commit(self, rev: str = "HEAD") -> Optional[GitCommit]:
+        """Read and parse a commit without running git log."""
+        _, commit = self._read(lambda reader: reader.read_commit(rev))
+        return commit
+
+    def show_file(self, path: str, rev: str = "HEAD") -> str:
+        """Contents of a file (relative to cwd) as of a revision."""
+        root = find_repo_root(self.cwd)
+        if root is not None:
+            rel = os.path.relpath(os.path.join(self.cwd, path), root).replace(os.sep, "/")
+            answered, obj = self._read(lambda reader: reader.read(f"{rev}:{rel}"))
+            if answered:
+                if obj is None:
+                    return f"✗ {path} does not exist in {rev}"
+                if obj.type != "blob":
+                    return f"✗ {path} is not a file in {rev}"
+                return obj.data.decode("utf-8", errors="replace")
+        success, output = self._run_git(["show", f"{rev}:./{path}"])
+        return output if success else f"✗ {output}"
+
+    def show(self, target: str = "HEAD") -> str:
+        """Show ``rev:path`` file contents, or a commit with its patch."""
+        if ":" in target:
+            rev, _, path = target.partition(":")
+            return self.show_file(path, rev or "HEAD")
+        success, output = self._run_git(["show", target])
+        return output if success else f"✗ {output}"
+
+    def _stream_git(self, args: List[str]) -> Iterator[str]:
+        """Run a git command, yielding stdout lines as git writes them.
+
+        There is no timeout and the output is never held in memory as a
+        whole. Closing the iterator early (a pager quitting) kills git.
+        A failure is reported as a final "✗ ..." line.
+        """
+        if not self._git_available:
+            yield "✗ Git is not installed or not in PATH"
+            return
+        with tempfile.TemporaryFile() as errors:
+            try:
+                proc = subprocess.Popen(
+                    ["git"] + args,
+                    cwd=self.cwd,
+                    stdout=subprocess.PIPE,
+                    stderr=errors,
+                    text=True,
+                    errors="replace",
+                    env=dict(os.environ, GIT_PAGER="cat"),
+                )
+            except OSError as e:
+                yield f"✗ Git error: {e}"
+                return
+            try:
+                for line in proc.stdout:
+                    yield line.rstrip("\n")
+                proc.stdout.close()
+                if proc.wait() != 0:
+                    errors.seek(0)
+                    message = errors.read().decode("utf-8", errors="replace").strip()
+                    yield f"✗ {message or f'git exited with status {proc.returncode}'}"
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+
+    def log_lines(self, count: int = None, oneline: bool = True) -> Iterator[str]:
+        """Commit history one line at a time, newest first.
+
+        Commits are read and formatted as the iterator is consumed, so the
+        first page appears at once and a pager can stop anywhere.
+
+        Args:
+            count: Most commits to show (None for the whole history)
+            oneline: One line per commit instead of the full format
+        """
+        for reader in self._readers():
+            commits = reader.walk("HEAD", count)
+            try:
+                first = next(commits, None)
+            except (GitReadUnsupported, OSError, ValueError):
+                continue
+            if first is None:
+                yield "No commits yet"
+                return
+            try:
+                commit = first
+                while commit is not None:
+                    if not oneline and commit is not first:
+                        yield ""
+                    yield from _format_commit(commit, oneline).split("\n")
+                    commit = next(commits, None)
+            except (GitReadUnsupported, OSError, ValueError) as e:
+                yield f"✗ {e}"
+            return
+
+        args = ["log"] + ([f"-{count}"] if count else [])
         if oneline:
             args.append("--oneline")
-        
-        success, output = self._run_git(args)
-        if success:
-            return output if output else "No commits yet"
-        return f"✗ {output}"
-    
-    def diff(self, staged: bool = False, file: str = None) -> str:
-        """Show changes."""
+        empty = True
+        for line in self._stream_git(args):
+            empty = False
+            yield line
+        if empty:
+            yield "No commits yet"
+
+    def log(self, count: int = 10, oneline: bool = True) -> str:
+        """Show commit history."""
+        return "\n".join(self.log_lines(count, oneline))
+
+    def blame(self, path: str, line: int = None) -> str:
+        """Blame a committed file (or one line of it), using the blame cache."""
+        try:
+            if line is not None:
+                blamed = self.blame_cache.line(path, line)
+                if blamed is None:
+                    return f"✗ {path} has no line {line}"
+                return format_blame_line(blamed)
+            blamed = self.blame_cache.blame(path)
+        except ValueError as e:
+            return f"✗ {e}"
+        if not blamed:
+            return f"{path} is empty"
+        author_width = max(len(b.commit.author) for b in blamed)
+        number_width = len(str(len(blamed)))
+        return "\n".join(format_blame_line(b, author_width, number_width) for b in blamed)
+
+    def diff_lines(self, staged: bool = False, file: str = None) -> Iterator[str]:
+        """``git diff`` output streamed from the pipe (see _stream_git)."""
         args = ["diff"]
         if staged:
             args.append("--staged")
         if file:
-            args.append(file)
-        
-        success, output = self._run_git(args)
-        if success:
-            return output if output else "No changes"
-        return f"✗ {output}"
+            args.extend(["--", file])
+        empty = True
+        for line in self._stream_git(args):
+            empty = False
+            yield line
+        if empty:
+            yield "No changes"
+
+    def diff(self, staged: bool = False, file: str = None) -> str:
+        """Show changes."""
+        return "\n".join(self.diff_lines(staged, file))
     
     def clone(self, url: str, directory: str = None) -> str:
         """Clone a repository."""
-        args = ["clone", url]
-        if directory:
-            args.append(directory)
-        
-        success, output = self._run_git(args)
+        success, output = self._run_git(self._clone_args(url, directory))
         if success:
             return f"✓ Cloned repository"
         return f"✗ {output}"
@@ -247,30 +771,126 @@ class ValyxoGit:
     
     def get_current_branch(self) -> str:
         """Get current branch name."""
+        store = self._store()
+        if store is not None:
+            branch, _ = store.head()
+            return branch or "HEAD detached"
         success, output = self._run_git(["branch", "--show-current"])
         if success:
             return output if output else "HEAD detached"
         return "unknown"
     
+    def _status_key(self, git_dir: str) -> tuple:
+        """Mtimes that change when the index, HEAD or the branch tip move."""
+        head_path = os.path.join(git_dir, "HEAD")
+        ref_path = None
+        try:
+            with open(head_path, "r", encoding="utf-8") as f:
+                head = f.read().strip()
+            if head.startswith("ref: "):
+                ref_path = os.path.join(git_dir, *head[5:].split("/"))
+        except OSError:
+            head = None
+        return (
+            head,
+            _mtime(os.path.join(git_dir, "index")),
+            _mtime(ref_path) if ref_path else None,
+            _mtime(os.path.join(git_dir, "packed-refs")),
+        )
+
+    def status_snapshot(self, cwd: str = None, ttl: float = STATUS_TTL) -> Optional[GitStatusSnapshot]:
+        """Branch, upstream and change counts for the repository containing cwd.
+
+        Args:
+            cwd: Directory to look up (default: self.cwd)
+            ttl: Seconds an unchanged snapshot is reused without checking the work tree
+
+        Returns:
+            GitStatusSnapshot, or None outside a repository
+        """
+        if not self._git_available:
+            return None
+        root = find_repo_root(cwd or self.cwd)
+        git_dir = find_git_dir(root) if root else None
+        if git_dir is None:
+            return None
+        key = self._status_key(git_dir)
+        cached = self._status_cache.get(root)
+        detector = self._detector(root, git_dir)
+        now = time.monotonic()
+        if cached and cached[0] == key:
+            if now - cached[1] < ttl:
+                return cached[2]
+            if detector is not None and not self._tree_changed(detector):
+                self._status_cache[root] = (key, now, cached[2])
+                return cached[2]
+        elif detector is not None:
+            self._tree_changed(detector)  # baseline before git reads the tree
+
+        success, output = self._run_git(["status", "--porcelain=v2", "--branch"], cwd=root)
+        self.status_runs += 1
+        if not success:
+            return None
+        snapshot = parse_porcelain_v2(output)
+        # status may refresh the index; key on what it left behind
+        new_key = self._status_key(git_dir)
+        if detector is not None and new_key != key:
+            self._tree_changed(detector)
+        self._status_cache[root] = (new_key, now, snapshot)
+        return snapshot
+
+    def _detector(self, root: str, git_dir: str) -> Optional[ValyxoChangeDetector]:
+        """Index-based change detector for a repository (None if unusable)."""
+        if root not in self._detectors:
+            self._detectors[root] = ValyxoChangeDetector(root, git_dir)
+        return self._detectors[root]
+
+    def _tree_changed(self, detector: ValyxoChangeDetector) -> bool:
+        try:
+            return detector.changed_since_last_check()
+        except (OSError, ValueError, struct.error):
+            self._detectors[detector.root] = None
+            return True
+
+    def status_all(self, root: str = PROJECTS_DIR, max_workers: int = STATUS_WORKERS,
+                   ttl: float = STATUS_TTL) -> Iterator[Tuple[str, Optional[GitStatusSnapshot]]]:
+        """Status snapshots of every repository under ``root``, as each completes.
+
+        Args:
+            root: Directory searched with discover_repos
+            max_workers: Repositories checked at the same time
+            ttl: Passed to status_snapshot (cached snapshots return at once)
+
+        Yields:
+            (repository root, snapshot or None if git failed)
+        """
+        repos = discover_repos(root)
+        if not repos:
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(repos))) as executor:
+            futures = {executor.submit(self.status_snapshot, repo, ttl): repo for repo in repos}
+            for future in as_completed(futures):
+                try:
+                    snapshot = future.result()
+                except Exception:
+                    snapshot = None
+                yield futures[future], snapshot
+
     def get_repo_info(self) -> Dict[str, Any]:
         """Get repository information."""
-        if not self.is_repo():
+        snapshot = self.status_snapshot()
+        if snapshot is None:
             return {"is_repo": False}
-        
-        _, remote = self._run_git(["remote", "get-url", "origin"])
-        _, branch = self._run_git(["branch", "--show-current"])
-        _, commit = self._run_git(["rev-parse", "--short", "HEAD"])
-        _, status = self._run_git(["status", "-s"])
-        
-        changes = len(status.split('\n')) if status else 0
-        
-        return {
+
+        info = asdict(snapshot)
+        info.update({
             "is_repo": True,
-            "remote": remote if remote and not remote.startswith("✗") else None,
-            "branch": branch or "unknown",
-            "commit": commit or "unknown",
-            "changes": changes
-        }
+            "remote": _read_remote_url(find_git_dir(find_repo_root(self.cwd))),
+            "branch": snapshot.branch or "unknown",
+            "commit": snapshot.commit[:ABBREV] if snapshot.commit else "unknown",
+            "changes": snapshot.changes,
+        })
+        return info
 
 
 def parse_git_command(args: str) -> Tuple[str, List[str]]:
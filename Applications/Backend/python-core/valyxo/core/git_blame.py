@@ -0,0 +1,254 @@
+"""Valyxo Git Blame v0.6.0
+
+Line-by-line authorship of committed files, cached between calls.
+
+Cache:
+    One entry per file, keyed by the blob id of the file at HEAD. While
+    the blob is unchanged a blame (or a single-line lookup) is answered
+    from memory without running git.
+
+Incremental updates:
+    When HEAD moves and the file changed, the old and new blobs are
+    diffed. If the old HEAD is an ancestor of the new one, lines outside
+    the changed hunks keep their attribution and only the changed ranges
+    are re-blamed (``git blame --incremental -L a,b ...``). Otherwise, or
+    when most of the file changed, the whole file is blamed again.
+"""
+
+import os
+import difflib
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from .git_worker import find_repo_root
+
+
+# Files whose blame is kept in memory
+BLAME_CACHE_SIZE = 32
+
+# Commits searched when checking that the old HEAD is an ancestor
+ANCESTRY_LIMIT = 500
+
+# Re-blame everything when more than this fraction of lines changed
+PARTIAL_LIMIT = 0.5
+
+
+@dataclass
+class BlameCommit:
+    """The commit a blamed line comes from."""
+    sha: str
+    author: str = ""
+    author_mail: str = ""
+    author_time: int = 0
+    author_tz: str = "+0000"
+    summary: str = ""
+    boundary: bool = False
+
+
+@dataclass
+class BlameLine:
+    """One line of a blamed file."""
+    line: int  # 1-based
+    commit: BlameCommit
+    text: str
+
+
+@dataclass
+class _BlameEntry:
+    head: str
+    blob: str
+    owners: List[str]  # commit id per line
+    lines: List[str]
+
+
+def parse_incremental_blame(lines: Iterable[str]) -> Tuple[List[Tuple[str, int, int]], Dict[str, BlameCommit]]:
+    """Parse ``git blame --incremental`` output.
+
+    Returns:
+        ([(commit id, first final line, line count)], {commit id: BlameCommit})
+    """
+    hunks: List[Tuple[str, int, int]] = []
+    commits: Dict[str, BlameCommit] = {}
+    current: Optional[BlameCommit] = None
+    for line in lines:
+        key, _, value = line.partition(" ")
+        if current is None:
+            parts = line.split()
+            if len(parts) != 4:
+                continue
+            sha, final, count = parts[0], int(parts[2]), int(parts[3])
+            hunks.append((sha, final, count))
+            current = commits.setdefault(sha, BlameCommit(sha))
+        elif key == "filename":
+            current = None  # ends every hunk entry
+        elif key == "author":
+            current.author = value
+        elif key == "author-mail":
+            current.author_mail = value
+        elif key == "author-time":
+            current.author_time = int(value)
+        elif key == "author-tz":
+            current.author_tz = value
+        elif key == "summary":
+            current.summary = value
+        elif key == "boundary":
+            current.boundary = True
+    return hunks, commits
+
+
+def format_blame_line(blame: BlameLine, author_width: int = 0, number_width: int = 0) -> str:
+    """Render a line like ``git blame``: "<sha> (<author> <date> <n>) <text>"."""
+    commit = blame.commit
+    tz = commit.author_tz
+    try:
+        sign = -1 if tz[0] == "-" else 1
+        offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5])) * sign
+    except (ValueError, IndexError):
+        offset, tz = timedelta(0), "+0000"
+    date = datetime.fromtimestamp(commit.author_time, timezone(offset)).strftime("%Y-%m-%d %H:%M:%S")
+    sha = ("^" + commit.sha[:7]) if commit.boundary else commit.sha[:8]
+    return (f"{sha} ({commit.author:<{author_width}} {date} {tz} "
+            f"{blame.line:>{number_width}}) {blame.text}")
+
+
+def _split_lines(text: str) -> List[str]:
+    """Split on "\\n" only, like git (str.splitlines also splits on \\f, \\r, ...)."""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _changed_ranges(old: List[str], new: List[str]) -> Tuple[List[Optional[int]], List[Tuple[int, int]]]:
+    """Map new lines to unchanged old lines and list the new ranges to re-blame.
+
+    Returns:
+        (old index or None for each new line, [(first, last)] 1-based new ranges)
+    """
+    mapping: List[Optional[int]] = [None] * len(new)
+    ranges = []
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for offset in range(j2 - j1):
+                mapping[j1 + offset] = i1 + offset
+        elif j2 > j1:
+            ranges.append((j1 + 1, j2))
+    return mapping, ranges
+
+
+class ValyxoBlameCache:
+    """Cached ``git blame`` for files at HEAD."""
+
+    def __init__(self, git, capacity: int = BLAME_CACHE_SIZE):
+        """Create a blame cache.
+
+        Args:
+            git: ValyxoGit used to read objects and run git
+            capacity: Files kept in memory
+        """
+        self.git = git
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, _BlameEntry]" = OrderedDict()
+        self.commits: Dict[str, BlameCommit] = {}
+        self.stats = {"hits": 0, "full": 0, "partial": 0, "lines_blamed": 0}
+
+    def _locate(self, path: str) -> Tuple[str, str]:
+        """(repository root, path relative to it) for a path relative to cwd."""
+        full = os.path.abspath(os.path.join(self.git.cwd, path))
+        root = find_repo_root(os.path.dirname(full))
+        if root is None or root != find_repo_root(self.git.cwd):
+            raise ValueError(f"{path} is not in this git repository")
+        return root, os.path.relpath(full, root).replace(os.sep, "/")
+
+    def _blame_ranges(self, root: str, rel: str, head: str, ranges: List[Tuple[int, int]] = None):
+        args = ["blame", "--incremental"]
+        for first, last in ranges or []:
+            args += ["-L", f"{first},{last}"]
+        ok, output = self.git._run_git(args + [head, "--", rel], cwd=root)
+        if not ok:
+            raise ValueError(output)
+        hunks, commits = parse_incremental_blame(_split_lines(output))
+        for sha, commit in commits.items():
+            self.commits.setdefault(sha, commit)
+        return hunks
+
+    def _is_ancestor(self, old: str, new: str) -> bool:
+        answered, found = self.git._read(
+            lambda reader: any(c.sha == old for c in reader.walk(new, ANCESTRY_LIMIT)))
+        return bool(answered and found)
+
+    def _load(self, path: str) -> _BlameEntry:
+        root, rel = self._locate(path)
+        head = self.git.resolve("HEAD")
+        blob = self.git.resolve(f"HEAD:{rel}") if head else None
+        if blob is None:
+            raise ValueError(f"{path} is not committed")
+        key = f"{root}/{rel}"
+        entry = self._entries.get(key)
+        if entry is not None and entry.blob == blob:
+            self.stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        _, obj = self.git._read(lambda reader: reader.read(blob))
+        if obj is None:
+            raise ValueError(f"cannot read {path} at HEAD")
+        lines = _split_lines(obj.data.decode("utf-8", errors="replace"))
+        owners: List[Optional[str]] = [None] * len(lines)
+
+        ranges = None
+        if entry is not None and self._is_ancestor(entry.head, head):
+            mapping, ranges = _changed_ranges(entry.lines, lines)
+            if sum(last - first + 1 for first, last in ranges) > PARTIAL_LIMIT * max(len(lines), 1):
+                ranges = None
+            else:
+                for j, i in enumerate(mapping):
+                    if i is not None:
+                        owners[j] = entry.owners[i]
+
+        if ranges is None:
+            self.stats["full"] += 1
+            hunks = self._blame_ranges(root, rel, head)
+        else:
+            self.stats["partial"] += 1
+            hunks = self._blame_ranges(root, rel, head, ranges) if ranges else []
+        for sha, final, count in hunks:
+            owners[final - 1:final - 1 + count] = [sha] * count
+            self.stats["lines_blamed"] += count
+
+        entry = _BlameEntry(head, blob, owners, lines)
+        self._entries[key] = entry
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return entry
+
+    def blame(self, path: str) -> List[BlameLine]:
+        """Every line of a file at HEAD with the commit that last changed it.
+
+        Raises:
+            ValueError: If the file is not committed or git fails
+        """
+        entry = self._load(path)
+        return [BlameLine(i + 1, self.commits.get(sha) or BlameCommit(sha or "?"), text)
+                for i, (sha, text) in enumerate(zip(entry.owners, entry.lines))]
+
+    def line(self, path: str, number: int) -> Optional[BlameLine]:
+        """Who last changed one line (1-based); None past the end of the file."""
+        entry = self._load(path)
+        if not 1 <= number <= len(entry.lines):
+            return None
+        sha = entry.owners[number - 1]
+        return BlameLine(number, self.commits.get(sha) or BlameCommit(sha or "?"), entry.lines[number - 1])
+
+    def history(self, path: str) -> List[Tuple[BlameCommit, int]]:
+        """Commits that own lines of a file, with their line counts, newest first."""
+        counts: Dict[str, int] = {}
+        for sha in self._load(path).owners:
+            counts[sha] = counts.get(sha, 0) + 1
+        commits = [(self.commits.get(sha) or BlameCommit(sha), n) for sha, n in counts.items()]
+        return sorted(commits, key=lambda item: -item[0].author_time)
+
+    def clear(self) -> None:
+        self._entries.clear()
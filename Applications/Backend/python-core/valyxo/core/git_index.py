@@ -0,0 +1,306 @@
+"""Valyxo Git Index Reader v0.6.0
+
+Working-tree change detection from ``.git/index`` stat data, without git.
+
+Index:
+    GitIndex memory-maps the index file and parses the entries of index
+    versions 2, 3 and 4 (path, stat data and blob id). Extensions are
+    ignored.
+
+Detection:
+    ValyxoChangeDetector stats every tracked file and compares mtime, size
+    and inode with the index, like ``git status`` does before hashing:
+        - size differs from the index           -> modified
+        - file is gone                          -> deleted
+        - executable bit or file type differs   -> modified
+          (the executable bit only when core.fileMode is true)
+        - same size but another mtime or inode, a "racily clean" entry
+          (modified within the index's own timestamp) or a size git
+          zeroed for that reason -> the blob id is hashed to decide, once
+          per stat
+    New untracked files are noticed through the mtimes of directories
+    that contain tracked files. The index is reloaded only when its own
+    stat changes.
+
+    ``changed_since_last_check`` answers "did anything change since I last
+    asked" from a fingerprint of all those stats.
+"""
+
+import os
+import mmap
+import stat as statmod
+import struct
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+_HEADER = struct.Struct(">4sII")
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size, sha1, flags
+_ENTRY = struct.Struct(">IIIIIIIIII20sH")
+
+_GITLINK = 0o160000
+_SYMLINK = 0o120000
+_EXECUTABLE = 0o100755
+_ASSUME_VALID = 0x8000
+_EXTENDED = 0x4000
+_SKIP_WORKTREE = 0x4000  # in the extended flags
+
+
+@dataclass
+class IndexEntry:
+    """Stat data git recorded for a tracked file."""
+    path: str
+    mtime_s: int
+    mtime_ns: int
+    size: int
+    ino: int
+    mode: int
+    sha: str
+
+
+@dataclass
+class ChangeReport:
+    """Tracked files that differ from the index."""
+    modified: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    dirs_changed: List[str] = field(default_factory=list)  # may hold new untracked files
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.modified or self.deleted)
+
+
+def _read_varint(data, pos: int) -> Tuple[int, int]:
+    """Index v4 offset encoding (same as OFS_DELTA)."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+class GitIndex:
+    """Parsed entries of a ``.git/index`` file."""
+
+    def __init__(self, path: str):
+        """Read an index file.
+
+        Args:
+            path: Path to ``.git/index``
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not a version 2-4 index
+        """
+        self.path = path
+        self.entries: List[IndexEntry] = []
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            self.mtime = (int(stat.st_mtime), stat.st_mtime_ns % 1_000_000_000)
+            if stat.st_size < _HEADER.size:
+                raise ValueError("index file too short")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                self._parse(data)
+
+    def _parse(self, data) -> None:
+        signature, version, count = _HEADER.unpack_from(data, 0)
+        if signature != b"DIRC" or version not in (2, 3, 4):
+            raise ValueError(f"unsupported index (version {version})")
+        pos = _HEADER.size
+        previous = b""
+        for _ in range(count):
+            start = pos
+            (_, _, mtime_s, mtime_ns, _, ino, mode, _, _, size, sha, flags) = _ENTRY.unpack_from(data, pos)
+            pos += _ENTRY.size
+            extended = 0
+            if flags & _EXTENDED:
+                (extended,) = struct.unpack_from(">H", data, pos)
+                pos += 2
+            if version == 4:
+                strip, pos = _read_varint(data, pos)
+                end = data.find(b"\0", pos)
+                name = previous[:len(previous) - strip] + data[pos:end]
+                pos = end + 1
+            else:
+                end = data.find(b"\0", pos)
+                name = data[pos:end]
+                # entries are NUL-padded to a multiple of 8 bytes
+                pos = start + ((end - start + 8) & ~7)
+            previous = name
+            if mode == _GITLINK or flags & _ASSUME_VALID or extended & _SKIP_WORKTREE:
+                continue
+            if flags & 0x3000:
+                continue  # merge stages 1-3 of a conflicted path
+            self.entries.append(IndexEntry(name.decode("utf-8", errors="surrogateescape"),
+                                           mtime_s, mtime_ns, size, ino, mode, sha.hex()))
+
+
+def _read_file_mode(git_dir: str) -> bool:
+    """``core.fileMode`` from the repository config (git's default is true)."""
+    current = None
+    try:
+        with open(os.path.join(git_dir, "config"), "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    current = line.lower()
+                elif current == "[core]" and "=" in line:
+                    key, value = line.split("=", 1)
+                    if key.strip().lower() == "filemode":
+                        return value.strip().lower() not in ("false", "no", "off", "0")
+    except OSError:
+        pass
+    return True
+
+
+def _blob_id(path: str) -> Optional[str]:
+    """Object id git would give the file's contents."""
+    try:
+        if os.path.islink(path):
+            data = os.readlink(path).encode("utf-8", errors="surrogateescape")
+        else:
+            with open(path, "rb") as f:
+                data = f.read()
+    except OSError:
+        return None
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class ValyxoChangeDetector:
+    """Detects working-tree changes of one repository from index stat data."""
+
+    def __init__(self, root: str, git_dir: str = None):
+        """Create a detector.
+
+        Args:
+            root: Work tree root
+            git_dir: Git directory (default: ``<root>/.git``)
+        """
+        self.root = root
+        self.git_dir = git_dir or os.path.join(root, ".git")
+        self.index_path = os.path.join(self.git_dir, "index")
+        self._file_mode: Tuple[Optional[int], bool] = (None, True)  # (config mtime, core.fileMode)
+        self.index: Optional[GitIndex] = None
+        self._dirs: List[str] = []
+        # path -> stat of files whose stat differs from the index but whose
+        # contents were hashed and matched it
+        self._verified: Dict[str, Tuple[int, int, int]] = {}
+        self._fingerprint: Optional[int] = None
+        self._dir_mtimes: Dict[str, Optional[int]] = {}
+        self.checks = 0
+
+    def _load_index(self) -> Optional[GitIndex]:
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            self.index = None
+            return None
+        if self.index is None or self.index.stat != (stat.st_mtime_ns, stat.st_size, stat.st_ino):
+            self.index = GitIndex(self.index_path)
+            self._verified.clear()
+            dirs = {""}
+            for entry in self.index.entries:
+                parent = os.path.dirname(entry.path)
+                while parent not in dirs:
+                    dirs.add(parent)
+                    parent = os.path.dirname(parent)
+            self._dirs = sorted(dirs)
+        return self.index
+
+    def _trust_file_mode(self) -> bool:
+        """core.fileMode, re-read only when the config file changes."""
+        config = os.path.join(self.git_dir, "config")
+        try:
+            mtime = os.stat(config).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._file_mode[0]:
+            self._file_mode = (mtime, _read_file_mode(self.git_dir))
+        return self._file_mode[1]
+
+    def _scan(self) -> Tuple[ChangeReport, int]:
+        """Compare the work tree with the index; also fingerprint every stat read."""
+        report = ChangeReport()
+        index = self._load_index()
+        if index is None:
+            self._dir_mtimes = {}
+            return report, hash(None)
+        stats = [index.stat]
+        root = self.root
+        file_mode = self._trust_file_mode()
+        stats.append(file_mode)
+        racy_s, racy_ns = index.mtime
+        for entry in index.entries:
+            path = os.path.join(root, entry.path)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                report.deleted.append(entry.path)
+                stats.append(None)
+                continue
+            mtime_ns = st.st_mtime_ns
+            stats.append((mtime_ns, st.st_size, st.st_ino, st.st_ctime_ns, st.st_mode))
+            if statmod.S_ISLNK(st.st_mode) != (entry.mode == _SYMLINK):
+                report.modified.append(entry.path)  # type change
+                continue
+            if file_mode and entry.mode != _SYMLINK \
+                    and bool(st.st_mode & 0o100) != (entry.mode == _EXECUTABLE):
+                report.modified.append(entry.path)
+                continue
+            size = st.st_size & 0xFFFFFFFF
+            if size != entry.size and entry.size != 0:
+                report.modified.append(entry.path)
+                continue
+            stat_matches = (size == entry.size and mtime_ns // 1_000_000_000 == entry.mtime_s
+                            and (not entry.mtime_ns or mtime_ns % 1_000_000_000 == entry.mtime_ns)
+                            and (not entry.ino or st.st_ino & 0xFFFFFFFF == entry.ino))
+            if stat_matches and (entry.mtime_s, entry.mtime_ns) < (racy_s, racy_ns):
+                continue
+            # Touched, racily clean, or size smudged by git: compare contents
+            key = (mtime_ns, st.st_size, st.st_ino)
+            if self._verified.get(entry.path) != key:
+                if _blob_id(path) != entry.sha:
+                    report.modified.append(entry.path)
+                    continue
+                self._verified[entry.path] = key
+        previous, self._dir_mtimes = self._dir_mtimes, {}
+        for directory in self._dirs:
+            try:
+                mtime = os.stat(os.path.join(root, directory)).st_mtime_ns
+            except OSError:
+                mtime = None
+            self._dir_mtimes[directory] = mtime
+            stats.append(mtime)
+            if directory in previous and previous[directory] != mtime:
+                report.dirs_changed.append(directory)
+        self.checks += 1
+        return report, hash(tuple(stats))
+
+    def check(self) -> ChangeReport:
+        """Tracked files whose contents differ from the index.
+
+        ``dirs_changed`` lists directories whose entries changed since the
+        previous scan (new or removed untracked files show up there).
+        """
+        report, self._fingerprint = self._scan()
+        return report
+
+    def changed_since_last_check(self) -> bool:
+        """Whether the index, a tracked file or a tracked directory changed since the last call.
+
+        The first call always returns True.
+        """
+        _, fingerprint = self._scan()
+        changed = fingerprint != self._fingerprint
+        self._fingerprint = fingerprint
+        return changed
+
+    def is_dirty(self) -> bool:
+        """Whether any tracked file differs from the index."""
+        report, _ = self._scan()
+        return report.dirty
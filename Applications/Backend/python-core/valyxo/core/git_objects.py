@@ -0,0 +1,511 @@
+"""Valyxo Git Object Reader v0.6.0
+
+Read-only access to a repository's refs and objects without running git.
+
+Sources:
+    - ``HEAD`` and other symbolic refs
+    - loose refs (``refs/...``) and ``packed-refs``
+    - loose objects (``objects/xx/...``, zlib-compressed)
+    - packfiles through their version 2 ``.idx`` files; both are
+      memory-mapped and objects are located by a binary search of the
+      sorted object ids within the idx fan-out range
+
+Revisions:
+    Full and abbreviated object ids, ref names (resolved in git's order:
+    pseudo-refs such as ``HEAD``, ``refs/<name>``, ``refs/tags/``, ``refs/heads/``,
+    ``refs/remotes/``), followed by any ``~N`` / ``^N`` suffixes, plus
+    ``<rev>:<path>`` for blobs and trees.
+
+Anything else (reflog syntax, ranges, SHA-256 repositories, alternates,
+idx version 1, ...) raises GitReadUnsupported so callers can fall back to
+git itself.
+"""
+
+import os
+import re
+import mmap
+import zlib
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+from .git_worker import GitObject, GitCommit, parse_commit, walk_commits
+
+
+# Packed objects kept after decompression (speeds up delta chains)
+OBJECT_CACHE_SIZE = 256
+
+_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_OFS_DELTA = 6
+_REF_DELTA = 7
+
+_HEX = re.compile(r"^[0-9a-f]{4,40}$")
+_REV = re.compile(r"^(?P<base>[^~^:]+)(?P<ops>(?:[~^]\d*)*)$")
+_OP = re.compile(r"([~^])(\d*)")
+_PSEUDO_REF = re.compile(r"^[A-Z_]+$")  # HEAD, ORIG_HEAD, ...
+_DWIM = ("refs/{}", "refs/tags/{}", "refs/heads/{}", "refs/remotes/{}", "refs/remotes/{}/HEAD")
+
+
+class GitReadUnsupported(Exception):
+    """The repository or revision needs git itself."""
+    pass
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Apply a git delta to its base object."""
+    pos = 0
+
+    def varint() -> int:
+        nonlocal pos
+        value = shift = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return value
+
+    if varint() != len(base):
+        raise GitReadUnsupported("delta base size mismatch")
+    size = varint()
+    out = bytearray()
+    end = len(delta)
+    while pos < end:
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            offset = length = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    length |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset:offset + (length or 0x10000)]
+        elif op:
+            out += delta[pos:pos + op]
+            pos += op
+        else:
+            raise GitReadUnsupported("invalid delta opcode")
+    if len(out) != size:
+        raise GitReadUnsupported("delta result size mismatch")
+    return bytes(out)
+
+
+def _map(path: str) -> Optional[mmap.mmap]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class GitPack:
+    """One packfile and its version 2 index, memory-mapped."""
+
+    def __init__(self, idx_path: str):
+        self.idx_path = idx_path
+        self.pack_path = idx_path[:-4] + ".pack"
+        self.idx = _map(idx_path)
+        self.pack = _map(self.pack_path)
+        if self.idx is None or self.pack is None or self.idx[:8] != b"\xfftOc\x00\x00\x00\x02":
+            self.close()
+            raise GitReadUnsupported(f"unsupported pack index: {idx_path}")
+        self.fanout = struct.unpack_from(">256I", self.idx, 8)
+        self.count = self.fanout[255]
+        self._sha_base = 8 + 1024
+        self._offset_base = self._sha_base + 24 * self.count
+        self._large_base = self._offset_base + 4 * self.count
+
+    def _sha_at(self, i: int) -> bytes:
+        start = self._sha_base + 20 * i
+        return self.idx[start:start + 20]
+
+    def _range(self, first_byte: int) -> Tuple[int, int]:
+        return (self.fanout[first_byte - 1] if first_byte else 0), self.fanout[first_byte]
+
+    def find(self, sha: bytes) -> Optional[int]:
+        """Pack offset of an object id, or None."""
+        lo, hi = self._range(sha[0])
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = self._sha_at(mid)
+            if probe < sha:
+                lo = mid + 1
+            elif probe > sha:
+                hi = mid
+            else:
+                return self._offset(mid)
+        return None
+
+    def find_prefix(self, prefix: str) -> List[str]:
+        """Object ids starting with a hex prefix (at most two, to detect ambiguity)."""
+        first = int(prefix[:2], 16)
+        low = bytes.fromhex(prefix.ljust(40, "0"))
+        lo, hi = self._range(first)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._sha_at(mid) < low:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        _, end = self._range(first)
+        while lo < end and len(found) < 2:
+            sha = self._sha_at(lo).hex()
+            if not sha.startswith(prefix):
+                break
+            found.append(sha)
+            lo += 1
+        return found
+
+    def _offset(self, i: int) -> int:
+        (offset,) = struct.unpack_from(">I", self.idx, self._offset_base + 4 * i)
+        if offset & 0x80000000:
+            (offset,) = struct.unpack_from(">Q", self.idx, self._large_base + 8 * (offset & 0x7FFFFFFF))
+        return offset
+
+    def read_header(self, offset: int) -> Tuple[int, int, int]:
+        """(type number, size, data offset) of the entry at ``offset``."""
+        byte = self.pack[offset]
+        offset += 1
+        obj_type = (byte >> 4) & 7
+        size = byte & 0x0F
+        shift = 4
+        while byte & 0x80:
+            byte = self.pack[offset]
+            offset += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+        return obj_type, size, offset
+
+    def inflate(self, offset: int, size: int) -> bytes:
+        """Decompress ``size`` bytes of zlib data starting at ``offset``."""
+        decomp = zlib.decompressobj()
+        out = []
+        chunk = max(size + 64, 4096)
+        while not decomp.eof and offset < len(self.pack):
+            out.append(decomp.decompress(self.pack[offset:offset + chunk]))
+            offset += chunk
+        data = b"".join(out)
+        if len(data) != size:
+            raise GitReadUnsupported("corrupt pack entry")
+        return data
+
+    def close(self) -> None:
+        for mapped in (self.idx, self.pack):
+            if mapped is not None:
+                mapped.close()
+        self.idx = self.pack = None
+
+
+class GitObjectStore:
+    """Refs and objects of one repository, read directly from disk."""
+
+    def __init__(self, git_dir: str, cache_size: int = OBJECT_CACHE_SIZE):
+        """Open a git directory.
+
+        Args:
+            git_dir: The ``.git`` directory
+            cache_size: Decompressed packed objects kept in memory
+
+        Raises:
+            GitReadUnsupported: For layouts this reader does not handle
+        """
+        self.git_dir = git_dir
+        self.objects_dir = os.path.join(git_dir, "objects")
+        if os.path.exists(os.path.join(git_dir, "commondir")):
+            raise GitReadUnsupported("linked worktrees are not supported")
+        if os.path.exists(os.path.join(self.objects_dir, "info", "alternates")):
+            raise GitReadUnsupported("alternate object stores are not supported")
+        if self._config_mentions("objectformat"):
+            raise GitReadUnsupported("only SHA-1 repositories are supported")
+        self.cache_size = cache_size
+        self._packs: List[GitPack] = []
+        self._packs_mtime: Optional[int] = None
+        self._packed_refs: Dict[str, str] = {}
+        self._packed_mtime: Optional[int] = None
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.reads = 0
+
+    def _config_mentions(self, word: str) -> bool:
+        try:
+            with open(os.path.join(self.git_dir, "config"), "r", encoding="utf-8", errors="replace") as f:
+                return word in f.read().lower()
+        except OSError:
+            return False
+
+    # ─── refs ────────────────────────────────────────────────────────
+
+    def _load_packed_refs(self) -> Dict[str, str]:
+        path = os.path.join(self.git_dir, "packed-refs")
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._packed_refs, self._packed_mtime = {}, None
+            return self._packed_refs
+        if mtime != self._packed_mtime:
+            refs = {}
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if line.startswith(("#", "^")):
+                        continue  # header / peeled tag target
+                    parts = line.split()
+                    if len(parts) == 2:
+                        refs[parts[1]] = parts[0]
+            self._packed_refs, self._packed_mtime = refs, mtime
+        return self._packed_refs
+
+    def read_ref(self, name: str, depth: int = 0) -> Optional[str]:
+        """Object id a ref points to, following symbolic refs."""
+        if depth > 5:
+            return None
+        try:
+            with open(os.path.join(self.git_dir, *name.split("/")), "r", encoding="utf-8") as f:
+                value = f.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return self._load_packed_refs().get(name)
+        if value.startswith("ref: "):
+            return self.read_ref(value[5:], depth + 1)
+        return value if len(value) == 40 else None
+
+    def head(self) -> Tuple[Optional[str], Optional[str]]:
+        """(current branch, commit id) — branch is None when detached."""
+        try:
+            with open(os.path.join(self.git_dir, "HEAD"), "r", encoding="utf-8") as f:
+                value = f.read().strip()
+        except OSError:
+            return None, None
+        if value.startswith("ref: "):
+            ref = value[5:]
+            branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+            return branch, self.read_ref(ref)
+        return None, value
+
+    def list_refs(self, prefix: str = "refs/") -> Dict[str, str]:
+        """Ref name -> value (object id, or "ref: ..." for symbolic refs)."""
+        refs = {name: sha for name, sha in self._load_packed_refs().items() if name.startswith(prefix)}
+        top = os.path.join(self.git_dir, *prefix.rstrip("/").split("/"))
+        for dirpath, _, filenames in os.walk(top):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, self.git_dir).replace(os.sep, "/")
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        refs[name] = f.read().strip()
+                except (OSError, UnicodeDecodeError):
+                    continue
+        return refs
+
+    # ─── objects ─────────────────────────────────────────────────────
+
+    def _load_packs(self, force: bool = False) -> List[GitPack]:
+        pack_dir = os.path.join(self.objects_dir, "pack")
+        try:
+            mtime = os.stat(pack_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._packs_mtime or force:
+            known = {pack.idx_path: pack for pack in self._packs}
+            packs = []
+            for name in sorted(os.listdir(pack_dir)) if mtime is not None else []:
+                if name.endswith(".idx"):
+                    path = os.path.join(pack_dir, name)
+                    packs.append(known.pop(path, None) or GitPack(path))
+            for stale in known.values():
+                stale.close()
+            self._packs, self._packs_mtime = packs, mtime
+        return self._packs
+
+    def _read_loose(self, sha: str) -> Optional[Tuple[str, bytes]]:
+        path = os.path.join(self.objects_dir, sha[:2], sha[2:])
+        try:
+            with open(path, "rb") as f:
+                raw = zlib.decompress(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error) as e:
+            raise GitReadUnsupported(f"unreadable loose object {sha}: {e}")
+        header, _, data = raw.partition(b"\0")
+        obj_type, _, _ = header.decode("ascii").partition(" ")
+        return obj_type, data
+
+    def _read_packed(self, pack: GitPack, offset: int) -> Tuple[str, bytes]:
+        key = (pack.pack_path, offset)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        obj_type, size, data_offset = pack.read_header(offset)
+        if obj_type in _TYPES:
+            result = _TYPES[obj_type], pack.inflate(data_offset, size)
+        elif obj_type == _OFS_DELTA:
+            byte = pack.pack[data_offset]
+            data_offset += 1
+            distance = byte & 0x7F
+            while byte & 0x80:
+                byte = pack.pack[data_offset]
+                data_offset += 1
+                distance = ((distance + 1) << 7) | (byte & 0x7F)
+            base_type, base = self._read_packed(pack, offset - distance)
+            result = base_type, _apply_delta(base, pack.inflate(data_offset, size))
+        elif obj_type == _REF_DELTA:
+            base_sha = pack.pack[data_offset:data_offset + 20].hex()
+            base_obj = self._read_raw(base_sha)
+            if base_obj is None:
+                raise GitReadUnsupported(f"missing delta base {base_sha}")
+            result = base_obj[0], _apply_delta(base_obj[1], pack.inflate(data_offset + 20, size))
+        else:
+            raise GitReadUnsupported(f"unknown pack entry type {obj_type}")
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _read_raw(self, sha: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            loose = self._read_loose(sha)
+            if loose is not None:
+                return loose
+            binary = bytes.fromhex(sha)
+            for attempt in (False, True):
+                for pack in self._load_packs(force=attempt):
+                    offset = pack.find(binary)
+                    if offset is not None:
+                        return self._read_packed(pack, offset)
+            return None
+
+    def _expand(self, prefix: str) -> Optional[str]:
+        """Full object id for an abbreviation (None if missing or ambiguous)."""
+        found = set()
+        try:
+            names = os.listdir(os.path.join(self.objects_dir, prefix[:2]))
+        except OSError:
+            names = []
+        found.update(prefix[:2] + name for name in names if name.startswith(prefix[2:]))
+        with self._lock:
+            for pack in self._load_packs():
+                found.update(pack.find_prefix(prefix))
+        return found.pop() if len(found) == 1 else None
+
+    def read_object(self, sha: str) -> Optional[GitObject]:
+        """Read an object by its full id."""
+        raw = self._read_raw(sha)
+        if raw is None:
+            return None
+        self.reads += 1
+        return GitObject(sha, raw[0], len(raw[1]), raw[1])
+
+    # ─── revisions ───────────────────────────────────────────────────
+
+    def _peel(self, sha: str) -> Optional[GitObject]:
+        """Follow annotated tags down to the object they point at."""
+        obj = self.read_object(sha)
+        while obj is not None and obj.type == "tag":
+            target = obj.data.split(b"\n", 1)[0]
+            if not target.startswith(b"object "):
+                raise GitReadUnsupported("malformed tag")
+            obj = self.read_object(target[7:].decode("ascii"))
+        return obj
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """Object id of a revision or ``<rev>:<path>``, or None if it does not exist.
+
+        Raises:
+            GitReadUnsupported: For revision syntax this reader does not handle
+        """
+        if ":" in rev:
+            return self._resolve_path(*rev.split(":", 1))
+        match = _REV.match(rev)
+        if not match or "@{" in rev or ".." in rev:
+            raise GitReadUnsupported(f"unsupported revision: {rev}")
+        base = match.group("base")
+        if re.fullmatch(r"[0-9a-f]{40}", base):
+            sha = base
+        else:
+            sha = self.read_ref(base) if _PSEUDO_REF.match(base) else None
+            for pattern in _DWIM if sha is None else ():
+                sha = self.read_ref(pattern.format(base))
+                if sha:
+                    break
+            if sha is None and _HEX.match(base):
+                sha = self._expand(base)
+        if sha is None:
+            return None
+
+        for op, number in _OP.findall(match.group("ops")):
+            count = int(number) if number else 1
+            if op == "^" and count == 0:
+                obj = self._peel(sha)
+                sha = obj.sha if obj is not None else None
+                continue
+            steps = count if op == "~" else 1
+            index = 0 if op == "~" else count - 1
+            for _ in range(steps):
+                commit = self.read_commit(sha)
+                if commit is None or index >= len(commit.parents):
+                    return None
+                sha = commit.parents[index]
+        return sha
+
+    def _resolve_path(self, rev: str, path: str) -> Optional[str]:
+        """Object id of a path in a commit's tree (only trees are read)."""
+        if not rev:
+            raise GitReadUnsupported("index paths (:<path>) are not supported")
+        sha = self.resolve(rev)
+        obj = self._peel(sha) if sha else None
+        if obj is not None and obj.type == "commit":
+            obj = self.read_object(parse_commit(obj.sha, obj.data).tree)
+        if obj is None:
+            return None
+        sha = obj.sha
+        parts = [p for p in path.split("/") if p]
+        for i, part in enumerate(parts):
+            if obj is None or obj.type != "tree":
+                return None
+            sha = self._tree_entry(obj.data, part.encode("utf-8"))
+            if sha is None:
+                return None
+            if i < len(parts) - 1:
+                obj = self.read_object(sha)
+        return sha
+
+    def read(self, spec: str) -> Optional[GitObject]:
+        """Read ``<rev>`` or ``<rev>:<path>``."""
+        sha = self.resolve(spec)
+        return self.read_object(sha) if sha else None
+
+    @staticmethod
+    def _tree_entry(data: bytes, name: bytes) -> Optional[str]:
+        """Object id of one entry of a tree object."""
+        pos = 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            if data[space + 1:nul] == name:
+                return data[nul + 1:nul + 21].hex()
+            pos = nul + 21
+        return None
+
+    def read_commit(self, rev: str) -> Optional[GitCommit]:
+        """Read and parse a commit (annotated tags are peeled)."""
+        sha = self.resolve(rev)
+        obj = self._peel(sha) if sha else None
+        if obj is None or obj.type != "commit":
+            return None
+        return parse_commit(obj.sha, obj.data)
+
+    def walk(self, rev: str = "HEAD", limit: int = None) -> Iterator[GitCommit]:
+        """Commits reachable from ``rev``, newest commit time first (like git log)."""
+        return walk_commits(self.read_commit, rev, limit)
+
+    def close(self) -> None:
+        """Unmap the packfiles."""
+        with self._lock:
+            for pack in self._packs:
+                pack.close()
+            self._packs, self._packs_mtime = [], None
+            self._cache.clear()
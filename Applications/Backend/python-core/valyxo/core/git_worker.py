@@ -0,0 +1,299 @@
+"""Valyxo Git Worker v0.6.0
+
+Long-lived ``git cat-file`` processes shared by the git integration.
+
+Spawning git costs a fork/exec plus repository discovery for every
+command. Object reads (commits for ``log``, blobs for ``show``) and
+revision lookups instead go to ``git cat-file --batch`` and
+``--batch-check`` processes that stay open per repository, so each query
+is one write and one read on a pipe.
+
+Pool:
+    ValyxoGitWorkerPool keeps one GitCatFile pair per repository root
+    (found by walking up to ``.git`` in Python, no git call), evicting the
+    least recently used repository beyond ``max_repos``. A worker whose
+    process died is restarted on the next query.
+"""
+
+import os
+import heapq
+import threading
+import subprocess
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Repositories with open cat-file processes
+MAX_REPOS = 8
+
+
+@dataclass
+class GitObject:
+    """An object read through cat-file."""
+    sha: str
+    type: str  # "commit", "tree", "blob" or "tag"
+    size: int
+    data: Optional[bytes] = None  # None for --batch-check lookups
+
+
+@dataclass
+class GitCommit:
+    """A parsed commit object."""
+    sha: str
+    tree: str
+    parents: List[str] = field(default_factory=list)
+    author: str = ""
+    author_time: int = 0
+    author_tz: str = "+0000"
+    committer: str = ""
+    commit_time: int = 0
+    message: str = ""
+
+    @property
+    def subject(self) -> str:
+        return self.message.split("\n", 1)[0]
+
+
+def _split_ident(value: str) -> Tuple[str, int, str]:
+    """Split "Name <email> 1700000000 +0100" into (ident, time, tz)."""
+    parts = value.rsplit(" ", 2)
+    if len(parts) == 3:
+        try:
+            return parts[0], int(parts[1]), parts[2]
+        except ValueError:
+            pass
+    return value, 0, "+0000"
+
+
+def parse_commit(sha: str, data: bytes) -> GitCommit:
+    """Parse the raw body of a commit object."""
+    text = data.decode("utf-8", errors="replace")
+    header, _, message = text.partition("\n\n")
+    commit = GitCommit(sha=sha, tree="", message=message.rstrip("\n"))
+    for line in header.split("\n"):
+        if line.startswith(" "):
+            continue  # continuation of a multi-line header (gpgsig, mergetag)
+        key, _, value = line.partition(" ")
+        if key == "tree":
+            commit.tree = value
+        elif key == "parent":
+            commit.parents.append(value)
+        elif key == "author":
+            commit.author, commit.author_time, commit.author_tz = _split_ident(value)
+        elif key == "committer":
+            commit.committer, commit.commit_time, _ = _split_ident(value)
+    return commit
+
+
+def walk_commits(read_commit: Callable[[str], Optional[GitCommit]], rev: str = "HEAD",
+                 limit: int = None) -> Iterator[GitCommit]:
+    """Commits reachable from ``rev``, newest commit time first (like git log).
+
+    Args:
+        read_commit: Reads and parses one commit by revision or object id
+        rev: Starting revision
+        limit: Most commits to yield
+    """
+    start = read_commit(rev)
+    if start is None:
+        return
+    seen = {start.sha}
+    order = 0
+    queue: List[Tuple[int, int, GitCommit]] = [(-start.commit_time, order, start)]
+    yielded = 0
+    while queue and (limit is None or yielded < limit):
+        _, _, commit = heapq.heappop(queue)
+        yield commit
+        yielded += 1
+        for parent_sha in commit.parents:
+            if parent_sha in seen:
+                continue
+            seen.add(parent_sha)
+            parent = read_commit(parent_sha)
+            if parent is not None:
+                order += 1
+                heapq.heappush(queue, (-parent.commit_time, order, parent))
+
+
+def find_repo_root(path: str) -> Optional[str]:
+    """Nearest directory at or above ``path`` containing ``.git``."""
+    path = os.path.abspath(path)
+    while True:
+        if os.path.exists(os.path.join(path, ".git")):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+class GitCatFile:
+    """One ``git cat-file --batch`` (or ``--batch-check``) process."""
+
+    def __init__(self, repo: str, check: bool = False):
+        """Create a worker (the process starts on first use).
+
+        Args:
+            repo: Repository working directory
+            check: Use --batch-check (type and size only, no contents)
+        """
+        self.repo = repo
+        self.check = check
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.starts = 0
+
+    def _start(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch-check" if self.check else "--batch"],
+                cwd=self.repo,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self.starts += 1
+        return self._proc
+
+    def query(self, spec: str) -> Optional[GitObject]:
+        """Look up an object or revision (anything rev-parse accepts).
+
+        Returns:
+            GitObject, or None if the object does not exist
+
+        Raises:
+            OSError: If git cannot be run or the process dies mid-query
+        """
+        if "\n" in spec:
+            return None
+        with self._lock:
+            for attempt in (0, 1):
+                proc = self._start()
+                try:
+                    proc.stdin.write(spec.encode("utf-8") + b"\n")
+                    proc.stdin.flush()
+                    header = proc.stdout.readline()
+                    if not header:
+                        raise BrokenPipeError("git cat-file exited")
+                    # "<spec> missing" echoes the spec, which may contain spaces
+                    if header.endswith((b" missing\n", b" ambiguous\n")):
+                        return None
+                    parts = header.rstrip(b"\n").rsplit(b" ", 2)
+                    if len(parts) != 3:
+                        raise ValueError(f"unexpected cat-file header {header!r}")
+                    sha, obj_type, size = parts[0].decode("ascii"), parts[1].decode("ascii"), int(parts[2])
+                    data = None
+                    if not self.check:
+                        data = proc.stdout.read(size + 1)[:size]
+                    self.queries += 1
+                    return GitObject(sha, obj_type, size, data)
+                except (BrokenPipeError, ValueError):
+                    self._kill()
+                    if attempt:
+                        raise OSError(f"git cat-file failed for {spec!r}")
+        return None
+
+    def _kill(self) -> None:
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=5)
+            except (OSError, subprocess.SubprocessError):
+                pass
+            self._proc = None
+
+    def close(self) -> None:
+        """Stop the process (it restarts on the next query)."""
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                try:
+                    self._proc.stdin.close()
+                    self._proc.wait(timeout=2)
+                except (OSError, subprocess.SubprocessError):
+                    pass
+            self._kill()
+
+
+class GitRepoWorker:
+    """The cat-file processes serving one repository."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.batch = GitCatFile(root)
+        self.batch_check = GitCatFile(root, check=True)
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """Full object id of a revision, or None."""
+        obj = self.batch_check.query(rev)
+        return obj.sha if obj else None
+
+    def info(self, spec: str) -> Optional[GitObject]:
+        """Type and size of an object, without reading it."""
+        return self.batch_check.query(spec)
+
+    def read(self, spec: str) -> Optional[GitObject]:
+        """Read an object's contents."""
+        return self.batch.query(spec)
+
+    def read_commit(self, rev: str) -> Optional[GitCommit]:
+        obj = self.batch.query(rev)
+        if obj is None or obj.type != "commit":
+            return None
+        return parse_commit(obj.sha, obj.data)
+
+    def walk(self, rev: str = "HEAD", limit: int = None) -> Iterator[GitCommit]:
+        """Commits reachable from ``rev``, newest commit time first (like git log)."""
+        return walk_commits(self.read_commit, rev, limit)
+
+    def close(self) -> None:
+        self.batch.close()
+        self.batch_check.close()
+
+
+class ValyxoGitWorkerPool:
+    """Per-repository cat-file workers, least recently used evicted."""
+
+    def __init__(self, max_repos: int = MAX_REPOS):
+        self.max_repos = max_repos
+        self._workers: "OrderedDict[str, GitRepoWorker]" = OrderedDict()
+        self._roots: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cwd: str) -> Optional[GitRepoWorker]:
+        """Worker for the repository containing ``cwd`` (None outside a repo)."""
+        cwd = os.path.abspath(cwd)
+        root = self._roots.get(cwd)
+        if root is None or not os.path.exists(os.path.join(root, ".git")):
+            root = self._roots[cwd] = find_repo_root(cwd)
+        if root is None:
+            return None
+        with self._lock:
+            worker = self._workers.get(root)
+            if worker is None:
+                worker = self._workers[root] = GitRepoWorker(root)
+                while len(self._workers) > self.max_repos:
+                    _, evicted = self._workers.popitem(last=False)
+                    evicted.close()
+            else:
+                self._workers.move_to_end(root)
+            return worker
+
+    def close(self) -> None:
+        """Stop every worker process."""
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool statistics."""
+        with self._lock:
+            workers = list(self._workers.values())
+        return {
+            "repos": len(workers),
+            "queries": sum(w.batch.queries + w.batch_check.queries for w in workers),
+            "processes_started": sum(w.batch.starts + w.batch_check.starts for w in workers),
+        }
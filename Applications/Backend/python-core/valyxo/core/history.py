@@ -0,0 +1,250 @@
+"""Valyxo Command History v0.6.0
+
+Persistent shell history with frecency-ranked completion.
+
+Storage:
+    HISTORY_PATH is an append-only log, one command per line:
+        <unix time>\\t<count>\\t<command>
+    New commands are buffered and appended in batches. When the log grows
+    well past the number of distinct commands it is compacted to one line
+    per command (written to a temporary file and swapped in atomically).
+
+In memory:
+    - a bounded ring of the most recent commands (``history`` listing)
+    - a prefix index of distinct commands with their use count and last
+      use time; completion binary-searches the prefix range and ranks it
+      by frecency (frequency weighted by recency). Commands are stored
+      case-sensitively; only the completion prefix ignores case
+"""
+
+import os
+import time
+import heapq
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+from .constants import HISTORY_PATH
+from .prefix_index import PrefixIndex
+
+
+# Recent commands kept for listing
+HISTORY_RING_SIZE = 1000
+
+# Distinct commands kept for completion; the least frecent are dropped
+MAX_UNIQUE_COMMANDS = 10_000
+
+# Buffered commands written per append, and the longest they may wait
+FLUSH_BATCH = 16
+FLUSH_INTERVAL = 5.0
+
+# Log lines per distinct command above which the log is compacted
+COMPACT_RATIO = 4
+
+# (max age in seconds, weight) buckets for recency
+_RECENCY_WEIGHTS = (
+    (3600, 4.0),
+    (86400, 2.0),
+    (7 * 86400, 1.0),
+    (30 * 86400, 0.5),
+)
+_OLD_WEIGHT = 0.25
+
+
+def frecency(count: int, last_used: float, now: float = None) -> float:
+    """Score a command by how often and how recently it was used."""
+    age = (now if now is not None else time.time()) - last_used
+    for max_age, weight in _RECENCY_WEIGHTS:
+        if age <= max_age:
+            return count * weight
+    return count * _OLD_WEIGHT
+
+
+def _parse_line(line: str) -> Optional[Tuple[float, int, str]]:
+    line = line.rstrip("\n")
+    if not line:
+        return None
+    parts = line.split("\t", 2)
+    if len(parts) == 3:
+        try:
+            return float(parts[0]), max(int(parts[1]), 1), parts[2]
+        except ValueError:
+            pass
+    return 0.0, 1, line  # plain line from an older history file
+
+
+class ValyxoHistory:
+    """Command history backed by an append-only file."""
+
+    def __init__(self, path: Optional[str] = HISTORY_PATH, ring_size: int = HISTORY_RING_SIZE,
+                 max_unique: int = MAX_UNIQUE_COMMANDS):
+        """Create a history.
+
+        Args:
+            path: History log (None keeps history in memory only)
+            ring_size: Recent commands kept for listing
+            max_unique: Distinct commands kept for completion
+        """
+        self.path = path
+        self.max_unique = max_unique
+        self.entries: Deque[str] = deque(maxlen=ring_size)
+        # command -> [count, last used]
+        self.index = PrefixIndex(fold=str.lower, exact_keys=True)
+        self.loaded = False
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        self._log_lines = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.entries))
+
+    # ─── persistence ─────────────────────────────────────────────────
+
+    def load(self) -> int:
+        """Read the history log (once).
+
+        Returns:
+            Number of log lines read
+        """
+        with self._lock:
+            if self.loaded or not self.path:
+                self.loaded = True
+                return 0
+            self.loaded = True
+            stats = {}
+            lines = 0
+            try:
+                with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        parsed = _parse_line(line)
+                        if parsed is None:
+                            continue
+                        lines += 1
+                        when, count, command = parsed
+                        stat = stats.get(command)
+                        if stat is None:
+                            stats[command] = [count, when]
+                        else:
+                            stat[0] += count
+                            stat[1] = max(stat[1], when)
+                        self.entries.append(command)
+            except OSError:
+                return 0
+
+            # Commands typed this session before load() stay on top
+            for key, value in self.index.items_with_prefix(""):
+                stat = stats.setdefault(key, [0, 0.0])
+                stat[0] += value[0]
+                stat[1] = max(stat[1], value[1])
+            self.index = PrefixIndex(stats.items(), fold=str.lower, exact_keys=True)
+            self._log_lines = lines
+            self._trim()
+            return lines
+
+    def flush(self) -> None:
+        """Append buffered commands to the log, compacting it if it has grown."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self.path or not self._pending:
+            self._pending = []
+            return
+        lines, self._pending = self._pending, []
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        except OSError:
+            return
+        self._log_lines += len(lines)
+        if self.loaded and self._log_lines > COMPACT_RATIO * max(len(self.index), 256):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the log as one line per distinct command."""
+        items = sorted(self.index.items_with_prefix(""), key=lambda item: item[1][1])
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for command, (count, when) in items:
+                    f.write(f"{when:.0f}\t{count}\t{command}\n")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            return
+        self._log_lines = len(items)
+
+    # ─── recording ───────────────────────────────────────────────────
+
+    def add(self, command: str, when: float = None) -> None:
+        """Record a command."""
+        command = command.strip()
+        if not command or "\n" in command:
+            return
+        when = when if when is not None else time.time()
+        with self._lock:
+            if not self.entries or self.entries[-1] != command:
+                self.entries.append(command)
+            stat = self.index.get(command)
+            if stat is None:
+                self.index.add(command, [1, when])
+                if len(self.index) > self.max_unique:
+                    self._trim()
+            else:
+                stat[0] += 1
+                stat[1] = when
+            self._pending.append(f"{when:.0f}\t1\t{command}\n")
+            if len(self._pending) >= FLUSH_BATCH or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+                self._flush_locked()
+
+    def _trim(self) -> None:
+        """Drop the least frecent commands once over the limit (by 10%)."""
+        if len(self.index) <= self.max_unique:
+            return
+        now = time.time()
+        keep = int(self.max_unique * 0.9)
+        items = self.index.items_with_prefix("")
+        best = heapq.nlargest(keep, items, key=lambda item: frecency(item[1][0], item[1][1], now))
+        self.index = PrefixIndex(best, fold=str.lower, exact_keys=True)
+
+    # ─── queries ─────────────────────────────────────────────────────
+
+    def recent(self, limit: int = None) -> List[str]:
+        """Most recent commands, oldest first."""
+        entries = list(self.entries)
+        return entries[-limit:] if limit else entries
+
+    def recent_unique(self) -> List[str]:
+        """Distinct recent commands, most recent first."""
+        with self._lock:
+            entries = list(self.entries)
+        return list(dict.fromkeys(reversed(entries)))
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Distinct commands starting with a prefix, best first.
+
+        The prefix range is found by binary search; only commands in it
+        are scored.
+
+        Returns:
+            List of (command, frecency score)
+        """
+        now = time.time()
+        with self._lock:
+            matches = self.index.items_with_prefix(prefix)
+            scored = [(frecency(count, when, now), when, command) for command, (count, when) in matches]
+        best = heapq.nlargest(limit, scored)
+        return [(command, score) for score, _, command in best]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get history statistics."""
+        return {
+            "recent": len(self.entries),
+            "unique": len(self.index),
+            "pending": len(self._pending),
+            "log_lines": self._log_lines,
+        }
@@ -1,7 +1,7 @@
 import os
 import time
 import threading
-from typing import Dict, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 
 
 class ValyxoJobsManager:
@@ -16,6 +16,8 @@ class ValyxoJobsManager:
         self.jobs: Dict[int, Dict[str, Any]] = {}
         self.job_counter: int = 0
         self.lock: threading.Lock = threading.Lock()
+        # Finished background jobs not yet reported at a prompt
+        self._finished: List[int] = []
 
     def create_job(self, filepath: str) -> int:
         """Create and register a new job.
@@ -34,10 +36,67 @@ class ValyxoJobsManager:
                 "status": "running",
                 "thread": None,
                 "start": time.time(),
-                "stop": False
+                "stop": False,
+                "progress": "",
+                "result": None,
+                "cancel": None,
             }
             return pid
 
+    def start_job(self, name: str, target: Callable[[int], str]) -> int:
+        """Run a function as a background job on a daemon thread.
+
+        The target receives the job PID and returns a result message. It
+        can report progress with update_progress, register a cancel
+        callback with set_cancel and poll should_stop. When it returns or
+        raises, the job is queued for pop_finished.
+
+        Args:
+            name: Command shown by ``jobs``
+            target: Function doing the work
+
+        Returns:
+            Job process ID (PID)
+        """
+        pid = self.create_job(name)
+
+        def run() -> None:
+            try:
+                result = target(pid)
+                status = "cancelled" if self.should_stop(pid) else "done"
+            except Exception as e:
+                result, status = f"✗ {e}", "failed"
+            with self.lock:
+                job = self.jobs[pid]
+                if status == "done" and str(result).startswith("✗"):
+                    status = "failed"
+                job.update(status=status, result=result, cancel=None, end=time.time())
+                self._finished.append(pid)
+
+        thread = threading.Thread(target=run, name=f"valyxo-job-{pid}", daemon=True)
+        with self.lock:
+            self.jobs[pid]["thread"] = thread
+        thread.start()
+        return pid
+
+    def update_progress(self, pid: int, progress: str) -> None:
+        """Set the progress text shown by ``jobs``."""
+        with self.lock:
+            if pid in self.jobs:
+                self.jobs[pid]["progress"] = progress
+
+    def set_cancel(self, pid: int, cancel: Optional[Callable[[], None]]) -> None:
+        """Register how to interrupt a running job (e.g. terminate its process)."""
+        with self.lock:
+            if pid in self.jobs:
+                self.jobs[pid]["cancel"] = cancel
+
+    def should_stop(self, pid: int) -> bool:
+        """Whether termination was requested for a job."""
+        with self.lock:
+            job = self.jobs.get(pid)
+            return bool(job and job["stop"])
+
     def update_status(self, pid: int, status: str) -> None:
         """Update job status.
         
@@ -63,9 +122,59 @@ class ValyxoJobsManager:
                 return False
             
             self.jobs[pid]["stop"] = True
-            self.jobs[pid]["status"] = "terminating"
+            if self.jobs[pid]["status"] == "running":
+                self.jobs[pid]["status"] = "terminating"
             return True
 
+    def kill_job(self, pid: int) -> bool:
+        """Stop a job and run its cancel callback.
+
+        Args:
+            pid: Job process ID
+
+        Returns:
+            True if the job was running
+        """
+        with self.lock:
+            job = self.jobs.get(pid)
+            if job is None or job["status"] not in ("running", "terminating"):
+                return False
+            cancel = job.get("cancel")
+        self.stop_job(pid)
+        if cancel is not None:
+            cancel()
+        return True
+
+    def get_jobs(self) -> List[Dict[str, Any]]:
+        """Snapshot of all jobs for display, oldest first."""
+        now = time.time()
+        with self.lock:
+            return [
+                {
+                    "pid": pid,
+                    "cmd": info["path"],
+                    "status": info["status"],
+                    "progress": info.get("progress", ""),
+                    "elapsed": int(info.get("end", now) - info["start"]),
+                }
+                for pid, info in sorted(self.jobs.items())
+            ]
+
+    def pop_finished(self) -> List[Dict[str, Any]]:
+        """Background jobs that finished since the last call.
+
+        Reported jobs are removed from the job list.
+
+        Returns:
+            List of dicts with pid, cmd, status and result
+        """
+        with self.lock:
+            finished, self._finished = self._finished, []
+            return [
+                {"pid": pid, "cmd": job["path"], "status": job["status"], "result": job["result"]}
+                for pid, job in ((pid, self.jobs.pop(pid)) for pid in finished)
+            ]
+
     def get_job(self, pid: int) -> Optional[Dict[str, Any]]:
         """Get job information.
         
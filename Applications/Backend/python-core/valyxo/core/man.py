@@ -1,8 +1,9 @@
 import os
 import shutil
-from typing import Dict
+from typing import Dict, Optional
 from .constants import MAN_DIR
 from .utils import prompt
+from .watcher import ValyxoFileWatcher, WatchedCache
 
 
 class ValyxoManSystem:
@@ -14,6 +15,49 @@ class ValyxoManSystem:
     def __init__(self) -> None:
         """Initialize manual system with default pages."""
         self.pages: Dict[str, Dict[str, str]] = self._default_pages()
+        self._page_files = WatchedCache(self._read_page_files)
+
+    def attach_watcher(self, watcher: ValyxoFileWatcher) -> None:
+        """Re-read manual pages only when the man directory changes."""
+        self._page_files.attach(watcher, MAN_DIR)
+
+    @staticmethod
+    def _read_page_files() -> Dict[str, str]:
+        """Read every .man file in the man directory, keyed by lowercase name."""
+        pages = {}
+        try:
+            filenames = os.listdir(MAN_DIR)
+        except OSError:
+            return pages
+        for filename in filenames:
+            if not filename.endswith(".man"):
+                continue
+            try:
+                with open(os.path.join(MAN_DIR, filename), "r", encoding="utf-8") as f:
+                    pages[filename[:-4].lower()] = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+        return pages
+
+    def get_page(self, name: str) -> Optional[str]:
+        """Get a manual page.
+
+        Pages on disk take precedence over the built-in defaults.
+
+        Args:
+            name: Command or topic name (case-insensitive)
+
+        Returns:
+            Formatted page text, or None if there is no such page
+        """
+        key = name.strip().lower()
+        page = self._page_files.get().get(key)
+        if page is not None:
+            return page
+        for page_name, content in self.pages.items():
+            if page_name.lower() == key:
+                return self._format_manpage(content)
+        return None
 
     @staticmethod
     def _default_pages() -> Dict[str, Dict[str, str]]:
@@ -15,6 +15,7 @@ import shutil
 import urllib.request
 from typing import Dict, List, Optional, Any
 from .constants import ROOT_DIR, CONFIG_DIR
+from .watcher import ValyxoFileWatcher, WatchedCache
 
 
 PACKAGES_DIR = os.path.join(ROOT_DIR, "packages")
@@ -86,9 +87,31 @@ class ValyxoPackageManager:
     
     def __init__(self):
         self.installed: Dict[str, Dict[str, Any]] = {}
+        self._local_manifests = WatchedCache(self._read_local_manifests)
         os.makedirs(PACKAGES_DIR, exist_ok=True)
         self._load_registry()
     
+    def attach_watcher(self, watcher: ValyxoFileWatcher) -> None:
+        """Re-scan local packages only when the packages directory changes."""
+        self._local_manifests.attach(watcher, PACKAGES_DIR, recursive=True)
+    
+    @staticmethod
+    def _read_local_manifests() -> Dict[str, Dict[str, Any]]:
+        """Read the manifest of every local (non built-in) package."""
+        manifests = {}
+        if not os.path.exists(PACKAGES_DIR):
+            return manifests
+        for item in sorted(os.listdir(PACKAGES_DIR)):
+            if item not in BUILTIN_PACKAGES:
+                manifest_path = os.path.join(PACKAGES_DIR, item, "package.json")
+                if os.path.isfile(manifest_path):
+                    try:
+                        with open(manifest_path, 'r', encoding='utf-8') as f:
+                            manifests[item] = json.load(f)
+                    except:
+                        pass
+        return manifests
+    
     def _load_registry(self) -> None:
         """Load installed packages registry."""
         if os.path.exists(PACKAGES_REGISTRY):
@@ -199,25 +222,14 @@ class ValyxoPackageManager:
             })
         
         # Add local packages
-        if os.path.exists(PACKAGES_DIR):
-            for item in os.listdir(PACKAGES_DIR):
-                if item not in BUILTIN_PACKAGES:
-                    pkg_path = os.path.join(PACKAGES_DIR, item)
-                    if os.path.isdir(pkg_path):
-                        manifest_path = os.path.join(pkg_path, "package.json")
-                        if os.path.exists(manifest_path):
-                            try:
-                                with open(manifest_path, 'r', encoding='utf-8') as f:
-                                    manifest = json.load(f)
-                                available.append({
-                                    "name": item,
-                                    "version": manifest.get("version", "1.0.0"),
-                                    "description": manifest.get("description", ""),
-                                    "installed": item in self.installed,
-                                    "builtin": False
-                                })
-                            except:
-                                pass
+        for item, manifest in self._local_manifests.get().items():
+            available.append({
+                "name": item,
+                "version": manifest.get("version", "1.0.0"),
+                "description": manifest.get("description", ""),
+                "installed": item in self.installed,
+                "builtin": False
+            })
         
         return available
     
@@ -0,0 +1,275 @@
+"""Valyxo Plugin Host v0.6.0
+
+Runs plugins whose manifest sets ``"isolated": true`` in worker processes,
+so a slow or CPU-heavy command neither blocks the shell nor shares its GIL.
+
+Protocol:
+    One JSON object per line on a worker's stdin and stdout:
+        -> {"id": 1, "plugin": "sky", "command": "weather", "args": "today"}
+        <- {"id": 1, "ok": true, "output": "...", "result": "..."}
+    Whatever the plugin prints is captured and returned as "output"; the
+    worker's real stdout carries nothing but responses.
+
+Pool:
+    At most ``max_workers`` processes, started on demand. Each runs one
+    command at a time and imports a plugin at most once. A call waits for
+    a free worker, and the whole call is bounded by its timeout. A worker
+    that dies mid-call or exceeds the timeout is killed and replaced by a
+    fresh one on a later call.
+"""
+
+import io
+import os
+import sys
+import json
+import queue
+import time
+import threading
+import contextlib
+import subprocess
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Worker processes running isolated plugins
+PLUGIN_WORKERS = 2
+
+# Seconds a command may take, including the wait for a free worker
+PLUGIN_TIMEOUT = 60.0
+
+# Seconds between cancellation checks while waiting for a free worker
+STOP_POLL = 0.1
+
+# Directory containing the ``valyxo`` package, put on the workers' path
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class PluginHostError(Exception):
+    """An isolated command failed, timed out or lost its worker."""
+
+
+class _PluginWorker:
+    """One worker process and the thread reading its responses."""
+
+    def __init__(self, plugins_dir: str):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (_PACKAGE_ROOT, env.get("PYTHONPATH")) if p)
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "valyxo.core.plugin_host", plugins_dir],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            text=True,
+            encoding="utf-8",
+        )
+        self.responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=self._read, name="valyxo-plugin-reader", daemon=True).start()
+
+    def _read(self) -> None:
+        for line in self.proc.stdout:
+            self.responses.put(line)
+        self.responses.put(None)  # the process exited
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        try:
+            self.proc.stdin.write(json.dumps(message) + "\n")
+            self.proc.stdin.flush()
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def kill(self) -> None:
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+
+class ValyxoPluginHost:
+    """Pool of worker processes executing isolated plugin commands."""
+
+    def __init__(self, plugins_dir: str, max_workers: int = PLUGIN_WORKERS,
+                 timeout: float = PLUGIN_TIMEOUT):
+        """Create a host (workers start on the first call).
+
+        Args:
+            plugins_dir: Directory holding the plugins
+            max_workers: Most commands running at once
+            timeout: Default seconds per command
+        """
+        self.plugins_dir = plugins_dir
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._idle: List[_PluginWorker] = []
+        self._count = 0  # live workers, idle or busy
+        self._cond = threading.Condition()
+        self._next_id = 0
+        self._closed = False
+        self.stats = {"calls": 0, "started": 0, "crashes": 0, "timeouts": 0}
+
+    def _acquire(self, deadline: float, should_stop: Callable[[], bool] = None) -> _PluginWorker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PluginHostError("plugin host is closed")
+                if should_stop and should_stop():
+                    raise PluginHostError("cancelled while waiting for a plugin worker")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        return worker
+                    self._count -= 1
+                    self.stats["crashes"] += 1
+                if self._count < self.max_workers:
+                    self._count += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    raise PluginHostError(f"all {self.max_workers} plugin workers are busy")
+                self._cond.wait(min(remaining, STOP_POLL) if should_stop else remaining)
+        try:
+            worker = _PluginWorker(self.plugins_dir)
+        except OSError as e:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise PluginHostError(f"cannot start plugin worker: {e}")
+        with self._cond:
+            self.stats["started"] += 1
+        return worker
+
+    def _release(self, worker: _PluginWorker, reuse: bool) -> None:
+        with self._cond:
+            reuse = reuse and not self._closed and worker.alive()
+            if reuse:
+                self._idle.append(worker)
+            else:
+                self._count -= 1
+            self._cond.notify()
+        if not reuse:
+            worker.kill()
+
+    def call(self, plugin: str, command: str, args: str = "", timeout: float = None,
+             on_start: Callable[[Callable[[], None]], None] = None,
+             should_stop: Callable[[], bool] = None) -> str:
+        """Run a plugin command in a worker process.
+
+        Args:
+            plugin: Plugin name (its directory under ``plugins_dir``)
+            command: Command registered by the plugin
+            args: Argument string passed to the handler
+            timeout: Seconds before giving up (default: the host's timeout)
+            on_start: Receives a function that kills the worker, for
+                cancelling the call
+            should_stop: Polled until the request is sent; when it returns
+                True the call is abandoned without running the command
+
+        Returns:
+            The command's printed output followed by its return value
+
+        Raises:
+            PluginHostError: If the command raised, timed out or its worker died
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        worker = self._acquire(deadline, should_stop)
+        with self._cond:
+            self._next_id += 1
+            request_id = self._next_id
+            self.stats["calls"] += 1
+        if on_start:
+            on_start(worker.kill)
+
+        reuse = False
+        try:
+            if should_stop and should_stop():
+                reuse = True  # the worker is idle, nothing was sent
+                raise PluginHostError(f"{command} cancelled")
+            if not worker.send({"id": request_id, "plugin": plugin, "command": command, "args": args}):
+                self.stats["crashes"] += 1
+                raise PluginHostError(f"plugin worker for {plugin} exited")
+            try:
+                line = worker.responses.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.stats["timeouts"] += 1
+                raise PluginHostError(f"{command} timed out after {timeout:g}s")
+            if line is None:
+                self.stats["crashes"] += 1
+                raise PluginHostError(f"plugin worker for {plugin} crashed running {command}")
+            try:
+                response = json.loads(line)
+            except ValueError:
+                raise PluginHostError(f"invalid response from plugin worker: {line.strip()[:80]}")
+            reuse = True
+        finally:
+            self._release(worker, reuse)
+
+        if not response.get("ok"):
+            raise PluginHostError(response.get("error") or f"{command} failed")
+        parts = [response.get("output", "").rstrip("\n")]
+        if response.get("result") is not None:
+            parts.append(response["result"])
+        return "\n".join(part for part in parts if part)
+
+    def close(self) -> None:
+        """Stop every worker; running calls fail."""
+        with self._cond:
+            self._closed = True
+            workers, self._idle = self._idle, []
+            self._count -= len(workers)
+            self._cond.notify_all()
+        for worker in workers:
+            worker.kill()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get host statistics."""
+        with self._cond:
+            return dict(self.stats, workers=self._count, idle=len(self._idle))
+
+
+def _serve(plugins_dir: str) -> None:
+    """Worker loop: answer requests from stdin until it closes."""
+    from .plugins import _instantiate_plugin
+
+    channel, requests = sys.stdout, sys.stdin
+    sys.stdout = sys.stderr  # stray prints must not corrupt the protocol
+    sys.stdin = open(os.devnull, "r")  # input() in a handler must not read requests
+    plugins = {}
+    for line in requests:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        name = str(request.get("plugin", ""))
+        command = request.get("command")
+        response = {"id": request.get("id")}
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                plugin = plugins.get(name)
+                if plugin is None:
+                    plugin_dir = os.path.join(plugins_dir, name)
+                    if not name or os.path.dirname(os.path.normpath(plugin_dir)) != os.path.normpath(plugins_dir):
+                        raise ValueError(f"invalid plugin name: {name!r}")
+                    with open(os.path.join(plugin_dir, "plugin.json"), "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    plugin = plugins[name] = _instantiate_plugin(name, plugin_dir, manifest)
+                info = plugin.commands.get(command)
+                if not info:
+                    raise ValueError(f"Plugin {name} does not provide command: {command}")
+                result = info["handler"](request.get("args", ""))
+            response.update(ok=True, result=None if result is None else str(result))
+        except Exception as e:
+            response.update(ok=False, error=f"{type(e).__name__}: {e}")
+        response["output"] = output.getvalue()
+        channel.write(json.dumps(response) + "\n")
+        channel.flush()
+
+
+if __name__ == "__main__":
+    _serve(sys.argv[1])
@@ -7,17 +7,39 @@ Plugin structure:
         my_plugin/
             plugin.json     # Plugin manifest
             main.py         # Plugin entry point
+
+Lazy loading:
+    A manifest lists the plugin's commands up front:
+
+        "commands": {"weather": "Show the forecast"}
+
+    ``discover()`` registers those commands without running ``main.py``;
+    the module is imported the first time one of them is executed.
+    Parsed manifests are cached in System/plugins.json, keyed by the
+    mtime and size of each plugin.json, so startup only stats them.
+
+Isolation:
+    A manifest with ``"isolated": true`` never runs in the shell process.
+    Its commands are executed by worker processes of a ValyxoPluginHost
+    (see plugin_host.py), and such plugins must declare their commands.
 """
 
 import os
 import json
+import threading
 import importlib.util
-from typing import Dict, List, Optional, Callable, Any
-from .constants import ROOT_DIR
+from typing import Dict, List, Optional, Callable, Any, Set
+from .constants import ROOT_DIR, SYSTEM_DIR
+from .watcher import ValyxoFileWatcher, WatchedCache
+from .plugin_host import ValyxoPluginHost, PluginHostError
 
 
 PLUGINS_DIR = os.path.join(ROOT_DIR, "plugins")
 
+# Cached manifests (keyed by plugin.json mtime and size) and disabled plugins
+PLUGIN_STATE_PATH = os.path.join(SYSTEM_DIR, "plugins.json")
+PLUGIN_STATE_VERSION = 1
+
 
 class ValyxoPlugin:
     """Base class for Valyxo plugins."""
@@ -45,90 +67,267 @@ class ValyxoPlugin:
         pass
 
 
+def _instantiate_plugin(name: str, plugin_dir: str, manifest: Dict[str, Any]) -> ValyxoPlugin:
+    """Import a plugin's ``main.py`` and return its loaded plugin object.
+    
+    Raises:
+        Exception: Whatever importing or ``on_load`` raised
+    """
+    main_path = os.path.join(plugin_dir, "main.py")
+    spec = importlib.util.spec_from_file_location(f"valyxo_plugin_{name}", main_path)
+    if not spec or not spec.loader:
+        raise ImportError(f"Failed to load plugin module: {name}")
+    
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    
+    # Get plugin class
+    if hasattr(module, 'Plugin'):
+        plugin_instance = module.Plugin()
+    elif hasattr(module, 'plugin'):
+        plugin_instance = module.plugin
+    else:
+        # Create basic plugin from manifest
+        plugin_instance = ValyxoPlugin(
+            name=manifest.get('name', name),
+            version=manifest.get('version', '1.0.0'),
+            description=manifest.get('description', '')
+        )
+    
+    # Register commands
+    if hasattr(module, 'commands'):
+        for cmd_name, cmd_info in module.commands.items():
+            plugin_instance.register_command(cmd_name, cmd_info['handler'], cmd_info.get('help', ''))
+    
+    plugin_instance.on_load()
+    return plugin_instance
+
+
+def _declared_commands(manifest: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Commands a manifest declares as {name: help}, or None if it declares none.
+    
+    ``commands`` may map command names to help text or list the names.
+    """
+    commands = manifest.get("commands")
+    if isinstance(commands, dict):
+        return {str(k): v if isinstance(v, str) else "" for k, v in commands.items()}
+    if isinstance(commands, list):
+        return {str(k): "" for k in commands}
+    return None
+
+
 class ValyxoPluginManager:
     """Manages plugin lifecycle: loading, unloading, and execution."""
     
-    def __init__(self):
+    def __init__(self, plugins_dir: str = PLUGINS_DIR, state_path: str = PLUGIN_STATE_PATH):
+        self.plugins_dir = plugins_dir
+        self.state_path = state_path
         self.plugins: Dict[str, ValyxoPlugin] = {}
         self.plugin_commands: Dict[str, str] = {}  # command -> plugin_name
-        os.makedirs(PLUGINS_DIR, exist_ok=True)
+        self.disabled: Set[str] = set()
+        self.errors: Dict[str, str] = {}  # plugin -> why it failed to load
+        self._declared: Dict[str, Dict[str, str]] = {}  # plugin -> registered manifest commands
+        self._index: Dict[str, Dict[str, Any]] = {}  # plugin -> {"stat": [...], "manifest": ...}
+        self._state_loaded = False
+        self._command_listeners: List[Callable[[str, Optional[str]], None]] = []
+        self._manifests = WatchedCache(self._read_manifests)
+        self.stats = {"manifests_parsed": 0, "imports": 0}
+        self.host: Optional[ValyxoPluginHost] = None  # started on the first isolated command
+        self._host_lock = threading.Lock()
+        os.makedirs(self.plugins_dir, exist_ok=True)
+    
+    def attach_watcher(self, watcher: ValyxoFileWatcher) -> None:
+        """Re-read plugin manifests only when the plugins directory changes."""
+        self._manifests.attach(watcher, self.plugins_dir, recursive=True, ignore={"__pycache__"})
+    
+    def _load_state(self) -> None:
+        if self._state_loaded:
+            return
+        self._state_loaded = True
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != PLUGIN_STATE_VERSION:
+            return
+        self.disabled = set(data.get("disabled", []))
+        self._index = data.get("manifests", {})
+    
+    def _save_state(self) -> None:
+        """Write the manifest index and disabled plugins atomically."""
+        data = {
+            "version": PLUGIN_STATE_VERSION,
+            "disabled": sorted(self.disabled),
+            "manifests": self._index,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            pass
+    
+    def _read_manifests(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Every plugin manifest (None for unreadable ones).
+        
+        Only manifests whose size or mtime changed since they were last
+        cached are parsed again.
+        """
+        self._load_state()
+        try:
+            items = sorted(os.listdir(self.plugins_dir))
+        except OSError:
+            items = []
+        
+        manifests = {}
+        index = {}
+        for item in items:
+            manifest_path = os.path.join(self.plugins_dir, item, "plugin.json")
+            try:
+                stat = os.stat(manifest_path)
+            except OSError:
+                continue
+            key = [stat.st_mtime_ns, stat.st_size]
+            entry = self._index.get(item)
+            if entry is None or entry.get("stat") != key:
+                try:
+                    with open(manifest_path, 'r', encoding='utf-8') as f:
+                        manifest = json.load(f)
+                    if not isinstance(manifest, dict):
+                        manifest = None
+                except (OSError, ValueError):
+                    manifest = None
+                self.stats["manifests_parsed"] += 1
+                entry = {"stat": key, "manifest": manifest}
+            index[item] = entry
+            manifests[item] = entry["manifest"]
+        
+        if index != self._index:
+            self._index = index
+            self._save_state()
+        return manifests
+    
+    def add_command_listener(self, listener: Callable[[str, Optional[str]], None]) -> None:
+        """Be told when plugin commands come and go.
+        
+        The listener is called as ``listener(command, help_text)`` when a
+        command is registered and ``listener(command, None)`` when it is
+        removed.
+        """
+        self._command_listeners.append(listener)
+    
+    def remove_command_listener(self, listener: Callable[[str, Optional[str]], None]) -> None:
+        """Stop notifying a command listener."""
+        if listener in self._command_listeners:
+            self._command_listeners.remove(listener)
+    
+    def _notify_command(self, command: str, help_text: Optional[str]) -> None:
+        for listener in list(self._command_listeners):
+            try:
+                listener(command, help_text)
+            except Exception:
+                pass
+    
+    def _drop_commands(self, name: str) -> None:
+        """Unregister the manifest commands of a plugin."""
+        for cmd_name in self._declared.pop(name, {}):
+            if self.plugin_commands.get(cmd_name) == name:
+                del self.plugin_commands[cmd_name]
+                self._notify_command(cmd_name, None)
+    
+    def discover(self) -> List[str]:
+        """Register the commands of every enabled plugin without importing it.
+        
+        Commands come from the manifest's ``commands`` entry; the plugin
+        module is imported the first time one of them runs. Plugins whose
+        manifest declares no commands are imported here, since their
+        commands are unknown until the module runs.
+        
+        Returns:
+            Names of the installed plugins
+        """
+        manifests = self._manifests.get()
+        for name in list(self._declared):
+            if name not in manifests or name in self.disabled:
+                self._drop_commands(name)
+        
+        for name, manifest in manifests.items():
+            if manifest is None or name in self.disabled or name in self.plugins:
+                continue
+            commands = _declared_commands(manifest)
+            if commands is None and manifest.get("isolated") is True:
+                self.errors[name] = f"Isolated plugin {name} must declare its commands"
+            elif commands is None:
+                if name not in self.errors:
+                    error = self.load_plugin(name)
+                    if error:
+                        self.errors[name] = error
+            elif commands != self._declared.get(name):
+                self._drop_commands(name)
+                self._declared[name] = commands
+                for cmd_name, help_text in commands.items():
+                    if self.plugin_commands.setdefault(cmd_name, name) == name:
+                        self._notify_command(cmd_name, help_text)
+        return list(manifests)
     
     def discover_plugins(self) -> List[str]:
         """Discover available plugins in the plugins directory."""
-        if not os.path.exists(PLUGINS_DIR):
-            return []
-        
-        plugins = []
-        for item in os.listdir(PLUGINS_DIR):
-            plugin_dir = os.path.join(PLUGINS_DIR, item)
-            manifest_path = os.path.join(plugin_dir, "plugin.json")
-            if os.path.isdir(plugin_dir) and os.path.exists(manifest_path):
-                plugins.append(item)
-        return plugins
+        return list(self._manifests.get())
     
     def load_plugin(self, name: str) -> Optional[str]:
-        """Load a plugin by name.
+        """Import a plugin's module and register its commands.
         
         Returns:
             Error message if failed, None if successful
         """
-        plugin_dir = os.path.join(PLUGINS_DIR, name)
+        if name in self.plugins:
+            return None
+        
+        plugin_dir = os.path.join(self.plugins_dir, name)
         manifest_path = os.path.join(plugin_dir, "plugin.json")
         main_path = os.path.join(plugin_dir, "main.py")
         
-        if not os.path.exists(manifest_path):
+        manifests = self._manifests.get()
+        if name not in manifests:
             return f"Plugin manifest not found: {manifest_path}"
+        manifest = manifests[name]
+        if manifest is None:
+            return f"Invalid plugin manifest: {manifest_path}"
         
         if not os.path.exists(main_path):
             return f"Plugin entry point not found: {main_path}"
         
+        if manifest.get("isolated") is True:
+            return f"Plugin {name} is isolated and runs in the plugin host"
+        
         try:
-            # Load manifest
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                manifest = json.load(f)
-            
-            # Load plugin module
-            spec = importlib.util.spec_from_file_location(f"valyxo_plugin_{name}", main_path)
-            if not spec or not spec.loader:
-                return f"Failed to load plugin module: {name}"
-            
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            # Get plugin class
-            if hasattr(module, 'Plugin'):
-                plugin_instance = module.Plugin()
-            elif hasattr(module, 'plugin'):
-                plugin_instance = module.plugin
-            else:
-                # Create basic plugin from manifest
-                plugin_instance = ValyxoPlugin(
-                    name=manifest.get('name', name),
-                    version=manifest.get('version', '1.0.0'),
-                    description=manifest.get('description', '')
-                )
-            
-            # Register commands
-            if hasattr(module, 'commands'):
-                for cmd_name, cmd_info in module.commands.items():
-                    plugin_instance.register_command(cmd_name, cmd_info['handler'], cmd_info.get('help', ''))
-            
-            plugin_instance.on_load()
+            plugin_instance = _instantiate_plugin(name, plugin_dir, manifest)
+            self.stats["imports"] += 1
             self.plugins[name] = plugin_instance
+            self.errors.pop(name, None)
             
             # Register all plugin commands
-            for cmd_name in plugin_instance.commands:
+            declared = self._declared.get(name, {})
+            for cmd_name, cmd_info in plugin_instance.commands.items():
+                if cmd_name in declared and self.plugin_commands.get(cmd_name) == name:
+                    continue
                 self.plugin_commands[cmd_name] = name
+                self._notify_command(cmd_name, cmd_info.get('help', '') if isinstance(cmd_info, dict) else '')
             
             return None
             
-        except json.JSONDecodeError as e:
-            return f"Invalid plugin manifest: {e}"
         except Exception as e:
             return f"Failed to load plugin: {e}"
     
     def unload_plugin(self, name: str) -> Optional[str]:
-        """Unload a plugin by name."""
+        """Unload a plugin by name.
+        
+        Commands declared in its manifest stay registered and import the
+        plugin again when run.
+        """
         if name not in self.plugins:
             return f"Plugin not loaded: {name}"
         
@@ -137,69 +336,157 @@ class ValyxoPluginManager:
             plugin.on_unload()
             
             # Unregister commands
+            declared = self._declared.get(name, {})
             for cmd_name in plugin.commands:
-                if cmd_name in self.plugin_commands:
+                if self.plugin_commands.get(cmd_name) == name and cmd_name not in declared:
                     del self.plugin_commands[cmd_name]
+                    self._notify_command(cmd_name, None)
             
             del self.plugins[name]
             return None
         except Exception as e:
             return f"Failed to unload plugin: {e}"
     
+    def enable_plugin(self, name: str) -> str:
+        """Enable a plugin and register its commands."""
+        if name not in self._manifests.get():
+            return f"✗ Plugin not installed: {name}"
+        self.disabled.discard(name)
+        self.errors.pop(name, None)
+        self._save_state()
+        self.discover()
+        return f"✓ Enabled plugin: {name}"
+    
+    def disable_plugin(self, name: str) -> str:
+        """Disable a plugin: unload it and unregister its commands."""
+        if name not in self._manifests.get():
+            return f"✗ Plugin not installed: {name}"
+        if name in self.plugins:
+            error = self.unload_plugin(name)
+            if error:
+                return f"✗ {error}"
+        self._drop_commands(name)
+        self.disabled.add(name)
+        self._save_state()
+        return f"✓ Disabled plugin: {name}"
+    
     def get_plugin(self, name: str) -> Optional[ValyxoPlugin]:
         """Get a loaded plugin by name."""
         return self.plugins.get(name)
     
     def execute_command(self, command: str, args: str) -> Optional[Any]:
-        """Execute a plugin command.
+        """Execute a plugin command, importing its plugin on first use.
         
         Returns:
-            Command result or None if command not found
+            Command result, an error message if the plugin cannot provide
+            the command, or None if command not found
         """
         if command not in self.plugin_commands:
             return None
         
         plugin_name = self.plugin_commands[command]
-        plugin = self.plugins.get(plugin_name)
+        if self.is_isolated(plugin_name):
+            return self.run_isolated(command, args)
+        if plugin_name not in self.plugins:
+            error = self.load_plugin(plugin_name)
+            if error:
+                return f"✗ {error}"
+        plugin = self.plugins[plugin_name]
         
-        if not plugin or command not in plugin.commands:
-            return None
+        if command not in plugin.commands:
+            return f"✗ Plugin {plugin_name} does not provide command: {command}"
         
         handler = plugin.commands[command]['handler']
         return handler(args)
     
+    def is_isolated(self, name: str) -> bool:
+        """Whether a plugin's manifest asks for it to run in the plugin host."""
+        manifest = self._manifests.get().get(name)
+        return isinstance(manifest, dict) and manifest.get("isolated") is True
+    
+    def is_isolated_command(self, command: str) -> bool:
+        """Whether a command belongs to an isolated plugin."""
+        name = self.plugin_commands.get(command)
+        return name is not None and self.is_isolated(name)
+    
+    def run_isolated(self, command: str, args: str,
+                     on_start: Callable[[Callable[[], None]], None] = None,
+                     should_stop: Callable[[], bool] = None) -> str:
+        """Execute a command of an isolated plugin in a worker process.
+        
+        Args:
+            command: Plugin command
+            args: Argument string
+            on_start: Receives a function that cancels the call
+            should_stop: Whether the call was cancelled before it started
+        
+        Returns:
+            Command output, or an error message
+        """
+        name = self.plugin_commands.get(command)
+        if name is None:
+            return f"✗ Unknown plugin command: {command}"
+        with self._host_lock:
+            if self.host is None:
+                self.host = ValyxoPluginHost(self.plugins_dir)
+            host = self.host
+        try:
+            return host.call(name, command, args, on_start=on_start, should_stop=should_stop)
+        except PluginHostError as e:
+            return f"✗ {e}"
+    
+    def close(self) -> None:
+        """Stop the plugin host's worker processes."""
+        with self._host_lock:
+            host, self.host = self.host, None
+        if host is not None:
+            host.close()
+    
+    def has_command(self, command: str) -> bool:
+        """Check if a command is provided by a plugin (picking up new plugins)."""
+        if command not in self.plugin_commands:
+            self.discover()
+        return command in self.plugin_commands
+    
     def is_plugin_command(self, command: str) -> bool:
         """Check if a command is provided by a plugin."""
         return command in self.plugin_commands
     
     def list_plugins(self) -> List[Dict[str, Any]]:
-        """List all loaded plugins with their info."""
-        return [
-            {
+        """List all installed plugins with their info (loaded or not)."""
+        result = []
+        for name, manifest in self._manifests.get().items():
+            plugin = self.plugins.get(name)
+            if plugin is not None:
+                version, description = plugin.version, plugin.description
+                commands = list(plugin.commands.keys())
+            else:
+                manifest = manifest or {}
+                version = manifest.get("version", "unknown")
+                description = manifest.get("description", "")
+                commands = list(_declared_commands(manifest) or {})
+            result.append({
                 "name": name,
-                "version": plugin.version,
-                "description": plugin.description,
-                "enabled": plugin.enabled,
-                "commands": list(plugin.commands.keys())
-            }
-            for name, plugin in self.plugins.items()
-        ]
+                "version": version,
+                "description": description,
+                "enabled": name not in self.disabled,
+                "loaded": plugin is not None,
+                "commands": commands
+            })
+        return result
     
     def list_available(self) -> List[Dict[str, str]]:
         """List all available plugins (installed but not necessarily loaded)."""
         available = []
-        for name in self.discover_plugins():
-            manifest_path = os.path.join(PLUGINS_DIR, name, "plugin.json")
-            try:
-                with open(manifest_path, 'r', encoding='utf-8') as f:
-                    manifest = json.load(f)
+        for name, manifest in self._manifests.get().items():
+            if isinstance(manifest, dict):
                 available.append({
                     "name": name,
                     "version": manifest.get("version", "unknown"),
                     "description": manifest.get("description", ""),
                     "loaded": name in self.plugins
                 })
-            except:
+            else:
                 available.append({
                     "name": name,
                     "version": "unknown",
@@ -207,6 +494,17 @@ class ValyxoPluginManager:
                     "loaded": name in self.plugins
                 })
         return available
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get plugin statistics."""
+        return {
+            "installed": len(self._index),
+            "loaded": len(self.plugins),
+            "commands": len(self.plugin_commands),
+            "manifests_parsed": self.stats["manifests_parsed"],
+            "imports": self.stats["imports"],
+            "host": self.host.get_stats() if self.host else {},
+        }
 
 
 def create_plugin_template(name: str) -> str:
@@ -229,7 +527,10 @@ def create_plugin_template(name: str) -> str:
             "version": "1.0.0",
             "description": f"A Valyxo plugin: {name}",
             "author": "",
-            "valyxo_version": ">=0.6.0"
+            "valyxo_version": ">=0.6.0",
+            "commands": {
+                f"{name.lower()}_hello": f"Say hello from {name}"
+            }
         }
         
         with open(os.path.join(plugin_dir, "plugin.json"), 'w', encoding='utf-8') as f:
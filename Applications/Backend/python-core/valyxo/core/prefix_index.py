@@ -0,0 +1,134 @@
+"""Valyxo Prefix Index v0.6.0
+
+Sorted-array prefix index used by auto-complete.
+
+Keys are kept in one sorted list, so a prefix query is a binary search
+for the first match followed by a walk over the k results it returns:
+O(log n + k), with no per-keystroke scan of every key. Inserts and
+removals are O(n) list moves, which is cheap for the few hundred to few
+thousand keys completion deals with and much faster than a trie of
+Python objects in practice.
+"""
+
+import bisect
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+# Sorts after every other character, so prefix + _MAX_CHAR bounds a prefix range
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class PrefixIndex:
+    """Mapping from string keys to values with fast prefix queries."""
+
+    def __init__(self, items: Iterable[Tuple[str, Any]] = None, fold: Callable[[str], str] = None,
+                 exact_keys: bool = False):
+        """Create an index.
+
+        Args:
+            items: Initial (key, value) pairs
+            fold: Normalizes keys and queries (e.g. ``str.lower`` for
+                case-insensitive matching); keys equal after folding share
+                one slot
+            exact_keys: Give every distinct key its own slot even when keys
+                fold equal; only prefix queries are folded
+        """
+        self.fold = fold
+        self.exact_keys = exact_keys
+        self._folded: List[str] = []
+        self._keys: List[str] = []
+        self._values: List[Any] = []
+        if items:
+            self.update(items)
+
+    def _norm(self, key: str) -> str:
+        return self.fold(key) if self.fold else key
+
+    def _slot(self, key: str) -> str:
+        """Sort key of a stored key (folded, ties broken by the exact key)."""
+        if self.exact_keys and self.fold:
+            return self.fold(key) + "\0" + key
+        return self._norm(key)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(self._slot(key)) >= 0
+
+    def _find(self, folded: str) -> int:
+        i = bisect.bisect_left(self._folded, folded)
+        if i < len(self._folded) and self._folded[i] == folded:
+            return i
+        return -1
+
+    def add(self, key: str, value: Any = None) -> None:
+        """Insert a key, replacing the value of an existing one."""
+        folded = self._slot(key)
+        i = bisect.bisect_left(self._folded, folded)
+        if i < len(self._folded) and self._folded[i] == folded:
+            self._keys[i] = key
+            self._values[i] = value
+            return
+        self._folded.insert(i, folded)
+        self._keys.insert(i, key)
+        self._values.insert(i, value)
+
+    def update(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Insert many keys at once (one sort instead of one insert each)."""
+        merged = {folded: (key, value) for folded, key, value in zip(self._folded, self._keys, self._values)}
+        for key, value in items:
+            merged[self._slot(key)] = (key, value)
+        self._folded = sorted(merged)
+        self._keys = [merged[folded][0] for folded in self._folded]
+        self._values = [merged[folded][1] for folded in self._folded]
+
+    def remove(self, key: str) -> bool:
+        """Remove a key.
+
+        Returns:
+            True if the key was present
+        """
+        i = self._find(self._slot(key))
+        if i < 0:
+            return False
+        del self._folded[i]
+        del self._keys[i]
+        del self._values[i]
+        return True
+
+    def clear(self) -> None:
+        self._folded, self._keys, self._values = [], [], []
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._find(self._slot(key))
+        return self._values[i] if i >= 0 else default
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        folded = self._norm(prefix)
+        lo = bisect.bisect_left(self._folded, folded)
+        hi = bisect.bisect_left(self._folded, folded + _MAX_CHAR, lo)
+        return lo, hi
+
+    def count_with_prefix(self, prefix: str) -> int:
+        """Number of keys starting with a prefix, in O(log n)."""
+        lo, hi = self._range(prefix)
+        return hi - lo
+
+    def items_with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Tuple[str, Any]]:
+        """Keys starting with a prefix, in sorted order.
+
+        Args:
+            prefix: Query prefix (folded like the keys)
+            limit: Return at most this many items
+
+        Returns:
+            List of (key, value) pairs
+        """
+        lo, hi = self._range(prefix)
+        if limit is not None:
+            hi = min(hi, lo + max(limit, 0))
+        return list(zip(self._keys[lo:hi], self._values[lo:hi]))
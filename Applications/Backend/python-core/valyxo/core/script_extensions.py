@@ -435,13 +435,19 @@ class ValyxoScriptExtensions:
         
         return False
     
+    def _load_package(self, package: str) -> Optional[Dict[str, Callable]]:
+        """Map a package's exported function names to their implementations."""
+        from .packages import ValyxoPackageManager
+        functions = ValyxoPackageManager().get_package_functions(package)
+        if not functions:
+            return None
+        return {name: BUILTIN_FUNCTIONS[name] for name in functions if name in BUILTIN_FUNCTIONS}
+    
     def _import_package(self, package: str, alias: str = None) -> bool:
         """Import an entire package."""
         # Import from packages manager if available
         try:
-            from .packages import ValyxoPackageManager
-            pkg_manager = ValyxoPackageManager()
-            pkg = pkg_manager.get_package(package)
+            pkg = self._load_package(package)
             
             if pkg:
                 name = alias or package
@@ -464,9 +470,7 @@ class ValyxoScriptExtensions:
         items = [i.strip() for i in items_str.split(',')]
         
         try:
-            from .packages import ValyxoPackageManager
-            pkg_manager = ValyxoPackageManager()
-            pkg = pkg_manager.get_package(package)
+            pkg = self._load_package(package)
             
             if pkg:
                 for item in items:
@@ -0,0 +1,366 @@
+"""Valyxo Search Engine v0.6.0
+
+Parallel, regex-capable file search used by the ``grep`` command.
+
+Features:
+    - Files are fanned out to a thread pool, or a process pool for
+      large trees so every core is used
+    - Binary files are skipped with a NUL-byte sniff
+    - Compiled byte regexes run directly against memory-mapped files
+    - .gitignore-style excludes (nested .gitignore files are honored)
+    - Results stream back in deterministic (sorted path) order
+"""
+
+import os
+import re
+import mmap
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Dict, Optional, Iterator, Iterable, Tuple
+
+
+# Bytes inspected when deciding whether a file is binary
+BINARY_SNIFF_SIZE = 8192
+
+# Directories that are never searched
+DEFAULT_EXCLUDES = [".git/"]
+
+# Files per work unit handed to a worker
+BATCH_SIZE = 64
+
+# Total bytes above which searching switches to a process pool
+PROCESS_POOL_THRESHOLD = 32 * 1024 * 1024
+
+
+class ValyxoSearchError(Exception):
+    """Search operation error."""
+    pass
+
+
+@dataclass
+class SearchMatch:
+    """A single matching line."""
+    path: str
+    line_number: int
+    line: str
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression body."""
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i:i + 3] == "**/":
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern[i:i + 2] == "**":
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRule:
+    """A single .gitignore-style rule."""
+
+    def __init__(self, pattern: str, base: str = ""):
+        self.negated = pattern.startswith("!")
+        if self.negated:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        self.base = base
+        body = _translate_glob(pattern)
+        if anchored:
+            self.regex = re.compile(f"^{body}$")
+        else:
+            self.regex = re.compile(f"^(?:.*/)?{body}$")
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Check whether a path (relative to the search root) matches."""
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+class IgnoreRules:
+    """Ordered collection of ignore rules; the last matching rule wins."""
+
+    def __init__(self, patterns: Iterable[str] = None):
+        self.rules: List[IgnoreRule] = []
+        for pattern in patterns or []:
+            self.add(pattern)
+
+    def add(self, pattern: str, base: str = "") -> None:
+        """Add a rule, skipping comments and blank lines."""
+        pattern = pattern.rstrip("\n").rstrip()
+        if not pattern or pattern.startswith("#"):
+            return
+        self.rules.append(IgnoreRule(pattern, base))
+
+    def load_file(self, path: str, base: str = "") -> None:
+        """Load rules from a .gitignore file."""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    self.add(line, base)
+        except OSError:
+            pass
+
+    def copy(self) -> "IgnoreRules":
+        clone = IgnoreRules()
+        clone.rules = list(self.rules)
+        return clone
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Check whether a path is excluded."""
+        ignored = False
+        for rule in self.rules:
+            if rule.negated == ignored and rule.matches(rel_path, is_dir):
+                ignored = not rule.negated
+        return ignored
+
+
+def is_binary_file(path: str) -> bool:
+    """Detect binary files by looking for a NUL byte in the first block."""
+    try:
+        with open(path, "rb") as f:
+            return b"\0" in f.read(BINARY_SNIFF_SIZE)
+    except OSError:
+        return False
+
+
+def _search_buffer(buf, regex) -> List[Tuple[int, str]]:
+    """Find matching lines in a bytes-like buffer (one hit per line)."""
+    results = []
+    line_no = 1
+    counted_to = 0
+    pos = 0
+    size = len(buf)
+    # The end of the buffer is a line of its own only when the last line
+    # lacks a trailing newline (an empty file has no lines at all)
+    ends_with_newline = size == 0 or buf[size - 1:size] == b"\n"
+    while pos < size:
+        match = regex.search(buf, pos)
+        if match is None:
+            break
+        start = match.start()
+        if start == size and ends_with_newline:
+            break
+        line_start = buf.rfind(b"\n", 0, start) + 1
+        line_end = buf.find(b"\n", start)
+        if line_end == -1:
+            line_end = size
+        line_no += bytes(buf[counted_to:line_start]).count(b"\n")
+        counted_to = line_start
+        line = bytes(buf[line_start:line_end]).rstrip(b"\r")
+        results.append((line_no, line.decode("utf-8", errors="replace")))
+        pos = line_end + 1
+    return results
+
+
+def search_file(path: str, regex) -> Tuple[Optional[List[Tuple[int, str]]], Optional[str]]:
+    """Search a single file.
+
+    Returns:
+        Tuple of (matches, error). ``matches`` is None for skipped binary files.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(BINARY_SNIFF_SIZE)
+            if b"\0" in head:
+                return None, None
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return [], None
+            if size <= len(head):
+                return _search_buffer(head, regex), None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _search_buffer(mm, regex), None
+    except (OSError, ValueError) as e:
+        return [], str(e)
+
+
+def _search_batch(paths: List[str], pattern: bytes, flags: int) -> List[Tuple[str, Optional[List[Tuple[int, str]]], Optional[str]]]:
+    """Search a batch of files. Module-level so process pools can pickle it."""
+    regex = re.compile(pattern, flags)
+    results = []
+    for path in paths:
+        matches, error = search_file(path, regex)
+        results.append((path, matches, error))
+    return results
+
+
+class ValyxoSearch:
+    """Parallel search engine backing ``grep``."""
+
+    def __init__(self, max_workers: int = None, use_processes: Optional[bool] = None):
+        """Initialize the search engine.
+
+        Args:
+            max_workers: Worker count (defaults to the number of cores)
+            use_processes: Force (True) or forbid (False) the process pool;
+                None picks one based on the amount of data
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.files_scanned = 0
+        self.binary_skipped = 0
+        self.errors: List[Tuple[str, str]] = []
+
+    @staticmethod
+    def compile_pattern(pattern: str, ignore_case: bool = False, fixed: bool = False):
+        """Compile a search pattern into a bytes regex.
+
+        Raises:
+            ValyxoSearchError: If the pattern is not a valid regex
+        """
+        source = re.escape(pattern) if fixed else pattern
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        try:
+            return re.compile(source.encode("utf-8"), flags)
+        except re.error as e:
+            raise ValyxoSearchError(f"Invalid pattern '{pattern}': {e}")
+
+    def iter_files(self, root: str, excludes: Iterable[str] = None) -> Iterator[str]:
+        """Walk a tree in sorted order, honoring .gitignore files and excludes."""
+        rules = IgnoreRules(DEFAULT_EXCLUDES)
+        for pattern in excludes or []:
+            rules.add(pattern)
+        yield from self._walk(root, "", rules)
+
+    def _walk(self, directory: str, rel_dir: str, rules: IgnoreRules) -> Iterator[str]:
+        gitignore = os.path.join(directory, ".gitignore")
+        if os.path.isfile(gitignore):
+            rules = rules.copy()
+            rules.load_file(gitignore, rel_dir)
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            self.errors.append((directory, str(e)))
+            return
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if rules.is_ignored(rel_path, is_dir):
+                continue
+            if is_dir:
+                yield from self._walk(entry.path, rel_path, rules)
+            elif entry.is_file():
+                yield entry.path
+
+    def search(self, pattern: str, path: str, ignore_case: bool = False,
+               fixed: bool = False, excludes: Iterable[str] = None,
+               files: List[str] = None) -> Iterator[SearchMatch]:
+        """Search a file or directory tree.
+
+        Args:
+            pattern: Regular expression (or literal when ``fixed``)
+            path: File or directory to search
+            ignore_case: Case-insensitive matching
+            fixed: Treat the pattern as a literal string
+            excludes: Extra .gitignore-style exclude patterns
+            files: Explicit candidate list (skips the directory walk)
+
+        Yields:
+            SearchMatch objects, ordered by path then line number
+
+        Raises:
+            ValyxoSearchError: If the pattern is invalid
+        """
+        regex = self.compile_pattern(pattern, ignore_case, fixed)
+        self.files_scanned = 0
+        self.binary_skipped = 0
+        self.errors = []
+
+        if files is None:
+            files = [path] if os.path.isfile(path) else list(self.iter_files(path, excludes))
+        if not files:
+            return
+
+        batches = [files[i:i + BATCH_SIZE] for i in range(0, len(files), BATCH_SIZE)]
+        for batch in self._run_batches(batches, regex, files):
+            for file_path, matches, error in batch:
+                self.files_scanned += 1
+                if error:
+                    self.errors.append((file_path, error))
+                if matches is None:
+                    self.binary_skipped += 1
+                    continue
+                for line_number, line in matches:
+                    yield SearchMatch(file_path, line_number, line)
+
+    def _run_batches(self, batches: List[List[str]], regex, files: List[str]):
+        """Dispatch batches to a pool, yielding results in submission order."""
+        if len(batches) == 1 or self.max_workers == 1:
+            for batch in batches:
+                yield _search_batch(batch, regex.pattern, regex.flags)
+            return
+
+        executor_cls = ProcessPoolExecutor if self._want_processes(files) else ThreadPoolExecutor
+        workers = min(self.max_workers, len(batches))
+        with executor_cls(max_workers=workers) as executor:
+            futures = [executor.submit(_search_batch, batch, regex.pattern, regex.flags) for batch in batches]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _want_processes(self, files: List[str]) -> bool:
+        if self.use_processes is not None:
+            return self.use_processes
+        if self.max_workers < 2:
+            return False
+        total = 0
+        for path in files:
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                continue
+            if total >= PROCESS_POOL_THRESHOLD:
+                return True
+        return False
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get statistics for the last search."""
+        return {
+            "files_scanned": self.files_scanned,
+            "binary_skipped": self.binary_skipped,
+            "errors": len(self.errors),
+        }
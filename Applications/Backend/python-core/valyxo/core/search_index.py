@@ -0,0 +1,544 @@
+"""Valyxo Search Index v0.6.0
+
+Optional on-disk trigram index that narrows ``grep`` candidates.
+
+Every indexed file stores a fixed-size trigram signature: each distinct
+(ASCII-lowercased) byte trigram in the file sets one bit. A query extracts
+the literal runs its regex requires, hashes their trigrams the same way and
+only files whose signature contains every bit are scanned. Signatures can
+give false positives (the scan filters them) but never false negatives.
+
+The index is refreshed incrementally: only files whose mtime or size
+changed are re-read. With a native file watcher attached, the refresh
+after the first one re-checks only the paths the watcher reported instead
+of walking the whole tree.
+
+Refreshes made by ``grep`` stay in memory; the index file is rewritten
+by ``flush()`` when the shell exits (and by ``grep --reindex``).
+
+Commands:
+    grep --reindex      Build or refresh the index and show statistics
+"""
+
+import os
+import re
+import stat
+import json
+import time
+import base64
+from concurrent.futures import ProcessPoolExecutor
+import threading
+from typing import Dict, List, Optional, Any, Set, Tuple
+from .constants import PROJECTS_DIR, SYSTEM_DIR
+from .search import ValyxoSearch, IgnoreRules, BINARY_SNIFF_SIZE, DEFAULT_EXCLUDES
+from .watcher import ValyxoFileWatcher, WatchEvent, OVERFLOW
+
+
+INDEX_PATH = os.path.join(SYSTEM_DIR, "grep_index.json")
+INDEX_VERSION = 1
+
+# Signature width in bits (must be a power of two)
+SIGNATURE_BITS = 4096
+
+# Files larger than this are never ruled out by the index
+MAX_INDEXED_SIZE = 8 * 1024 * 1024
+
+# Changed-file count above which signatures are computed in a process pool
+PARALLEL_THRESHOLD = 256
+
+_SHIFT = 32 - (SIGNATURE_BITS.bit_length() - 1)
+
+
+def _bucket(trigram: int) -> int:
+    """Hash a 24-bit trigram value onto a signature bit."""
+    return ((trigram * 0x9E3779B1) & 0xFFFFFFFF) >> _SHIFT
+
+
+def signature_of(data: bytes) -> int:
+    """Build the trigram signature of a byte string."""
+    data = data.lower()
+    bits = bytearray(SIGNATURE_BITS // 8)
+    for a, b, c in set(zip(data, data[1:], data[2:])):
+        bucket = _bucket((a << 16) | (b << 8) | c)
+        bits[bucket >> 3] |= 1 << (bucket & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _file_signature(path: str) -> Tuple[str, Optional[int]]:
+    """Read a file and compute its signature.
+
+    Returns:
+        Tuple of (kind, signature) where kind is "text", "binary" or "error"
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return "error", None
+    if b"\0" in data[:BINARY_SNIFF_SIZE]:
+        return "binary", None
+    return "text", signature_of(data)
+
+
+def _signature_batch(paths: List[str]) -> List[Tuple[str, Optional[int]]]:
+    return [_file_signature(path) for path in paths]
+
+
+def required_literals(pattern: str, fixed: bool = False, ignore_case: bool = False) -> List[bytes]:
+    """Extract literal runs that every match of a pattern must contain.
+
+    The parser is deliberately conservative: anything it does not fully
+    understand simply contributes no literal, so narrowing stays correct.
+
+    Returns:
+        Byte strings of length >= 3 (lowercased); empty if nothing is required
+    """
+    if fixed:
+        runs = [pattern]
+    else:
+        try:
+            if re.compile(pattern).flags & re.VERBOSE:
+                return []
+        except re.error:
+            return []
+        if _has_alternation(pattern):
+            return []
+        runs = _literal_runs(pattern)
+
+    literals = []
+    for run in runs:
+        if ignore_case and not run.isascii():
+            continue
+        data = run.encode("utf-8").lower()
+        if len(data) >= 3:
+            literals.append(data)
+    return literals
+
+
+def _has_alternation(pattern: str) -> bool:
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+        elif c == "|":
+            return True
+        i += 1
+    return False
+
+
+def _escape_length(pattern: str, i: int) -> int:
+    """Length of the alphanumeric escape starting with the backslash at ``i``.
+
+    Covers ``\\xhh``, ``\\uXXXX``, ``\\UXXXXXXXX``, ``\\N{name}``, octal
+    escapes and backreferences as well as single-letter escapes.
+    """
+    kind = pattern[i + 1]
+    j = i + 2
+    if kind == "N" and pattern.startswith("{", j):
+        end = pattern.find("}", j)
+        return (end + 1 if end != -1 else len(pattern)) - i
+    if kind in "xuU":
+        width = {"x": 2, "u": 4, "U": 8}[kind]
+        while j < len(pattern) and j < i + 2 + width and pattern[j] in "0123456789abcdefABCDEF":
+            j += 1
+        return j - i
+    if kind.isdigit():
+        # \0, \ooo octal or \1-\99 backreference: at most three digits
+        while j < len(pattern) and j < i + 4 and pattern[j].isdigit():
+            j += 1
+        return j - i
+    return 2
+
+
+def _literal_runs(pattern: str) -> List[str]:
+    runs: List[str] = []
+    current: List[str] = []
+
+    def flush():
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\" and i + 1 < n:
+            nxt = pattern[i + 1]
+            if nxt.isalnum():
+                # A class, anchor or escape sequence: none of its characters
+                # are literal, so it ends the run and the next one starts after it
+                flush()
+                i += _escape_length(pattern, i)
+                continue
+            current.append(nxt)
+            i += 2
+            continue
+        if c in "*?{":
+            if c == "{" and not re.match(r"\{\d*,?\d*\}", pattern[i:]):
+                current.append(c)
+                i += 1
+                continue
+            if current:
+                current.pop()
+            flush()
+            if c == "{":
+                i = pattern.index("}", i)
+            i += 1
+            continue
+        if c == "+":
+            flush()
+            i += 1
+            continue
+        if c == "[":
+            flush()
+            j = i + 1
+            if j < n and pattern[j] == "^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 2 if pattern[j] == "\\" else 1
+            i = j + 1
+            continue
+        if c == "(":
+            flush()
+            depth = 0
+            j = i
+            while j < n:
+                if pattern[j] == "\\":
+                    j += 2
+                    continue
+                if pattern[j] == "(":
+                    depth += 1
+                elif pattern[j] == ")":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                j += 1
+            i = j + 1
+            continue
+        if c in ".^$)":
+            flush()
+            i += 1
+            continue
+        current.append(c)
+        i += 1
+    flush()
+    return runs
+
+
+class ValyxoSearchIndex:
+    """Persistent trigram index over a workspace tree."""
+
+    def __init__(self, root: str = None, index_path: str = None):
+        self.root = os.path.abspath(root or PROJECTS_DIR)
+        self.index_path = index_path or INDEX_PATH
+        # rel path -> [mtime_ns, size, kind, signature]
+        self.files: Dict[str, List[Any]] = {}
+        self.loaded = False
+        self.unsaved = False  # in-memory changes not yet written by save()
+        self.last_update: Dict[str, Any] = {}
+        self._walker = ValyxoSearch()
+        self._watcher: Optional[ValyxoFileWatcher] = None
+        self._watch_token: Optional[int] = None
+        self._dirty: Optional[Set[str]] = None  # None: changes unknown, walk everything
+        self._dirty_lock = threading.Lock()
+
+    def attach_watcher(self, watcher: ValyxoFileWatcher) -> None:
+        """Use a native file watcher to limit refreshes to changed paths.
+
+        The subscription is made by the next ``update()``, which still walks
+        the tree once since the on-disk index may predate this session.
+        """
+        if watcher.native:
+            self._watcher = watcher
+
+    def _on_events(self, events: List[WatchEvent]) -> None:
+        with self._dirty_lock:
+            if self._dirty is None:
+                return
+            for event in events:
+                if event.kind == OVERFLOW:
+                    self._dirty = None
+                    return
+                self._dirty.add(event.path)
+
+    def _take_dirty(self) -> Optional[Set[str]]:
+        if self._watcher is None:
+            return None
+        if self._watch_token is None:
+            with self._dirty_lock:
+                self._dirty = set()
+            self._watch_token = self._watcher.subscribe(self.root, self._on_events,
+                                                        recursive=True, ignore={".git"})
+            return None
+        self._watcher.sync(self._watch_token)
+        with self._dirty_lock:
+            dirty = self._dirty
+            self._dirty = set()
+        return dirty
+
+    def exists(self) -> bool:
+        """Check whether an index has been built on disk."""
+        return self.loaded or os.path.exists(self.index_path)
+
+    def load(self) -> bool:
+        """Load the index from disk.
+
+        Returns:
+            True if a compatible index was loaded
+        """
+        if self.loaded:
+            return True
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("root") != self.root \
+                or data.get("bits") != SIGNATURE_BITS:
+            return False
+
+        files = {}
+        for rel, (mtime, size, kind, sig) in data.get("files", {}).items():
+            signature = int.from_bytes(base64.b64decode(sig), "little") if sig else None
+            files[rel] = [mtime, size, kind, signature]
+        self.files = files
+        self.loaded = True
+        return True
+
+    def save(self) -> None:
+        """Write the index to disk atomically."""
+        nbytes = SIGNATURE_BITS // 8
+        files = {}
+        for rel, (mtime, size, kind, signature) in self.files.items():
+            sig = base64.b64encode(signature.to_bytes(nbytes, "little")).decode("ascii") if signature is not None else ""
+            files[rel] = [mtime, size, kind, sig]
+        data = {"version": INDEX_VERSION, "root": self.root, "bits": SIGNATURE_BITS, "files": files}
+
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+        self.unsaved = False
+
+    def flush(self) -> None:
+        """Write the index if an update left changes in memory only."""
+        if self.unsaved:
+            try:
+                self.save()
+            except OSError:
+                pass
+
+    def update(self, save: bool = True) -> Dict[str, Any]:
+        """Incrementally refresh the index from file mtimes and sizes.
+
+        Args:
+            save: Write the index when anything changed. Interactive
+                callers pass False and call ``flush()`` later (the file
+                holds a signature per indexed file, so rewriting it costs
+                far more than the refresh itself)
+
+        Returns:
+            Counts of added, updated, removed and unchanged files
+        """
+        start = time.perf_counter()
+        self.load()
+
+        dirty = self._take_dirty()
+        if dirty is not None and self.loaded:
+            changed, removed = self._scan_dirty(dirty)
+        else:
+            changed, removed = self._scan_all()
+
+        for rel in removed:
+            del self.files[rel]
+
+        added = sum(1 for rel, _, _, _ in changed if rel not in self.files)
+        readable = [item for item in changed if item[3] <= MAX_INDEXED_SIZE]
+        for rel, _, mtime, size in changed:
+            if size > MAX_INDEXED_SIZE:
+                self.files[rel] = [mtime, size, "large", None]
+
+        paths = [path for _, path, _, _ in readable]
+        if len(paths) >= PARALLEL_THRESHOLD and (os.cpu_count() or 1) > 1:
+            chunk = max(1, len(paths) // ((os.cpu_count() or 1) * 4))
+            batches = [paths[i:i + chunk] for i in range(0, len(paths), chunk)]
+            with ProcessPoolExecutor() as executor:
+                signatures = [sig for batch in executor.map(_signature_batch, batches) for sig in batch]
+        else:
+            signatures = _signature_batch(paths)
+
+        for (rel, _, mtime, size), (kind, signature) in zip(readable, signatures):
+            if kind == "error":
+                self.files.pop(rel, None)
+                continue
+            self.files[rel] = [mtime, size, kind, signature]
+
+        self.loaded = True
+        if changed or removed:
+            self.unsaved = True
+        if save and self.unsaved:
+            self.save()
+
+        self.last_update = {
+            "added": added,
+            "updated": len(changed) - added,
+            "removed": len(removed),
+            "unchanged": len(self.files) - len(changed),
+            "seconds": time.perf_counter() - start,
+        }
+        return self.last_update
+
+    def _scan_all(self) -> Tuple[List[Tuple[str, str, int, int]], List[str]]:
+        """Walk the whole tree; returns (changed, removed)."""
+        seen = set()
+        changed: List[Tuple[str, str, int, int]] = []
+        for path in self._walker.iter_files(self.root):
+            rel = os.path.relpath(path, self.root).replace("\\", "/")
+            seen.add(rel)
+            self._check_file(rel, path, changed)
+        removed = [rel for rel in self.files if rel not in seen]
+        return changed, removed
+
+    def _scan_dirty(self, dirty: Set[str]) -> Tuple[List[Tuple[str, str, int, int]], List[str]]:
+        """Re-check only the paths a watcher reported; returns (changed, removed)."""
+        changed: List[Tuple[str, str, int, int]] = []
+        removed: Set[str] = set()
+        rules_cache: Dict[str, Optional[IgnoreRules]] = {}
+
+        def drop_tree(rel: str) -> None:
+            prefix = rel + "/"
+            removed.update(r for r in self.files if r == rel or r.startswith(prefix))
+
+        for path in sorted(dirty):
+            if not self.covers(path) or path == self.root:
+                continue
+            rel = os.path.relpath(path, self.root).replace("\\", "/")
+            if os.path.basename(path) == ".gitignore":
+                # Rules changed: anything below may have become (un)ignored
+                return self._scan_all()
+            rel_dir = rel.rpartition("/")[0]
+            if rel_dir not in rules_cache:
+                rules_cache[rel_dir] = self._rules_for(rel_dir)
+            rules = rules_cache[rel_dir]
+            try:
+                st = os.lstat(path)
+            except OSError:
+                drop_tree(rel)
+                continue
+            is_dir = stat.S_ISDIR(st.st_mode)
+            if rules is None or rules.is_ignored(rel, is_dir):
+                drop_tree(rel)
+                continue
+            if is_dir:
+                drop_tree(rel)
+                for file_path in self._walker._walk(path, rel, rules):
+                    file_rel = os.path.relpath(file_path, self.root).replace("\\", "/")
+                    removed.discard(file_rel)
+                    self._check_file(file_rel, file_path, changed)
+            elif os.path.isfile(path):
+                removed.discard(rel)
+                self._check_file(rel, path, changed)
+            else:
+                drop_tree(rel)
+        # A new directory and the files in it can both be reported
+        unique = {item[0]: item for item in changed}
+        return list(unique.values()), [rel for rel in removed if rel not in unique]
+
+    def _rules_for(self, rel_dir: str) -> Optional[IgnoreRules]:
+        """Ignore rules in effect inside a directory, as the tree walk builds them.
+
+        Returns:
+            IgnoreRules, or None if the directory itself is ignored
+        """
+        rules = IgnoreRules(DEFAULT_EXCLUDES)
+        rules.load_file(os.path.join(self.root, ".gitignore"), "")
+        current = ""
+        for part in rel_dir.split("/") if rel_dir else []:
+            current = f"{current}/{part}" if current else part
+            if rules.is_ignored(current, True):
+                return None
+            gitignore = os.path.join(self.root, current, ".gitignore")
+            if os.path.isfile(gitignore):
+                rules = rules.copy()
+                rules.load_file(gitignore, current)
+        return rules
+
+    def _check_file(self, rel: str, path: str, changed: List[Tuple[str, str, int, int]]) -> None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        entry = self.files.get(rel)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return
+        changed.append((rel, path, st.st_mtime_ns, st.st_size))
+
+    def covers(self, path: str) -> bool:
+        """Check whether a path lies inside the indexed tree."""
+        abs_path = os.path.abspath(path)
+        return abs_path == self.root or abs_path.startswith(self.root + os.sep)
+
+    def candidates(self, pattern: str, path: str, ignore_case: bool = False,
+                   fixed: bool = False) -> Optional[List[str]]:
+        """Narrow the files that can match a pattern below ``path``.
+
+        Returns:
+            Sorted absolute paths, or None if the index cannot help
+        """
+        literals = required_literals(pattern, fixed, ignore_case)
+        if not literals or not self.covers(path):
+            return None
+
+        mask = 0
+        for literal in literals:
+            mask |= signature_of(literal)
+
+        prefix = os.path.relpath(os.path.abspath(path), self.root).replace("\\", "/")
+        prefix = "" if prefix == "." else prefix + "/"
+
+        result = []
+        for rel, (_, _, kind, signature) in self.files.items():
+            if prefix and not rel.startswith(prefix):
+                continue
+            if kind == "binary":
+                continue
+            if signature is None or signature & mask == mask:
+                result.append(os.path.join(self.root, rel))
+        result.sort()
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        kinds: Dict[str, int] = {"text": 0, "binary": 0, "large": 0}
+        total_bytes = 0
+        fill = 0
+        for _, size, kind, signature in self.files.values():
+            kinds[kind] = kinds.get(kind, 0) + 1
+            total_bytes += size
+            if signature is not None:
+                fill += bin(signature).count("1")
+        try:
+            index_size = os.path.getsize(self.index_path)
+        except OSError:
+            index_size = 0
+        return {
+            "root": self.root,
+            "files": len(self.files),
+            "text_files": kinds["text"],
+            "binary_files": kinds["binary"],
+            "large_files": kinds["large"],
+            "indexed_bytes": total_bytes,
+            "index_bytes": index_size,
+            "avg_fill": (fill / kinds["text"] / SIGNATURE_BITS) if kinds["text"] else 0.0,
+        }
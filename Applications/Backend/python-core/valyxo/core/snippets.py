@@ -11,6 +11,11 @@ Usage:
     snippet export                    Export snippets
     snippet import <file>             Import snippets
     snippet search <query>            Search snippets
+
+Completion:
+    Triggers are kept in a prefix index (trigger -> snippet names) that is
+    updated as snippets are added, edited, deleted and imported, so
+    auto-complete never scans the whole library per keystroke.
 """
 
 import os
@@ -18,6 +23,7 @@ import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
+from .prefix_index import PrefixIndex
 
 
 @dataclass
@@ -300,7 +306,40 @@ class ValyxoSnippetManager:
         os.makedirs(config_dir, exist_ok=True)
         
         self.snippets: Dict[str, Snippet] = {}
+        self.triggers = PrefixIndex()  # trigger -> names of snippets using it
+        self.version = 0  # bumped whenever the trigger index changes
         self._load_snippets()
+        self._rebuild_triggers()
+    
+    def _rebuild_triggers(self) -> None:
+        by_trigger: Dict[str, List[str]] = {}
+        for name, snippet in self.snippets.items():
+            by_trigger.setdefault(snippet.prefix, []).append(name)
+        self.triggers = PrefixIndex((trigger, sorted(names)) for trigger, names in by_trigger.items())
+        self.version += 1
+    
+    def _index(self, name: str, snippet: Snippet) -> None:
+        names = self.triggers.get(snippet.prefix) or []
+        if name not in names:
+            self.triggers.add(snippet.prefix, sorted(names + [name]))
+        self.version += 1
+    
+    def _unindex(self, name: str, snippet: Snippet) -> None:
+        names = [n for n in self.triggers.get(snippet.prefix) or [] if n != name]
+        if names:
+            self.triggers.add(snippet.prefix, names)
+        else:
+            self.triggers.remove(snippet.prefix)
+        self.version += 1
+    
+    def _put(self, snippet: Snippet, name: str = None) -> None:
+        """Store a snippet, keeping the trigger index in step."""
+        name = name or snippet.name
+        old = self.snippets.get(name)
+        if old is not None:
+            self._unindex(name, old)
+        self.snippets[name] = snippet
+        self._index(name, snippet)
     
     def _load_snippets(self):
         """Load snippets from file and builtins."""
@@ -370,7 +409,7 @@ class ValyxoSnippetManager:
             tags=tags or []
         )
         
-        self.snippets[name] = snippet
+        self._put(snippet)
         self._save_snippets()
         return f"✓ Added snippet: {name}"
     
@@ -383,6 +422,7 @@ class ValyxoSnippetManager:
             snippet = self.snippets[name]
         else:
             return f"✗ Snippet not found: {name}"
+        self._unindex(name, self.snippets[name])
         
         # Apply changes
         for key, value in changes.items():
@@ -390,7 +430,7 @@ class ValyxoSnippetManager:
                 setattr(snippet, key, value)
         
         snippet.updated_at = datetime.now().isoformat()
-        self.snippets[name] = snippet
+        self._put(snippet, name)
         self._save_snippets()
         return f"✓ Updated snippet: {name}"
     
@@ -413,12 +453,12 @@ class ValyxoSnippetManager:
         if name not in self.snippets:
             return f"✗ Snippet not found: {name}"
         
-        del self.snippets[name]
+        self._unindex(name, self.snippets.pop(name))
         self._save_snippets()
         
         # Reload builtins if we deleted an override
         if name in BUILTIN_SNIPPETS:
-            self.snippets[name] = BUILTIN_SNIPPETS[name]
+            self._put(BUILTIN_SNIPPETS[name])
         
         return f"✓ Deleted snippet: {name}"
     
@@ -499,7 +539,7 @@ class ValyxoSnippetManager:
                     skipped += 1
                     continue
                 
-                self.snippets[snippet.name] = snippet
+                self._put(snippet)
                 count += 1
             
             self._save_snippets()
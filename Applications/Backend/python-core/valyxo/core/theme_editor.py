@@ -17,6 +17,7 @@ import os
 import json
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
+from .watcher import ValyxoFileWatcher, WatchedCache
 
 
 @dataclass
@@ -385,22 +386,16 @@ class ValyxoThemeManager:
         self.themes_dir = themes_dir
         os.makedirs(self.themes_dir, exist_ok=True)
         self.current_theme: str = "dark"
+        self._custom_themes = WatchedCache(self._read_custom_themes)
     
-    def list_themes(self) -> List[Dict[str, str]]:
-        """List all available themes."""
+    def attach_watcher(self, watcher: ValyxoFileWatcher) -> None:
+        """Re-read custom theme files only when the themes directory changes."""
+        self._custom_themes.attach(watcher, self.themes_dir)
+    
+    def _read_custom_themes(self) -> List[Dict[str, str]]:
+        """Read the summary of every custom theme file."""
         themes = []
-        
-        # Built-in themes
-        for name, theme in BUILTIN_THEMES.items():
-            themes.append({
-                "name": name,
-                "description": theme.description,
-                "author": theme.author,
-                "builtin": True
-            })
-        
-        # Custom themes
-        for filename in os.listdir(self.themes_dir):
+        for filename in sorted(os.listdir(self.themes_dir)):
             if filename.endswith(".json"):
                 theme_path = os.path.join(self.themes_dir, filename)
                 try:
@@ -414,6 +409,23 @@ class ValyxoThemeManager:
                         })
                 except:
                     pass
+        return themes
+    
+    def list_themes(self) -> List[Dict[str, str]]:
+        """List all available themes."""
+        themes = []
+        
+        # Built-in themes
+        for name, theme in BUILTIN_THEMES.items():
+            themes.append({
+                "name": name,
+                "description": theme.description,
+                "author": theme.author,
+                "builtin": True
+            })
+        
+        # Custom themes
+        themes.extend(dict(theme) for theme in self._custom_themes.get())
         
         return themes
     
@@ -1,6 +1,7 @@
 import os
 import re
-from typing import Optional
+import shutil
+from typing import Iterable, Optional
 from .colors import Colors
 
 
@@ -22,6 +23,49 @@ def prompt(text: str) -> str:
         return ""
 
 
+def page_lines(lines: Iterable[str], page_size: int = None) -> bool:
+    """Print lines one screen at a time without materializing them.
+    
+    Args:
+        lines: Lines to print (may be a lazy iterator)
+        page_size: Lines per page (defaults to the terminal height)
+    
+    Returns:
+        True if every line was shown, False if the user quit early
+    """
+    if page_size is None:
+        rows, _ = shutil.get_terminal_size((80, 24))
+        page_size = max(rows - 2, 1)
+    
+    remaining = page_size
+    for line in lines:
+        if remaining == 0:
+            response = prompt("--Press SPACE for next, ENTER for one line, q to quit--: ")
+            if response.lower() == "q":
+                return False
+            remaining = 1 if response == "" else page_size
+        print(line)
+        remaining -= 1
+    return True
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for display (e.g. 1.5K, 20M).
+    
+    Args:
+        size: Size in bytes
+    
+    Returns:
+        Human-readable size
+    """
+    value = float(size)
+    for unit in ("B", "K", "M", "G"):
+        if value < 1024:
+            return f"{int(value)}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}T"
+
+
 def path_within_root(path: str, root_dir: str) -> Optional[str]:
     """Validate path is within root directory.
     
@@ -0,0 +1,586 @@
+"""Valyxo File Watcher v0.6.0
+
+Directory change notifications used to invalidate caches precisely.
+
+Backends:
+    - inotify (Linux), called through ctypes so no extra dependency is needed
+    - mtime polling everywhere else
+
+Subsystems subscribe to a directory (optionally recursively) and receive
+coalesced lists of WatchEvent objects. Before serving cached data a
+subscriber calls ``sync()``, which delivers every change made up to that
+moment: on inotify this drains the kernel queue, on the polling backend it
+re-scans the subscription's directories. A subscription whose directories
+could not all be watched receives an "overflow" event on every sync, which
+tells the subscriber to fall back to a full re-scan.
+
+Callbacks run with the watcher lock held (on the caller's thread during
+``sync()``, on the background thread otherwise). They should only record
+what changed and must not wait on locks held by code that calls ``sync()``.
+"""
+
+import os
+import sys
+import errno
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Seconds the background thread waits after the first event so bursts
+# (editor saves, unpacking archives) are delivered as one batch
+COALESCE_DELAY = 0.05
+
+# Event kinds
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+OVERFLOW = "overflow"
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+              | IN_ONLYDIR | IN_EXCL_UNLINK)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+RawEvent = Tuple[str, str, bool]  # (path, kind, is_dir)
+
+
+@dataclass(frozen=True)
+class WatchEvent:
+    """A coalesced change to one path."""
+    path: str
+    kind: str
+    is_dir: bool = False
+
+
+def _merge_kind(old: str, new: str) -> Optional[str]:
+    """Combine two events for the same path; None cancels both."""
+    if old == CREATED and new == DELETED:
+        return None
+    if old == CREATED and new == MODIFIED:
+        return CREATED
+    if old == DELETED and new == CREATED:
+        return MODIFIED
+    return new
+
+
+class _InotifyBackend:
+    """Kernel notifications through inotify(7)."""
+
+    name = "inotify"
+    native = True
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._rm_watch.restype = ctypes.c_int
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+        self._paths: Dict[int, str] = {}
+        self._wds: Dict[str, int] = {}
+
+    def add(self, path: str) -> bool:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._paths[wd] = path
+        self._wds[path] = wd
+        return True
+
+    def remove(self, path: str) -> None:
+        wd = self._wds.pop(path, None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            self._rm_watch(self.fd, wd)
+
+    def wait(self, timeout: float) -> bool:
+        try:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+        except (OSError, ValueError):
+            return False
+        return bool(ready)
+
+    def collect(self, dirs: Iterable[str] = None) -> List[RawEvent]:
+        """Read every queued event without blocking (``dirs`` is ignored)."""
+        events: List[RawEvent] = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+            if not data:
+                break
+            self._parse(data, events)
+        return events
+
+    def _parse(self, data: bytes, events: List[RawEvent]) -> None:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            start = offset + _EVENT_HEADER.size
+            name = data[start:start + length].rstrip(b"\0")
+            offset = start + length
+
+            if mask & IN_Q_OVERFLOW:
+                events.append(("", OVERFLOW, False))
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                if self._wds.get(directory) == wd:
+                    del self._wds[directory]
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                events.append((directory, DELETED, True))
+                continue
+            if not name:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                kind = CREATED
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                kind = DELETED
+            else:
+                kind = MODIFIED
+            events.append((path, kind, bool(mask & IN_ISDIR)))
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        self._paths.clear()
+        self._wds.clear()
+
+
+def _snapshot(path: str) -> Optional[Dict[str, Tuple[bool, int, int]]]:
+    """name -> (is_dir, mtime_ns, size) for one directory."""
+    snapshot = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                snapshot[entry.name] = (is_dir, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+    return snapshot
+
+
+class _PollingBackend:
+    """Portable fallback that diffs directory snapshots."""
+
+    name = "polling"
+    native = False
+
+    def __init__(self):
+        self._snapshots: Dict[str, Dict[str, Tuple[bool, int, int]]] = {}
+
+    def add(self, path: str) -> bool:
+        snapshot = _snapshot(path)
+        if snapshot is None:
+            return False
+        self._snapshots[path] = snapshot
+        return True
+
+    def remove(self, path: str) -> None:
+        self._snapshots.pop(path, None)
+
+    def wait(self, timeout: float) -> bool:
+        return False
+
+    def collect(self, dirs: Iterable[str] = None) -> List[RawEvent]:
+        """Re-scan watched directories (all of them, or just ``dirs``)."""
+        events: List[RawEvent] = []
+        for directory in sorted(self._snapshots if dirs is None else dirs):
+            old = self._snapshots.get(directory)
+            if old is None:
+                continue
+            new = _snapshot(directory)
+            if new is None:
+                events.append((directory, DELETED, True))
+                continue
+            self._snapshots[directory] = new
+            for name, (is_dir, mtime, size) in new.items():
+                path = os.path.join(directory, name)
+                previous = old.get(name)
+                if previous is None:
+                    events.append((path, CREATED, is_dir))
+                elif previous[0] != is_dir:
+                    events.append((path, DELETED, previous[0]))
+                    events.append((path, CREATED, is_dir))
+                elif not is_dir and previous[1:] != (mtime, size):
+                    events.append((path, MODIFIED, False))
+            for name, (is_dir, _, _) in old.items():
+                if name not in new:
+                    events.append((os.path.join(directory, name), DELETED, is_dir))
+        return events
+
+    def close(self) -> None:
+        self._snapshots.clear()
+
+
+def _create_backend(name: str):
+    if name in ("auto", "inotify"):
+        try:
+            return _InotifyBackend()
+        except (OSError, AttributeError):
+            pass
+    return _PollingBackend()
+
+
+@dataclass
+class _Subscription:
+    token: int
+    root: str
+    callback: Callable[[List[WatchEvent]], None]
+    recursive: bool
+    ignore: Set[str]
+    dirs: Set[str] = field(default_factory=set)
+    degraded: bool = False
+
+
+class ValyxoFileWatcher:
+    """Shared directory watcher with coalesced change events."""
+
+    def __init__(self, backend: str = "auto", coalesce_delay: float = COALESCE_DELAY):
+        """Create a watcher.
+
+        Args:
+            backend: "auto" (inotify when available), "inotify" or "polling"
+            coalesce_delay: Seconds the background thread batches events for
+        """
+        self._backend = _create_backend(backend)
+        self.coalesce_delay = coalesce_delay
+        self._lock = threading.RLock()
+        self._subscriptions: Dict[int, _Subscription] = {}
+        self._refcounts: Dict[str, int] = {}
+        self._pending: Dict[str, Tuple[str, bool]] = {}
+        self._overflow = False
+        self._next_token = 1
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.events_delivered = 0
+        self.errors: List[Tuple[int, str]] = []
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend.name
+
+    @property
+    def native(self) -> bool:
+        """True when changes are pushed by the OS (``sync()`` is cheap)."""
+        return self._backend.native
+
+    # ─── subscriptions ───────────────────────────────────────────────
+
+    def subscribe(self, path: str, callback: Callable[[List[WatchEvent]], None],
+                  recursive: bool = False, ignore: Iterable[str] = None) -> int:
+        """Watch a directory.
+
+        Args:
+            path: Directory to watch
+            callback: Called with a list of WatchEvent objects
+            recursive: Also watch every subdirectory (new ones included)
+            ignore: Directory names that are never descended into
+
+        Returns:
+            Subscription token for ``sync()`` and ``unsubscribe()``
+        """
+        with self._lock:
+            sub = _Subscription(self._next_token, os.path.abspath(path), callback,
+                                recursive, set(ignore or ()))
+            self._next_token += 1
+            self._subscriptions[sub.token] = sub
+            if os.path.isdir(sub.root):
+                for directory in self._walk_dirs(sub.root, sub):
+                    self._acquire(directory, sub)
+            else:
+                sub.degraded = True
+            return sub.token
+
+    def unsubscribe(self, token: int) -> None:
+        """Stop a subscription."""
+        with self._lock:
+            sub = self._subscriptions.pop(token, None)
+            if sub is not None:
+                for directory in list(sub.dirs):
+                    self._release(directory, sub)
+
+    def _walk_dirs(self, root: str, sub: _Subscription) -> List[str]:
+        dirs = [root]
+        if not sub.recursive:
+            return dirs
+        i = 0
+        while i < len(dirs):
+            try:
+                with os.scandir(dirs[i]) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False) and entry.name not in sub.ignore:
+                                dirs.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            i += 1
+        return dirs
+
+    def _acquire(self, directory: str, sub: _Subscription) -> None:
+        if directory in sub.dirs:
+            return
+        if directory not in self._refcounts:
+            if not self._backend.add(directory):
+                if os.path.isdir(directory):
+                    sub.degraded = True
+                return
+            self._refcounts[directory] = 0
+        self._refcounts[directory] += 1
+        sub.dirs.add(directory)
+
+    def _release(self, directory: str, sub: _Subscription) -> None:
+        if directory not in sub.dirs:
+            return
+        sub.dirs.discard(directory)
+        self._refcounts[directory] -= 1
+        if self._refcounts[directory] <= 0:
+            del self._refcounts[directory]
+            self._backend.remove(directory)
+
+    # ─── event processing ────────────────────────────────────────────
+
+    def sync(self, token: int = None) -> int:
+        """Deliver all changes made up to now.
+
+        Args:
+            token: Only re-scan this subscription's directories (polling
+                backend); inotify always drains the whole queue
+
+        Returns:
+            Number of events delivered
+        """
+        with self._lock:
+            dirs = None
+            if token is not None and not self._backend.native:
+                sub = self._subscriptions.get(token)
+                dirs = list(sub.dirs) if sub else []
+            self._process(self._backend.collect(dirs))
+            return self._dispatch()
+
+    def _process(self, raw: List[RawEvent]) -> None:
+        for path, kind, is_dir in raw:
+            if kind == OVERFLOW:
+                self._overflow = True
+                continue
+            if is_dir and kind == DELETED:
+                self._unwatch_tree(path)
+            self._queue(path, kind, is_dir)
+            if is_dir and kind == CREATED:
+                self._watch_new_dir(path)
+        if self._overflow:
+            for sub in self._subscriptions.values():
+                if sub.recursive and not sub.degraded:
+                    for directory in self._walk_dirs(sub.root, sub):
+                        self._acquire(directory, sub)
+
+    def _queue(self, path: str, kind: str, is_dir: bool) -> None:
+        previous = self._pending.pop(path, None)
+        if previous is not None:
+            kind = _merge_kind(previous[0], kind)
+            if kind is None:
+                return
+            is_dir = is_dir or previous[1]
+        self._pending[path] = (kind, is_dir)
+
+    def _watch_new_dir(self, path: str) -> None:
+        """Watch a new directory and report what it already contains.
+
+        Entries created before the watch was added produce no event of
+        their own, so they are reported here.
+        """
+        parent = os.path.dirname(path)
+        listed: Set[str] = set()
+        for sub in self._subscriptions.values():
+            if not sub.recursive or parent not in sub.dirs or os.path.basename(path) in sub.ignore:
+                continue
+            for directory in self._walk_dirs(path, sub):
+                self._acquire(directory, sub)
+                if directory in listed:
+                    continue
+                listed.add(directory)
+                if directory != path:
+                    self._queue(directory, CREATED, True)
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            if not entry.is_dir(follow_symlinks=False):
+                                self._queue(entry.path, CREATED, False)
+                except OSError:
+                    continue
+
+    def _unwatch_tree(self, path: str) -> None:
+        prefix = path + os.sep
+        for sub in self._subscriptions.values():
+            gone = [d for d in sub.dirs if d == path or d.startswith(prefix)]
+            for directory in gone:
+                self._release(directory, sub)
+            if sub.root == path or sub.root.startswith(prefix):
+                sub.degraded = True
+
+    def _dispatch(self) -> int:
+        events = [WatchEvent(path, kind, is_dir) for path, (kind, is_dir) in self._pending.items()]
+        self._pending = {}
+        overflow = self._overflow
+        self._overflow = False
+
+        delivered = 0
+        for sub in list(self._subscriptions.values()):
+            if overflow or sub.degraded:
+                mine = [WatchEvent(sub.root, OVERFLOW, True)]
+            else:
+                mine = [e for e in events
+                        if e.path == sub.root or os.path.dirname(e.path) in sub.dirs]
+            if not mine:
+                continue
+            try:
+                sub.callback(mine)
+            except Exception as e:
+                self.errors.append((sub.token, str(e)))
+            delivered += len(mine)
+        self.events_delivered += delivered
+        return delivered
+
+    # ─── background thread ───────────────────────────────────────────
+
+    def start(self) -> None:
+        """Deliver events in the background.
+
+        Only the inotify backend needs a thread (it keeps the kernel queue
+        from overflowing); polling happens on demand in ``sync()``.
+        """
+        if not self._backend.native or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="valyxo-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self._backend.wait(0.5):
+                continue
+            if self._stop.wait(self.coalesce_delay):
+                break
+            self.sync()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def close(self) -> None:
+        """Stop watching everything and release OS resources."""
+        self.stop()
+        with self._lock:
+            for sub in self._subscriptions.values():
+                sub.dirs.clear()
+                sub.degraded = True
+            self._refcounts.clear()
+            self._backend.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get watcher statistics."""
+        with self._lock:
+            return {
+                "backend": self._backend.name,
+                "subscriptions": len(self._subscriptions),
+                "watched_dirs": len(self._refcounts),
+                "degraded": sum(1 for s in self._subscriptions.values() if s.degraded),
+                "events_delivered": self.events_delivered,
+                "running": bool(self._thread and self._thread.is_alive()),
+            }
+
+
+class WatchedCache:
+    """A value loaded from disk and reused until its directory changes.
+
+    Without a watcher attached the loader runs on every ``get()``, so
+    callers behave exactly as if nothing were cached.
+    """
+
+    def __init__(self, loader: Callable[[], Any]):
+        self.loader = loader
+        self._watcher: Optional[ValyxoFileWatcher] = None
+        self._token: Optional[int] = None
+        self._value: Any = None
+        self._stale = True
+
+    def attach(self, watcher: ValyxoFileWatcher, path: str, recursive: bool = False,
+               ignore: Iterable[str] = None) -> None:
+        """Start invalidating on changes below ``path``."""
+        self.detach()
+        self._watcher = watcher
+        self._token = watcher.subscribe(path, self._on_events, recursive, ignore)
+        self._stale = True
+
+    def detach(self) -> None:
+        if self._watcher is not None and self._token is not None:
+            self._watcher.unsubscribe(self._token)
+        self._watcher = None
+        self._token = None
+
+    def _on_events(self, events: List[WatchEvent]) -> None:
+        self._stale = True
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def get(self) -> Any:
+        if self._watcher is None:
+            return self.loader()
+        self._watcher.sync(self._token)
+        if self._stale:
+            self._stale = False
+            self._value = self.loader()
+        return self._value
@@ -23,6 +23,71 @@ class ValyxoScriptError(Exception):
         return error_str
 
 
+class ValyxoSymbolTable(dict):
+    """A dict of runtime symbols that reports names as they come and go.
+    
+    Listeners are called as ``listener(name, present)`` after a name is
+    added (present=True) or removed (present=False); overwriting an
+    existing name is not reported. Auto-complete uses this to keep its
+    symbol index current without rescanning the table.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._listeners: List[Callable[[str, bool], None]] = []
+    
+    def add_listener(self, listener: Callable[[str, bool], None]) -> None:
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, bool], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, name: str, present: bool) -> None:
+        for listener in self._listeners:
+            listener(name, present)
+    
+    def __setitem__(self, name: str, value: Any) -> None:
+        is_new = name not in self
+        super().__setitem__(name, value)
+        if is_new:
+            self._notify(name, True)
+    
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._notify(name, False)
+    
+    def pop(self, name: str, *default: Any) -> Any:
+        present = name in self
+        value = super().pop(name, *default)
+        if present:
+            self._notify(name, False)
+        return value
+    
+    def setdefault(self, name: str, default: Any = None) -> Any:
+        if name not in self:
+            self[name] = default
+        return super().__getitem__(name)
+    
+    def update(self, *args, **kwargs) -> None:
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+    
+    def clear(self) -> None:
+        names = list(self)
+        super().clear()
+        for name in names:
+            self._notify(name, False)
+    
+    def replace(self, snapshot: Dict[str, Any]) -> None:
+        """Make the table equal to a snapshot, reporting only the differences."""
+        for name in [name for name in self if name not in snapshot]:
+            del self[name]
+        for name, value in snapshot.items():
+            if self.get(name, snapshot) is not value:
+                self[name] = value
+
+
 class ValyxoScriptRuntime:
     """ValyxoScript v0.6.0 language runtime environment.
     
@@ -42,8 +107,8 @@ class ValyxoScriptRuntime:
     
     def __init__(self):
         """Initialize runtime with empty variables and functions."""
-        self.vars: Dict[str, Any] = {}
-        self.functions: Dict[str, Dict[str, Any]] = {}
+        self.vars: ValyxoSymbolTable = ValyxoSymbolTable()
+        self.functions: ValyxoSymbolTable = ValyxoSymbolTable()
         self.block_stack: List[Dict[str, Any]] = []
         self.return_value: Optional[Any] = None
         self.iteration_count: int = 0
@@ -486,7 +551,7 @@ class ValyxoScriptRuntime:
                         arg_values.append(arg)
                 
                 func_def = self.functions[func_name]
-                saved_vars = self.vars.copy()
+                saved_vars = dict(self.vars)
                 
                 for param, value in zip(func_def['params'], arg_values):
                     self.vars[param] = value
@@ -494,7 +559,7 @@ class ValyxoScriptRuntime:
                 for func_line in func_def['lines']:
                     self._execute_command(func_line)
                 
-                self.vars = saved_vars
+                self.vars.replace(saved_vars)
     
     def _print_vars(self) -> None:
         """Print all variables."""
@@ -0,0 +1,296 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+from valyxo.core.prefix_index import PrefixIndex
+from valyxo.core.autocomplete import CommandCompletionProvider
+from valyxo.core.plugins import ValyxoPlugin
+
+
+def test_prefix_index_queries_and_updates():
+    index = PrefixIndex([('git', 1), ('grep', 2), ('Go', 3), ('ls', 4)], fold=str.lower)
+    assert index.items_with_prefix('g') == [('git', 1), ('Go', 3), ('grep', 2)]
+    assert index.items_with_prefix('G', limit=2) == [('git', 1), ('Go', 3)]
+    assert index.count_with_prefix('gr') == 1
+    assert index.items_with_prefix('x') == []
+    index.add('gpg', 5)
+    assert index.remove('grep') and not index.remove('grep')
+    assert [key for key, _ in index.items_with_prefix('g')] == ['git', 'Go', 'gpg']
+    assert 'GIT' in index and index.get('ls') == 4
+
+    exact = PrefixIndex([('Make', 1), ('make', 2), ('mv', 3)], fold=str.lower, exact_keys=True)
+    assert exact.items_with_prefix('MA') == [('Make', 1), ('make', 2)]
+    assert exact.get('make') == 2 and 'MAKE' not in exact
+    assert exact.remove('Make') and exact.items_with_prefix('m') == [('make', 2), ('mv', 3)]
+
+
+class _FakePluginManager:
+    def __init__(self):
+        self.plugin_commands = {}
+        self.plugins = {}
+        self.listeners = []
+
+    def get_plugin(self, name):
+        return self.plugins.get(name)
+
+    def add_command_listener(self, listener):
+        self.listeners.append(listener)
+
+
+def test_command_completion_tracks_plugin_commands():
+    manager = _FakePluginManager()
+    plugin = ValyxoPlugin('weather', '1.0.0')
+    plugin.register_command('forecast', print, 'Show the forecast')
+    manager.plugins['weather'] = plugin
+    manager.plugin_commands['forecast'] = 'weather'
+
+    provider = CommandCompletionProvider()
+    provider.attach_plugins(manager)
+    completions = provider.get_completions('fo', 2, {})
+    assert [(c.text, c.description) for c in completions] == [('forecast', 'Show the forecast')]
+
+    for listener in manager.listeners:
+        listener('fortune', 'Print a fortune')
+        listener('forecast', None)
+        listener('ls', 'Plugin ls')
+    assert [c.text for c in provider.get_completions('fo', 2, {})] == ['fortune']
+    assert provider.get_completions('ls', 2, {})[0].description == 'List directory contents'
+    assert [c.text for c in provider.get_completions('git st', 6, {})] == ['stash', 'status']
+
+
+def test_history_log_and_frecency_completion(tmp_path):
+    from valyxo.core.history import ValyxoHistory
+    from valyxo.core.autocomplete import HistoryCompletionProvider
+    path = os.path.join(str(tmp_path), 'history.txt')
+    history = ValyxoHistory(path, ring_size=3)
+    now = 1_700_000_000
+    history.add('git status', when=now - 90 * 86400)
+    for _ in range(3):
+        history.add('git status', when=now - 90 * 86400)
+    history.add('git stash', when=now)
+    history.add('grep needle')
+    assert not os.path.exists(path)  # appends are batched
+    history.flush()
+
+    reloaded = ValyxoHistory(path, ring_size=3)
+    assert reloaded.load() == 6
+    assert reloaded.recent() == ['git status', 'git stash', 'grep needle']
+    assert reloaded.complete('GIT ST', limit=5)[0][0] == 'git status'
+
+    provider = HistoryCompletionProvider()
+    provider.update_history(reloaded)
+    reloaded.add('git stash')
+    reloaded.add('git stash')
+    texts = [c.text for c in provider.get_completions('git st', 6, {})]
+    assert texts == ['git stash', 'git status']
+
+
+def test_history_keeps_each_spelling(tmp_path):
+    from valyxo.core.history import ValyxoHistory
+    history = ValyxoHistory(None)
+    history.add('echo hello', when=1_700_000_000)
+    history.add('echo Hello', when=1_700_000_000)
+    history.add('echo Hello', when=1_700_000_000)
+    assert [command for command, _ in history.complete('echo H')] == ['echo Hello', 'echo hello']
+    assert history.index.get('echo Hello')[0] == 2 and history.index.get('echo hello')[0] == 1
+
+    path = os.path.join(str(tmp_path), 'history.txt')
+    with open(path, 'w') as f:
+        f.write('1700000000\t1\tcd Foo\n1700000000\t5\tcd foo\n')
+    loaded = ValyxoHistory(path)
+    loaded.load()
+    assert loaded.get_stats()['unique'] == 2
+    assert [command for command, _ in loaded.complete('CD F')] == ['cd foo', 'cd Foo']
+
+
+def test_fuzzy_completion_is_ranked_and_bounded(tmp_path):
+    from valyxo.core.autocomplete import ValyxoAutoComplete, rank_candidates
+    root = str(tmp_path)
+    for i in range(2000):
+        open(os.path.join(root, f'file_{i:04d}.txt'), 'w').close()
+    open(os.path.join(root, 'main_view.vs'), 'w').close()
+    open(os.path.join(root, 'mv.txt'), 'w').close()
+
+    ac = ValyxoAutoComplete()
+    completions = ac.get_completions('cat ', context={'cwd': root})
+    assert len(completions) == ac.max_results
+
+    texts = [c.text for c in ac.get_completions('cat mv', context={'cwd': root})]
+    assert texts[:2] == ['mv.txt', 'main_view.vs']
+
+    ranked = rank_candidates('gs', ['gs-tool'], lambda: ['git status', 'gs-tool', 'xyz'], 5)
+    assert [item for _, item in ranked] == ['gs-tool', 'git status']
+
+
+def test_session_narrows_cached_candidates(tmp_path):
+    from valyxo.core.autocomplete import ValyxoAutoComplete, FileCompletionProvider
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, 'src'))
+    for name in ('main.vs', 'makefile', 'notes.txt', 'src/util.vs'):
+        open(os.path.join(root, name), 'w').close()
+
+    listed = []
+    ac = ValyxoAutoComplete()
+    provider = next(p for p in ac.providers if isinstance(p, FileCompletionProvider))
+    original = provider._list_dir
+    provider._list_dir = lambda base: listed.append(base) or original(base)
+    session = ac.session
+    expected = [c.text for c in ac.get_completions('cat ma', context={'cwd': root})]
+    listed.clear()
+
+    steps = ['cat m', 'cat ma', 'cat main', 'cat ma']
+    results = [[c.text for c in session.get_completions(t, context={'cwd': root})] for t in steps]
+    assert results[2] == ['main.vs']
+    assert results[1] == results[3] == expected
+    assert listed == [root]
+
+    assert [c.text for c in session.get_completions('cat src/u', context={'cwd': root})] == ['util.vs']
+    assert [c.text for c in session.get_completions('rm ma', context={'cwd': root})][:2] == ['main.vs', 'makefile']
+    assert listed == [root, os.path.join(root, 'src'), root]
+
+    ac.reset()
+    assert session.get_stats()['cached_sets'] == 0
+
+
+def test_providers_run_under_deadline():
+    import threading
+    import time
+    from valyxo.core.autocomplete import ValyxoAutoComplete, CompletionProvider, Completion
+
+    release = threading.Event()
+
+    class SlowProvider(CompletionProvider):
+        def get_completions(self, text, cursor_pos, context):
+            release.wait(5)
+            return [Completion(text='late', display='late', score=10_000)]
+
+    class BrokenProvider(CompletionProvider):
+        def get_completions(self, text, cursor_pos, context):
+            raise OSError('mount gone')
+
+    ac = ValyxoAutoComplete(deadline=0.05)
+    ac.add_provider(SlowProvider())
+    ac.add_provider(BrokenProvider())
+
+    start = time.monotonic()
+    texts = [c.text for c in ac.get_completions('gi', context={'cwd': '/'})]
+    assert time.monotonic() - start < 1
+    assert 'git' in texts and 'late' not in texts
+    ac.get_completions('gi', context={'cwd': '/'})
+
+    release.set()
+    time.sleep(0.05)
+    stats = ac.get_stats()
+    assert stats['SlowProvider']['timeouts'] == 1 and stats['SlowProvider']['skipped'] == 1
+    assert stats['BrokenProvider']['errors'] == 2
+    assert stats['BrokenProvider']['last_error'] == 'OSError: mount gone'
+    assert stats['CommandCompletionProvider']['calls'] == 2
+
+
+def test_script_completion_follows_runtime_symbols():
+    from valyxo.script import ValyxoScriptRuntime
+    from valyxo.core.script_extensions import integrate_extensions, ValyxoArray
+    from valyxo.core.autocomplete import ValyxoAutoComplete
+
+    runtime = ValyxoScriptRuntime()
+    integrate_extensions(runtime)
+    ac = ValyxoAutoComplete(deadline=None)
+    ac.attach_script(runtime)
+    script = {'mode': 'script', 'cwd': '/'}
+
+    runtime.run_line('set counter = 10')
+    runtime.run_program('func greet(person) {\nprint person\n}')
+    runtime.run_line('greet(counter)')
+    runtime.vars['items'] = ValyxoArray([1, 2])
+
+    provider = ac.providers[-1]
+    assert 'person' not in provider.variables and 'counter' in provider.variables
+    texts = [c.text for c in ac.get_completions('print cou', context=dict(script))]
+    assert texts == ['counter']
+    assert [c.text for c in ac.get_completions('gre', context=dict(script))][0] == 'greet'
+    assert [c.text for c in ac.get_completions('items.pu', context=dict(script))][0] == 'items.push'
+    assert [c.text for c in ac.get_completions('sqr', context=dict(script))] == ['sqrt']
+    assert 'counter' not in [c.text for c in ac.get_completions('cou', context={'cwd': '/'})]
+
+
+def test_environment_snapshot_refreshes_on_demand(monkeypatch):
+    from valyxo.core.autocomplete import EnvironmentCompletionProvider
+    monkeypatch.setenv('VALYXO_TEST_ONE', 'x' * 40)
+    provider = EnvironmentCompletionProvider()
+    monkeypatch.setenv('VALYXO_TEST_TWO', '2')
+
+    completions = provider.get_completions('echo $valyxo_test', 17, {})
+    assert [c.text for c in completions] == ['VALYXO_TEST_ONE']
+    assert completions[0].description == 'x' * 30 + '...'
+
+    provider.refresh()
+    assert [c.text for c in provider.get_completions('echo $VALYXO_TEST', 17, {})] == \
+        ['VALYXO_TEST_ONE', 'VALYXO_TEST_TWO']
+
+
+def test_snippet_triggers_follow_manager_and_expand_lazily(tmp_path):
+    from valyxo.core.snippets import ValyxoSnippetManager
+    from valyxo.core.autocomplete import ValyxoAutoComplete
+    manager = ValyxoSnippetManager(str(tmp_path))
+    ac = ValyxoAutoComplete(deadline=None)
+    ac.update_snippets(manager)
+    script = {'mode': 'script', 'cwd': str(tmp_path)}
+
+    manager.add_snippet('loop9', 'lp9', 'for ${1:i} in 1 to ${2:10} {\n}', 'Counted loop')
+    completions = [c for c in ac.get_completions('lp9', context=dict(script)) if c.kind == 'snippet']
+    assert [(c.text, c.description) for c in completions] == [('lp9', 'Counted loop')]
+    assert manager.snippets['loop9'].use_count == 0
+
+    assert ac.complete('lp9', context=dict(script))[0] == 'for i in 1 to 10 {\n}'
+    assert manager.snippets['loop9'].use_count == 1
+
+    manager.edit_snippet('loop9', {'prefix': 'forn9'})
+    assert 'lp9' not in manager.triggers and manager.triggers.get('forn9') == ['loop9']
+    manager.delete_snippet('loop9')
+    assert 'forn9' not in manager.triggers
+    assert manager.triggers.get('class') == ['jsclass', 'pyclass']
+    assert not any(c.kind == 'snippet' for c in ac.get_completions('lp9', context={'cwd': str(tmp_path)}))
+
+
+def test_readline_completer_renders_snippets(tmp_path, monkeypatch):
+    import Valyxo
+    from valyxo.core.snippets import ValyxoSnippetManager
+    from valyxo.core.autocomplete import ValyxoAutoComplete
+    manager = ValyxoSnippetManager(str(tmp_path))
+    manager.add_snippet('loop9', 'lp9', 'for ${1:i} in 1 to ${2:10} {\n}', 'Counted loop')
+    manager.add_snippet('loop8', 'lp8', 'while ${1:ok} {\n}', 'While loop')
+
+    shell = Valyxo.ValyxoShell.__new__(Valyxo.ValyxoShell)
+    shell.autocomplete = ValyxoAutoComplete(deadline=None)
+    shell.autocomplete.update_snippets(manager)
+    shell.cwd = str(tmp_path)
+    shell.completion_mode = 'script'
+    buffer = {}
+
+    class FakeReadline:
+        @staticmethod
+        def get_line_buffer():
+            return buffer['line']
+
+        @staticmethod
+        def get_endidx():
+            return len(buffer['line'])
+
+    monkeypatch.setattr(Valyxo, 'readline', FakeReadline)
+
+    def matches(line):
+        buffer['line'] = line
+        word = line.rpartition(' ')[2]
+        found, state = [], 0
+        while True:
+            match = shell._readline_complete(word, state)
+            if match is None:
+                return found
+            found.append(match)
+            state += 1
+
+    assert 'lp8' in matches('lp') and 'lp9' in matches('lp')
+    assert manager.snippets['loop9'].use_count == 0
+    assert matches('lp9') == ['for i in 1 to 10 {\n}']
+    assert manager.snippets['loop9'].use_count == 1
+    shell.completion_mode = 'shell'
+    assert matches('lp9') == []
@@ -0,0 +1,82 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+from valyxo.core.dircache import ValyxoDirCache, entry_is_dir
+from valyxo.core.utils import page_lines
+import pytest
+
+
+def test_listing_is_cached_and_revalidated_by_mtime(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, 'sub'))
+    open(os.path.join(root, 'b.txt'), 'w').close()
+    cache = ValyxoDirCache()
+    listing = cache.get(root)
+    assert listing.names() == ['b.txt', 'sub']
+    assert entry_is_dir(listing.find('sub'))
+    assert cache.get(root) is listing
+
+    open(os.path.join(root, 'a.txt'), 'w').close()
+    os.utime(root, ns=(1, 1))
+    assert cache.get(root).names() == ['a.txt', 'b.txt', 'sub']
+    assert cache.get_stats()['misses'] == 2
+
+
+def test_lru_eviction_and_errors(tmp_path):
+    cache = ValyxoDirCache(capacity=2)
+    dirs = []
+    for name in ('one', 'two', 'three'):
+        path = os.path.join(str(tmp_path), name)
+        os.makedirs(path)
+        dirs.append(path)
+        cache.get(path)
+    assert cache.get_stats()['listings'] == 2
+    with pytest.raises(FileNotFoundError):
+        cache.get(os.path.join(str(tmp_path), 'missing'))
+
+
+def test_page_lines_stops_on_quit(monkeypatch, capsys):
+    answers = iter(['', 'q'])
+    monkeypatch.setattr('builtins.input', lambda _: next(answers))
+    produced = []
+
+    def lines():
+        for i in range(100):
+            produced.append(i)
+            yield str(i)
+
+    assert page_lines(lines(), page_size=3) is False
+    assert capsys.readouterr().out.split() == ['0', '1', '2', '3']
+    assert len(produced) == 5
+
+
+def test_ttl_skips_revalidation(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, 'sub'))
+    cache = ValyxoDirCache()
+    listing = cache.get(root, ttl=60)
+    assert listing.pairs() == [('sub', True)]
+
+    open(os.path.join(root, 'new.txt'), 'w').close()
+    os.utime(root, ns=(1, 1))
+    assert cache.get(root, ttl=60) is listing
+    assert cache.get(root).pairs() == [('new.txt', False), ('sub', True)]
+
+
+def test_cd_answers_from_fresh_listing_without_scanning(tmp_path, monkeypatch):
+    import Valyxo
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, 'sub'))
+    shell = Valyxo.ValyxoShell.__new__(Valyxo.ValyxoShell)
+    shell.dir_cache = ValyxoDirCache()
+
+    assert shell.dir_cache.peek(root, ttl=60) is None
+    assert shell._is_dir_cached(os.path.join(root, 'sub'))
+    assert not shell._is_dir_cached(os.path.join(root, 'missing'))
+    assert shell.dir_cache.get_stats()['misses'] == 0  # a cold cd does not list the parent
+
+    listing = shell.dir_cache.get(root)
+    assert shell.dir_cache.peek(root, ttl=60) is listing
+    monkeypatch.setattr(Valyxo.os.path, 'isdir', lambda path: pytest.fail('stat on a warm cd'))
+    assert shell._is_dir_cached(os.path.join(root, 'sub'))
+    assert shell.dir_cache.peek(root, ttl=0) is None
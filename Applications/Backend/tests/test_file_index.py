@@ -0,0 +1,49 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+from valyxo.core.fuzzy import fuzzy_match, fuzzy_score, fuzzy_top_k
+from valyxo.core.file_index import ValyxoFileIndex
+from valyxo.core.autocomplete import FileCompletionProvider
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').close()
+
+
+def test_fuzzy_prefers_boundaries_and_runs():
+    assert fuzzy_score('xyz', 'abc') is None
+    score, positions = fuzzy_match('mv', 'main.vs')
+    assert positions == [0, 5]
+    assert fuzzy_score('main', 'src/main.vs') > fuzzy_score('main', 'src/domain.vs')
+    assert fuzzy_score('fb', 'foo_bar') > fuzzy_score('fb', 'fooxbar')
+    # smart case
+    assert fuzzy_score('Abc', 'abc') is None
+    top = fuzzy_top_k('ab', ['xaxb', 'ab', 'a_b', 'zzz'], 2)
+    assert [item for _, item in top] == ['ab', 'a_b']
+
+
+def test_index_find_and_incremental_refresh(tmp_path):
+    root = str(tmp_path)
+    _touch(os.path.join(root, 'Projects', 'Main', 'main.vs'))
+    _touch(os.path.join(root, 'Projects', 'Demo', 'demo_app.py'))
+    _touch(os.path.join(root, 'Projects', 'Demo', '.git', 'HEAD'))
+    index = ValyxoFileIndex(root, max_workers=2)
+    assert index.build() == 6
+    assert index.find('demoapp')[0][1] == os.path.join(root, 'Projects', 'Demo', 'demo_app.py')
+    assert not index.find('HEAD')
+
+    assert index.refresh() == 0
+    _touch(os.path.join(root, 'Projects', 'Main', 'lib', 'util.vs'))
+    assert index.refresh() == 1
+    assert index.find('util')[0][1] == os.path.join(root, 'Projects', 'Main', 'lib', 'util.vs')
+
+
+def test_file_completion_uses_index(tmp_path):
+    root = str(tmp_path)
+    _touch(os.path.join(root, 'alpha.vs'))
+    os.makedirs(os.path.join(root, 'assets'))
+    index = ValyxoFileIndex(root)
+    provider = FileCompletionProvider(index)
+    texts = sorted(c.text for c in provider.get_completions('cat a', 5, {'cwd': root}))
+    assert texts == ['alpha.vs', 'assets/']
@@ -0,0 +1,338 @@
+import os
+import sys
+import subprocess
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+from valyxo.core.git import ValyxoGit
+from valyxo.core.git_worker import ValyxoGitWorkerPool
+
+
+def _git(repo, *args, day=1):
+    date = f'2024-03-0{day} 12:00:00 +0200'
+    env = dict(os.environ, GIT_AUTHOR_NAME='Tester', GIT_AUTHOR_EMAIL='t@example.com',
+               GIT_COMMITTER_NAME='Tester', GIT_COMMITTER_EMAIL='t@example.com',
+               GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    return subprocess.run(['git'] + list(args), cwd=repo, env=env, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def test_log_show_and_cat_file_workers(tmp_path):
+    repo = str(tmp_path)
+    _git(repo, 'init', '-q')
+    os.makedirs(os.path.join(repo, 'src'))
+    for i in range(1, 4):
+        with open(os.path.join(repo, 'src', 'main.vs'), 'w') as f:
+            f.write(f'print {i}\n')
+        _git(repo, 'add', '-A')
+        _git(repo, 'commit', '-q', '-m', f'Change {i}\n\nBody line {i}', day=i)
+
+    pool = ValyxoGitWorkerPool()
+    git = ValyxoGit(os.path.join(repo, 'src'), workers=pool)
+    try:
+        assert git.log(2) == _git(repo, 'log', '-2', '--oneline', '--no-decorate', '--abbrev=7')
+        assert git.log(5, oneline=False) == _git(repo, 'log', '-5', '--no-decorate')
+        assert git.show_file('main.vs') == 'print 3\n'
+        assert git.show('HEAD~2:main.vs') == 'print 1\n'
+        assert git.show_file('missing.vs').startswith('✗')
+        assert git.resolve('HEAD~1') == _git(repo, 'rev-parse', 'HEAD~1')
+        assert git.read_commit('HEAD').parents == [_git(repo, 'rev-parse', 'HEAD~1')]
+
+        worker = pool.get(os.path.join(repo, 'src'))
+        assert worker.read('HEAD~1:src/main.vs').data == b'print 2\n'
+        assert [c.subject for c in worker.walk('HEAD', 2)] == ['Change 3', 'Change 2']
+        stats = pool.get_stats()
+        assert stats['repos'] == 1 and stats['processes_started'] == 1
+        worker.batch._proc.kill()
+        assert worker.read('HEAD:src/main.vs').data == b'print 3\n'
+        assert pool.get_stats()['processes_started'] == 2
+
+        # misses echo the spec, spaces included, without upsetting the worker
+        assert worker.read('HEAD:src/no such file.vs') is None
+        assert worker.resolve(':/no such message') is None
+        assert worker.read('no such') is None and worker.resolve('no such') is None
+        assert worker.resolve(':/Change 2').startswith(_git(repo, 'rev-parse', 'HEAD~1'))
+        assert worker.info('HEAD:src/main.vs').type == 'blob'
+        assert pool.get_stats()['processes_started'] == 3
+    finally:
+        git.close()
+    assert pool.get_stats()['repos'] == 0
+
+
+def test_porcelain_v2_parsing():
+    from valyxo.core.git import parse_porcelain_v2
+    snapshot = parse_porcelain_v2('\n'.join([
+        '# branch.oid 1234567890abcdef1234567890abcdef12345678',
+        '# branch.head main',
+        '# branch.upstream origin/main',
+        '# branch.ab +2 -1',
+        '1 M. N... 100644 100644 100644 aaa bbb staged.vs',
+        '1 MM N... 100644 100644 100644 aaa bbb both.vs',
+        '2 R. N... 100644 100644 100644 aaa bbb R100 new.vs\told.vs',
+        '1 .M N... 100644 100644 100644 aaa bbb edited.vs',
+        'u UU N... 100644 100644 100644 100644 aaa bbb ccc conflict.vs',
+        '? notes.txt',
+        '! build.log',
+    ]))
+    assert (snapshot.branch, snapshot.upstream, snapshot.ahead, snapshot.behind) == ('main', 'origin/main', 2, 1)
+    assert (snapshot.staged, snapshot.unstaged, snapshot.untracked, snapshot.conflicted) == (3, 2, 1, 1)
+    assert snapshot.changes == 6
+    assert snapshot.prompt_segment() == 'main*↑2↓1'
+    assert parse_porcelain_v2('# branch.oid (initial)\n# branch.head (detached)').prompt_segment() == 'HEAD'
+
+
+def test_status_snapshot_is_cached_until_index_or_head_moves(tmp_path):
+    repo = str(tmp_path)
+    _git(repo, 'init', '-q')
+    with open(os.path.join(repo, 'a.vs'), 'w') as f:
+        f.write('print 1\n')
+    git = ValyxoGit(repo, workers=ValyxoGitWorkerPool())
+
+    first = git.status_snapshot(ttl=60)
+    assert first.commit is None and first.untracked == 1
+    assert git.status_snapshot(ttl=60) is first and git.status_runs == 1
+
+    _git(repo, 'add', 'a.vs')
+    staged = git.status_snapshot(ttl=60)
+    assert (staged.staged, staged.untracked, git.status_runs) == (1, 0, 2)
+
+    _git(repo, 'commit', '-q', '-m', 'First')
+    info = git.get_repo_info()
+    assert info['commit'] == _git(repo, 'rev-parse', '--short=7', 'HEAD')
+    assert info['changes'] == 0 and info['remote'] is None and git.status_runs == 3
+
+    _git(repo, 'remote', 'add', 'origin', 'https://example.com/repo.git')
+    assert git.get_repo_info()['remote'] == 'https://example.com/repo.git'
+    assert git.status_snapshot(str(tmp_path / 'elsewhere'), ttl=60) is not None
+    assert git.status_snapshot(ttl=0).changes == 0 and git.status_runs == 3
+    with open(os.path.join(repo, 'a.vs'), 'a') as f:
+        f.write('print 2\n')
+    assert git.status_snapshot(ttl=0).unstaged == 1 and git.status_runs == 4
+
+
+def test_object_store_reads_packs_and_refs(tmp_path):
+    from valyxo.core.git_objects import GitObjectStore, GitReadUnsupported
+    repo = str(tmp_path)
+    _git(repo, 'init', '-q', '-b', 'main')
+    body = ''.join(f'line {n}\n' for n in range(400))
+    for i in range(1, 6):
+        with open(os.path.join(repo, 'big.vs'), 'w') as f:
+            f.write(body + f'tail {i}\n')
+        _git(repo, 'add', '-A')
+        _git(repo, 'commit', '-q', '-m', f'Version {i}', day=i)
+    _git(repo, 'tag', '-a', 'v1', '-m', 'First release', 'HEAD~3')
+    _git(repo, 'branch', 'feature', 'HEAD~1')
+    _git(repo, 'update-ref', 'refs/remotes/origin/main', 'HEAD')
+    _git(repo, 'symbolic-ref', 'refs/remotes/origin/HEAD', 'refs/remotes/origin/main')
+    _git(repo, 'gc', '-q', '--aggressive')
+    assert not os.path.exists(os.path.join(repo, '.git', 'refs', 'tags', 'v1'))
+
+    store = GitObjectStore(os.path.join(repo, '.git'))
+    head = _git(repo, 'rev-parse', 'HEAD')
+    assert store.head() == ('main', head)
+    for rev in ('HEAD~2', 'v1', 'v1^0', 'feature^', 'main~1^1', head[:7]):
+        assert store.resolve(rev) == _git(repo, 'rev-parse', rev)
+    assert store.read('HEAD~4:big.vs').data.decode() == body + 'tail 1\n'
+    assert store.read_commit('v1').subject == 'Version 2'
+    assert store.resolve('nope') is None
+    try:
+        store.resolve('HEAD@{1}')
+    except GitReadUnsupported:
+        pass
+    else:
+        raise AssertionError('reflog syntax should need git')
+
+    git = ValyxoGit(repo, workers=ValyxoGitWorkerPool())
+    assert git.log(10) == _git(repo, 'log', '-10', '--oneline', '--no-decorate', '--abbrev=7')
+    assert git.branch() == '  feature\n* main\n  remotes/origin/HEAD -> origin/main\n  remotes/origin/main'
+    assert git.get_current_branch() == 'main'
+    assert git.workers.get_stats()['processes_started'] == 0
+    git.close()
+
+
+def test_status_all_discovers_and_summarizes_repositories(tmp_path):
+    from valyxo.core.git import discover_repos, format_status_table
+    root = str(tmp_path)
+    for name in ('alpha', 'group/beta', 'group/gamma'):
+        path = os.path.join(root, name)
+        os.makedirs(path)
+        _git(path, 'init', '-q', '-b', 'main')
+    os.makedirs(os.path.join(root, 'alpha', 'nested'))
+    _git(os.path.join(root, 'alpha', 'nested'), 'init', '-q')
+    os.makedirs(os.path.join(root, 'notes', '.hidden'))
+    open(os.path.join(root, 'group', 'beta', 'todo.txt'), 'w').close()
+
+    expected = [os.path.join(root, name) for name in ('alpha', 'group/beta', 'group/gamma')]
+    assert discover_repos(root) == expected
+    assert discover_repos(root, max_depth=1) == expected[:1]
+
+    git = ValyxoGit(root, workers=ValyxoGitWorkerPool())
+    results = list(git.status_all(root, max_workers=2))
+    assert sorted(path for path, _ in results) == expected
+    snapshots = dict(results)
+    assert snapshots[expected[1]].untracked == 1 and snapshots[expected[2]].changes == 0
+
+    table = format_status_table(results, root).split('\n')
+    assert table[0].split() == ['Repository', 'Branch', 'Sync', 'Staged', 'Unstaged', 'Untracked']
+    assert table[3].split() == ['group/beta', 'main', '-', '0', '0', '1']
+    assert table[-1] == '3 repositories, 2 with changes'
+
+
+def test_streamed_log_and_diff_stop_with_the_consumer(tmp_path):
+    repo = str(tmp_path)
+    _git(repo, 'init', '-q')
+    for i in range(1, 4):
+        with open(os.path.join(repo, 'notes.txt'), 'w') as f:
+            f.write(''.join(f'{n}\n' for n in range(i * 1000)))
+        _git(repo, 'add', '-A')
+        _git(repo, 'commit', '-q', '-m', f'Grow {i}', day=i)
+    git = ValyxoGit(repo, workers=ValyxoGitWorkerPool())
+
+    lines = git.log_lines(oneline=False)
+    assert next(lines) == 'commit ' + _git(repo, 'rev-parse', 'HEAD')
+    lines.close()
+    assert list(git.log_lines(count=2)) == _git(repo, 'log', '-2', '--oneline', '--abbrev=7').split('\n')
+
+    with open(os.path.join(repo, 'notes.txt'), 'a') as f:
+        f.write(''.join(f'extra {n}\n' for n in range(50_000)))
+    diff = git.diff_lines()
+    head = [next(diff) for _ in range(5)]
+    assert head[0] == 'diff --git a/notes.txt b/notes.txt'
+    diff.close()
+    assert git.diff(staged=True) == 'No changes'
+    assert list(git._stream_git(['log', 'no-such-rev']))[-1].startswith('✗ ')
+
+
+def test_network_commands_run_as_background_jobs(tmp_path):
+    import threading
+    from valyxo.core.jobs import ValyxoJobsManager
+    source = str(tmp_path / 'source')
+    os.makedirs(source)
+    _git(source, 'init', '-q')
+    with open(os.path.join(source, 'a.vs'), 'w') as f:
+        f.write('print 1\n')
+    _git(source, 'add', '-A')
+    _git(source, 'commit', '-q', '-m', 'First')
+
+    jobs = ValyxoJobsManager()
+    git = ValyxoGit(str(tmp_path), workers=ValyxoGitWorkerPool())
+    clone = git.clone_async(jobs, 'file://' + source, 'copy')
+    failing = git.push_async(jobs, 'nowhere')
+    for job in (clone, failing):
+        jobs.get_job(job)['thread'].join(10)
+    assert '100% (3/3)' in jobs.get_jobs()[0]['progress']
+
+    finished = {job['pid']: job for job in jobs.pop_finished()}
+    assert finished[clone]['status'] == 'done'
+    assert finished[clone]['result'] == f'✓ Cloned file://{source}'
+    assert finished[failing]['status'] == 'failed' and finished[failing]['result'].startswith('✗')
+    assert os.path.exists(tmp_path / 'copy' / 'a.vs')
+    assert jobs.pop_finished() == [] and jobs.get_jobs() == []
+
+    release = threading.Event()
+
+    def slow(pid):
+        jobs.set_cancel(pid, release.set)
+        release.wait(10)
+        return 'finished'
+
+    pid = jobs.start_job('slow task', slow)
+    assert jobs.kill_job(pid)
+    jobs.get_job(pid)['thread'].join(10)
+    assert jobs.pop_finished()[0]['status'] == 'cancelled'
+    assert not jobs.kill_job(pid)
+
+
+def test_blame_cache_reblames_only_changed_hunks(tmp_path):
+    repo = str(tmp_path)
+    _git(repo, 'init', '-q')
+    lines = [f'line {n}' for n in range(200)]
+
+    def commit(day, message):
+        with open(os.path.join(repo, 'big.vs'), 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        _git(repo, 'add', '-A')
+        _git(repo, 'commit', '-q', '-m', message, day=day)
+        return _git(repo, 'rev-parse', 'HEAD')
+
+    first = commit(1, 'Initial')
+    git = ValyxoGit(repo, workers=ValyxoGitWorkerPool())
+    assert git.blame_cache.line('big.vs', 10).commit.sha == first
+    assert git.blame_cache.blame('big.vs')[0].commit.summary == 'Initial'
+    assert git.blame_cache.stats['full'] == 1 and git.blame_cache.stats['hits'] == 1
+
+    lines[50] = 'changed'
+    lines[120:122] = []
+    lines.append('appended')
+    second = commit(2, 'Edit')
+    blamed = git.blame_cache.blame('big.vs')
+    assert git.blame_cache.stats['partial'] == 1 and git.blame_cache.stats['lines_blamed'] == 200 + 2
+
+    porcelain = _git(repo, 'blame', '--line-porcelain', 'HEAD', '--', 'big.vs').split('\n')
+    expected = [row.split()[0] for row in porcelain if len(row) > 40 and row[40:41] == ' ' and row[:40].isalnum()]
+    assert [b.commit.sha for b in blamed] == expected
+    assert blamed[50].commit.sha == second and blamed[50].text == 'changed'
+    assert git.blame_cache.line('big.vs', 199).commit.sha == second
+    assert [(c.summary, n) for c, n in git.blame_cache.history('big.vs')] == [('Edit', 2), ('Initial', 197)]
+
+    with open(os.path.join(repo, 'feed.vs'), 'wb') as f:
+        f.write(b'one\x0ctwo\r\nthree\n')
+    _git(repo, 'add', '-A')
+    _git(repo, 'commit', '-q', '-m', 'Form feed', day=3)
+    third = _git(repo, 'rev-parse', 'HEAD')
+    blamed = git.blame_cache.blame('feed.vs')
+    assert [(b.line, b.text) for b in blamed] == [(1, 'one\x0ctwo\r'), (2, 'three')]
+    assert all(b.commit.sha == third for b in blamed)
+
+    text = git.blame('big.vs', 51)
+    assert text.startswith(second[:8] + ' (Tester 2024-03-02 12:00:00 +0200 51) changed')
+    assert git.blame('missing.vs').startswith('✗')
+
+
+def test_change_detector_compares_work_tree_with_index(tmp_path):
+    import time
+    from valyxo.core.git_index import GitIndex, ValyxoChangeDetector
+    repo = str(tmp_path)
+    _git(repo, 'init', '-q')
+    os.makedirs(os.path.join(repo, 'src', 'deep'))
+    names = ['README.md', 'src/main.vs', 'src/deep/util.vs', 'src/deep/longer_name_util.vs']
+    for name in names:
+        with open(os.path.join(repo, name), 'w') as f:
+            f.write(f'{name}\n')
+    _git(repo, 'add', '-A')
+    _git(repo, 'commit', '-q', '-m', 'First')
+    time.sleep(0.01)
+    _git(repo, 'update-index', '--refresh')
+
+    for version in ('2', '4'):
+        _git(repo, 'update-index', '--index-version', version)
+        index = GitIndex(os.path.join(repo, '.git', 'index'))
+        assert [e.path for e in index.entries] == sorted(names)
+        assert index.entries[0].sha == _git(repo, 'rev-parse', 'HEAD:README.md')
+
+    detector = ValyxoChangeDetector(repo)
+    assert detector.changed_since_last_check() and not detector.changed_since_last_check()
+    assert detector.check().modified == []
+
+    main = os.path.join(repo, 'src', 'main.vs')
+    stat = os.stat(main)
+    with open(main, 'w') as f:
+        f.write('src/MAIN.vs\n')  # same size
+    os.utime(main, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    os.remove(os.path.join(repo, 'src', 'deep', 'util.vs'))
+    report = detector.check()
+    assert report.modified == ['src/main.vs'] and report.deleted == ['src/deep/util.vs']
+    assert report.dirs_changed == ['src/deep']
+
+    with open(main, 'w') as f:
+        f.write('src/main.vs\n')  # back to the committed contents, new mtime
+    open(os.path.join(repo, 'src', 'new.txt'), 'w').close()
+    report = detector.check()
+    assert report.modified == [] and report.dirs_changed == ['src']
+    assert not detector.changed_since_last_check()
+
+    readme = os.path.join(repo, 'README.md')
+    os.chmod(readme, 0o755)
+    assert detector.changed_since_last_check()
+    assert detector.check().modified == ['README.md']
+    assert _git(repo, 'status', '--porcelain', 'README.md') == 'M README.md'
+    _git(repo, 'config', 'core.fileMode', 'false')
+    assert detector.check().modified == []
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+from valyxo.core.plugins import ValyxoPluginManager
+
+
+def _write_plugin(root, name, manifest, body):
+    plugin_dir = os.path.join(root, name)
+    os.makedirs(plugin_dir, exist_ok=True)
+    with open(os.path.join(plugin_dir, 'plugin.json'), 'w') as f:
+        json.dump(manifest, f)
+    with open(os.path.join(plugin_dir, 'main.py'), 'w') as f:
+        f.write(body)
+
+
+def test_manifest_commands_import_plugin_lazily(tmp_path):
+    plugins_dir = str(tmp_path / 'plugins')
+    state_path = str(tmp_path / 'plugins.json')
+    log = str(tmp_path / 'imports.log')
+    body = (f"open({log!r}, 'a').write('NAME\\n')\n"
+            "commands = {'weather': {'handler': lambda args: 'sunny ' + args, 'help': 'Forecast'}}\n")
+    _write_plugin(plugins_dir, 'sky', {'name': 'sky', 'commands': {'weather': 'Forecast'}}, body.replace('NAME', 'sky'))
+    _write_plugin(plugins_dir, 'old', {'name': 'old'}, body.replace('NAME', 'old').replace('weather', 'legacy'))
+
+    manager = ValyxoPluginManager(plugins_dir, state_path)
+    heard = []
+    manager.add_command_listener(lambda cmd, help_text: heard.append((cmd, help_text)))
+    assert manager.discover() == ['old', 'sky']
+    assert ('weather', 'Forecast') in heard
+    # only the plugin without declared commands was imported
+    assert open(log).read().split() == ['old']
+    assert manager.has_command('legacy') and manager.has_command('weather')
+
+    assert manager.execute_command('weather', 'today') == 'sunny today'
+    assert manager.execute_command('weather', 'again') == 'sunny again'
+    assert open(log).read().split() == ['old', 'sky']
+    assert [p['loaded'] for p in manager.list_plugins()] == [True, True]
+
+    assert manager.disable_plugin('sky').startswith('✓')
+    assert not manager.has_command('weather')
+
+    # A new session reuses the cached manifests and the disabled state
+    again = ValyxoPluginManager(plugins_dir, state_path)
+    again.discover()
+    assert again.get_stats()['manifests_parsed'] == 0
+    assert not again.has_command('weather')
+    again.enable_plugin('sky')
+    assert again.has_command('weather') and 'sky' not in again.plugins
+
+    _write_plugin(plugins_dir, 'sky', {'name': 'sky', 'commands': ['weather', 'rain']}, body.replace('NAME', 'sky'))
+    again.discover()
+    assert again.get_stats()['manifests_parsed'] == 1
+    assert again.execute_command('rain', '') == '✗ Plugin sky does not provide command: rain'
+
+
+def test_isolated_plugins_run_in_worker_processes(tmp_path):
+    import time
+    import threading
+    plugins_dir = str(tmp_path / 'plugins')
+    body = (
+        "import os, time\n"
+        "def slow(args):\n"
+        "    time.sleep(float(args))\n"
+        "    return 'slept'\n"
+        "def shout(args):\n"
+        "    print('pid', os.getpid())\n"
+        "    return args.upper()\n"
+        "def ask(args):\n"
+        "    return input()\n"
+        "def boom(args):\n"
+        "    raise RuntimeError('bad input')\n"
+        "commands = {\n"
+        "    'slow': {'handler': slow},\n"
+        "    'shout': {'handler': shout},\n"
+        "    'boom': {'handler': boom},\n"
+        "    'ask': {'handler': ask},\n"
+        "    'crash': {'handler': lambda args: os._exit(3)},\n"
+        "}\n"
+    )
+    _write_plugin(plugins_dir, 'heavy', {'name': 'heavy', 'isolated': True,
+                                         'commands': ['slow', 'shout', 'boom', 'crash', 'ask']}, body)
+    manager = ValyxoPluginManager(plugins_dir, str(tmp_path / 'plugins.json'))
+    manager.discover()
+    try:
+        assert manager.is_isolated_command('shout')
+        output = manager.execute_command('shout', 'hi')
+        assert output.endswith('HI') and f'pid {os.getpid()}' not in output
+        assert 'heavy' not in manager.plugins and manager.load_plugin('heavy')
+
+        assert manager.execute_command('boom', '') == '✗ RuntimeError: bad input'
+        assert manager.execute_command('crash', '').startswith('✗ plugin worker for heavy crashed')
+        assert manager.execute_command('shout', 'again').endswith('AGAIN')
+
+        results = []
+        start = time.monotonic()
+        threads = [threading.Thread(target=lambda: results.append(manager.run_isolated('slow', '0.5')))
+                   for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == ['slept', 'slept'] and time.monotonic() - start < 0.95
+
+        assert manager.execute_command('ask', '') == '✗ EOFError: EOF when reading a line'
+        assert manager.execute_command('shout', 'still').endswith('STILL')
+
+        host = manager.host
+        host.timeout = 0.2
+        assert manager.run_isolated('slow', '5') == '✗ slow timed out after 0.2s'
+        host.timeout = 10
+        assert manager.run_isolated('shout', 'back').endswith('BACK')
+        stats = manager.get_stats()['host']
+        assert stats['crashes'] == 1 and stats['timeouts'] == 1 and stats['workers'] <= 2
+    finally:
+        manager.close()
+    assert manager.host is None
+
+    from valyxo.core.plugin_host import ValyxoPluginHost, PluginHostError
+    host = ValyxoPluginHost(plugins_dir, max_workers=1)
+    try:
+        stop = threading.Event()
+        busy = threading.Thread(target=lambda: results.append(host.call('heavy', 'slow', '0.6')))
+        busy.start()
+        time.sleep(0.1)
+        threading.Timer(0.1, stop.set).start()
+        start = time.monotonic()
+        with pytest.raises(PluginHostError, match='cancelled while waiting'):
+            host.call('heavy', 'shout', 'x', should_stop=stop.is_set)
+        assert time.monotonic() - start < 0.4
+        busy.join()
+        assert results[-1] == 'slept'
+
+        # killed after the worker was acquired but before the request was sent
+        stopped = threading.Event()
+        with pytest.raises(PluginHostError, match='shout cancelled'):
+            host.call('heavy', 'shout', 'x', on_start=lambda kill: stopped.set(), should_stop=stopped.is_set)
+        assert host.call('heavy', 'shout', 'y').endswith('Y')
+        assert host.get_stats()['started'] == 1
+    finally:
+        host.close()
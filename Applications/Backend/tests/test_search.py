@@ -0,0 +1,67 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+from valyxo.core.search import ValyxoSearch, ValyxoSearchError, IgnoreRules
+import pytest
+
+
+def _write(path, content, mode='w'):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode) as f:
+        f.write(content)
+
+
+def test_regex_search_is_ordered_and_skips_binary(tmp_path):
+    root = str(tmp_path)
+    _write(os.path.join(root, 'b.txt'), 'nothing\nvalue = 42\n')
+    _write(os.path.join(root, 'a.txt'), 'value = 1\nother\nvalue = 2\n')
+    _write(os.path.join(root, 'blob.bin'), b'value = 3\x00\x01', mode='wb')
+    engine = ValyxoSearch(max_workers=4)
+    results = [(os.path.basename(m.path), m.line_number, m.line)
+               for m in engine.search(r'value = \d+', root)]
+    assert results == [('a.txt', 1, 'value = 1'), ('a.txt', 3, 'value = 2'), ('b.txt', 2, 'value = 42')]
+    assert engine.get_stats()['binary_skipped'] == 1
+
+
+def test_gitignore_and_excludes(tmp_path):
+    root = str(tmp_path)
+    _write(os.path.join(root, '.gitignore'), 'build/\n*.log\n!keep.log\n')
+    _write(os.path.join(root, 'build', 'out.txt'), 'needle\n')
+    _write(os.path.join(root, 'debug.log'), 'needle\n')
+    _write(os.path.join(root, 'keep.log'), 'needle\n')
+    _write(os.path.join(root, 'src', 'main.vs'), 'needle\n')
+    _write(os.path.join(root, 'src', 'skip.vs'), 'needle\n')
+    engine = ValyxoSearch(max_workers=1)
+    found = sorted(os.path.relpath(m.path, root).replace('\\', '/')
+                   for m in engine.search('needle', root, excludes=['src/skip.vs']))
+    assert found == ['keep.log', 'src/main.vs']
+
+
+def test_ignore_case_fixed_and_invalid_pattern(tmp_path):
+    path = os.path.join(str(tmp_path), 'x.txt')
+    _write(path, 'A.B\naxb\n')
+    engine = ValyxoSearch()
+    assert [m.line for m in engine.search('a.b', path, ignore_case=True, fixed=True)] == ['A.B']
+    with pytest.raises(ValyxoSearchError):
+        list(engine.search('(', path))
+
+
+def test_ignore_rules_anchoring():
+    rules = IgnoreRules(['/top.txt', 'docs/*.md', '**/cache'])
+    assert rules.is_ignored('top.txt', False)
+    assert not rules.is_ignored('sub/top.txt', False)
+    assert rules.is_ignored('docs/a.md', False)
+    assert not rules.is_ignored('docs/deep/a.md', False)
+    assert rules.is_ignored('a/b/cache', True)
+
+
+def test_empty_matches_stop_at_end_of_file():
+    import re
+    from valyxo.core.search import _search_buffer
+    blank = re.compile(rb'^$', re.MULTILINE)
+    anything = re.compile(rb'.*', re.MULTILINE)
+    assert _search_buffer(b'a\n\nb\n', blank) == [(2, '')]
+    assert _search_buffer(b'a\n\nb\n', anything) == [(1, 'a'), (2, ''), (3, 'b')]
+    assert _search_buffer(b'a\nb', anything) == [(1, 'a'), (2, 'b')]
+    assert _search_buffer(b'a\n', re.compile(rb'x*')) == [(1, 'a')]
+    assert _search_buffer(b'', anything) == []
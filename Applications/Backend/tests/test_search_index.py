@@ -0,0 +1,89 @@
+import os
+import sys
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+from valyxo.core.search_index import ValyxoSearchIndex, required_literals
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def test_required_literals_are_conservative():
+    assert required_literals(r'def\s+main_loop') == [b'def', b'main_loop']
+    assert required_literals(r'colou?r_name') == [b'colo', b'r_name']
+    assert required_literals(r'foo|barbaz') == []
+    assert required_literals(r'(optional)?suffix') == [b'suffix']
+    assert required_literals('A.B.C', fixed=True) == [b'a.b.c']
+    assert required_literals(r'\x41bcd') == [b'bcd']
+    assert required_literals(r'\101bc') == []
+    assert required_literals(r'\u00e9t\U000000e9_caf\N{LATIN SMALL LETTER E}_bar') == [b'_caf', b'_bar']
+
+
+def test_escape_sequences_do_not_filter_out_matches(tmp_path):
+    from valyxo.core.search import ValyxoSearch
+    root = os.path.join(str(tmp_path), 'Projects')
+    _write(os.path.join(root, 'a.txt'), 'Abcd and ABCD\n')
+    _write(os.path.join(root, 'c.txt'), 'xyzzy xyzzy-tail\n')
+    index = ValyxoSearchIndex(root, os.path.join(str(tmp_path), 'index.json'))
+    index.update()
+    search = ValyxoSearch()
+    patterns = [r'\x41bcd', r'\101bcd', r'(xyzzy) \1-tail', r'\x41\x42CD', r'\0?\x78yzzy']
+    for pattern in patterns:
+        plain = [(m.path, m.line_number) for m in search.search(pattern, root)]
+        indexed = [(m.path, m.line_number)
+                   for m in search.search(pattern, root, files=index.candidates(pattern, root))]
+        assert plain and indexed == plain, pattern
+
+
+def test_index_narrows_and_updates_incrementally(tmp_path):
+    root = os.path.join(str(tmp_path), 'Projects')
+    index_path = os.path.join(str(tmp_path), 'index.json')
+    _write(os.path.join(root, 'a', 'one.vs'), 'set needle_value = 1\n')
+    _write(os.path.join(root, 'b', 'two.vs'), 'print "hello"\n')
+
+    index = ValyxoSearchIndex(root, index_path)
+    assert index.update()['added'] == 2
+    assert index.candidates('needle_value', root) == [os.path.join(root, 'a', 'one.vs')]
+    assert index.candidates('NEEDLE', root, ignore_case=True) == [os.path.join(root, 'a', 'one.vs')]
+    assert index.candidates('n.', root) is None
+
+    _write(os.path.join(root, 'b', 'two.vs'), 'print needle_value\n')
+    os.utime(os.path.join(root, 'b', 'two.vs'), ns=(1, 1))
+    reloaded = ValyxoSearchIndex(root, index_path)
+    result = reloaded.update()
+    assert (result['updated'], result['unchanged']) == (1, 1)
+    assert len(reloaded.candidates('needle_value', root)) == 2
+    assert reloaded.candidates('needle_value', os.path.join(root, 'b')) == [os.path.join(root, 'b', 'two.vs')]
+    assert reloaded.get_stats()['files'] == 2
+
+
+    _write(os.path.join(root, 'a', 'one.vs'), 'set needle_value = 22\n')
+    before = os.stat(index_path).st_mtime_ns
+    assert reloaded.update(save=False)['updated'] == 1 and reloaded.unsaved
+    assert os.stat(index_path).st_mtime_ns == before
+    reloaded.flush()
+    assert not reloaded.unsaved and ValyxoSearchIndex(root, index_path).update(save=False)['updated'] == 0
+
+
+def test_watched_update_rechecks_only_reported_paths(tmp_path):
+    from valyxo.core.watcher import ValyxoFileWatcher
+    watcher = ValyxoFileWatcher('inotify')
+    if not watcher.native:
+        pytest.skip('inotify backend not available')
+    root = os.path.join(str(tmp_path), 'Projects')
+    _write(os.path.join(root, '.gitignore'), 'build/\n')
+    _write(os.path.join(root, 'a', 'one.vs'), 'set needle_value = 1\n')
+    index = ValyxoSearchIndex(root, os.path.join(str(tmp_path), 'index.json'))
+    index.attach_watcher(watcher)
+    assert index.update()['added'] == 2
+
+    _write(os.path.join(root, 'c', 'three.vs'), 'print needle_value\n')
+    _write(os.path.join(root, 'build', 'out.vs'), 'needle_value\n')
+    os.remove(os.path.join(root, 'a', 'one.vs'))
+    result = index.update()
+    assert (result['added'], result['removed'], result['unchanged']) == (1, 1, 1)
+    assert index.candidates('needle_value', root) == [os.path.join(root, 'c', 'three.vs')]
+    watcher.close()
@@ -0,0 +1,81 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python-core')))
+from valyxo.core.watcher import ValyxoFileWatcher, WatchedCache
+from valyxo.core.file_index import ValyxoFileIndex
+import pytest
+
+
+def _touch(path, data=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(data)
+
+
+@pytest.mark.parametrize('backend', ['inotify', 'polling'])
+def test_events_are_coalesced_and_recursive(tmp_path, backend):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, 'src'))
+    os.makedirs(os.path.join(root, 'node_modules'))
+    watcher = ValyxoFileWatcher(backend)
+    if watcher.backend_name != backend:
+        pytest.skip('inotify not available')
+    received = []
+    token = watcher.subscribe(root, received.extend, recursive=True, ignore={'node_modules'})
+
+    _touch(os.path.join(root, 'src', 'a.vs'), 'x')
+    _touch(os.path.join(root, 'src', 'a.vs'), 'xy')
+    _touch(os.path.join(root, 'tmp.txt'))
+    os.remove(os.path.join(root, 'tmp.txt'))
+    _touch(os.path.join(root, 'node_modules', 'pkg.js'))
+    _touch(os.path.join(root, 'new', 'deep', 'b.vs'))
+    watcher.sync(token)
+
+    changes = {(os.path.relpath(e.path, root), e.kind) for e in received}
+    assert ('src/a.vs', 'created') in changes
+    assert ('new/deep/b.vs', 'created') in changes
+    assert not any(path.startswith(('tmp.txt', 'node_modules/')) for path, _ in changes)
+
+    received.clear()
+    _touch(os.path.join(root, 'new', 'deep', 'c.vs'))
+    watcher.sync(token)
+    assert [(os.path.relpath(e.path, root), e.kind) for e in received] == [('new/deep/c.vs', 'created')]
+    watcher.close()
+
+
+def test_watched_cache_reloads_only_after_change(tmp_path):
+    root = str(tmp_path)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return sorted(os.listdir(root))
+
+    cache = WatchedCache(loader)
+    assert cache.get() == cache.get() == []
+    assert len(calls) == 2
+
+    cache.attach(ValyxoFileWatcher('polling'), root)
+    assert cache.get() == cache.get() == []
+    assert len(calls) == 3
+    _touch(os.path.join(root, 'theme.json'))
+    assert cache.get() == ['theme.json']
+    assert len(calls) == 4
+
+
+def test_file_index_refresh_uses_watcher(tmp_path):
+    watcher = ValyxoFileWatcher('inotify')
+    if not watcher.native:
+        pytest.skip('inotify not available')
+    root = str(tmp_path)
+    _touch(os.path.join(root, 'Projects', 'Main', 'main.vs'))
+    index = ValyxoFileIndex(root)
+    index.attach_watcher(watcher)
+    index.build()
+    assert index.refresh() == 0
+
+    _touch(os.path.join(root, 'Projects', 'Main', 'lib', 'util.vs'))
+    assert index.refresh() == 1
+    assert index.find('util')[0][1] == os.path.join(root, 'Projects', 'Main', 'lib', 'util.vs')
+    assert index.list_dir(os.path.join(root, 'Projects', 'Main')) == [('lib', True), ('main.vs', False)]
+    watcher.close()